@@ -1,28 +1,24 @@
 from flask import Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from . import database
-from .utils import success_response, error_response, admin_required, validate_pagination, create_pagination_info
+from .utils import (success_response, error_response, admin_required, validate_pagination, validate_cursor,
+                    create_pagination_info, create_cursor_pagination_info)
 from .extensions import limiter
 from .config import Config
+from .cache import get_cache_stats
+from .orders import razorpay_clients
 admin_bp = Blueprint('admin', __name__, url_prefix='/v1/admin')
+
+# Sort of the admin listings, recorded in the cursors they issue
+NEWEST_FIRST = 'created_at:desc'
+
 @admin_bp.route('/dashboard', methods=['GET'])
 @limiter.limit(Config.LIMIT_READ_ADMIN )
 @admin_required()
 def get_admin_dashboard():
     try:
-        # Get dashboard statistics
-        stats = {
-            'total_users': database.get_total_users_count(),
-            'total_vendors': database.get_total_vendors_count(),
-            'total_products': database.get_total_products_count(),
-            'total_orders': database.get_total_orders_count(),
-            'total_revenue': database.get_total_revenue(),
-            'pending_vendor_approvals': database.get_pending_vendor_approvals_count(),
-            'active_orders': database.get_active_orders_count(),
-            'monthly_revenue': database.get_monthly_revenue(),
-            'top_categories': database.get_top_categories(),
-            'recent_orders': database.get_recent_orders(limit=10)
-        }
+        # Live counters plus the background-refreshed aggregates, in one read
+        stats = database.get_admin_dashboard_stats()
         
         return success_response(stats, "Admin dashboard data retrieved successfully")
         
@@ -35,13 +31,20 @@ def get_admin_dashboard():
 def get_all_users():
     try:
         page, per_page = validate_pagination()
+        try:
+            after = validate_cursor(NEWEST_FIRST)
+        except ValueError as e:
+            return error_response(str(e), 400)
         
         role = request.args.get('role')
         status = request.args.get('status')
         search = request.args.get('search')
         
-        users, total_count = database.get_all_users(page, per_page, role, status, search)
-        pagination = create_pagination_info(page, per_page, total_count)
+        users, total_count, next_key = database.get_all_users(page, per_page, role, status, search, after)
+        if after is None:
+            pagination = create_pagination_info(page, per_page, total_count)
+        else:
+            pagination = create_cursor_pagination_info(per_page, NEWEST_FIRST, next_key, total_count)
         
         return success_response(users, "Users retrieved successfully", pagination)
         
@@ -153,16 +156,23 @@ def update_product_status(product_id):
 def get_all_orders():
     try:
         page, per_page = validate_pagination()
+        try:
+            after = validate_cursor(NEWEST_FIRST)
+        except ValueError as e:
+            return error_response(str(e), 400)
         
         status = request.args.get('status')
         payment_status = request.args.get('payment_status')
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
         
-        orders, total_count = database.get_all_orders_admin(
-            page, per_page, status, payment_status, start_date, end_date
+        orders, total_count, next_key = database.get_all_orders_admin(
+            page, per_page, status, payment_status, start_date, end_date, after
         )
-        pagination = create_pagination_info(page, per_page, total_count)
+        if after is None:
+            pagination = create_pagination_info(page, per_page, total_count)
+        else:
+            pagination = create_cursor_pagination_info(per_page, NEWEST_FIRST, next_key, total_count)
         
         return success_response(orders, "Orders retrieved successfully", pagination)
         
@@ -179,11 +189,12 @@ def create_category():
         name = data.get('name', '').strip()
         description = data.get('description', '').strip()
         parent_id = data.get('parent_id')
+        name_hindi = data.get('name_hindi', '').strip() or None
         
         if not name:
             return error_response("Category name is required", 400)
         
-        category_id = database.create_category(name, description, parent_id)
+        category_id = database.create_category(name, description, parent_id, name_hindi)
         if category_id < 0:
             return error_response("Failed to create category", 500)
         
@@ -202,11 +213,12 @@ def update_category(category_id):
         name = data.get('name', '').strip()
         description = data.get('description', '').strip()
         is_active = data.get('is_active', True)
+        name_hindi = data.get('name_hindi', '').strip() or None
         
         if not name:
             return error_response("Category name is required", 400)
         
-        success = database.update_category(category_id, name, description, is_active)
+        success = database.update_category(category_id, name, description, is_active, name_hindi)
         if not success:
             return error_response("Failed to update category", 500)
         
@@ -268,6 +280,8 @@ def update_market(market_id):
 def get_admin_analytics():
     try:
         period = request.args.get('period', 'month')  # day, week, month, year
+        if period not in ('day', 'week', 'month', 'year'):
+            return error_response("Invalid period", 400)
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
         
@@ -278,6 +292,23 @@ def get_admin_analytics():
     except Exception as e:
         return error_response(f"Failed to retrieve admin analytics: {str(e)}", 500)
 
+@admin_bp.route('/system/stats', methods=['GET'])
+@limiter.limit(Config.LIMIT_READ_ADMIN)
+@admin_required()
+def get_system_stats():
+    try:
+        # Operational counters; kept off the public /v1/health
+        stats = {
+            'db_pool': database.get_pool_stats(),
+            'cache': get_cache_stats(),
+            'razorpay': razorpay_clients.stats(),
+        }
+        
+        return success_response(stats, "System stats retrieved successfully")
+        
+    except Exception as e:
+        return error_response(f"Failed to retrieve system stats: {str(e)}", 500)
+
 @admin_bp.route('/system/settings', methods=['GET'])
 @limiter.limit(Config.LIMIT_READ_ADMIN)
 @admin_required()
@@ -0,0 +1,65 @@
+"""Secondary indexes for the hot lookup paths in database.py
+
+Revision ID: 002_hot_path_indexes
+Revises: 001_initial
+Create Date: 2024-06-01 00:00:00
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '002_hot_path_indexes'
+down_revision: Union[str, None] = '001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Orders: per customer and per store, newest first
+    op.create_index('ix_orders_customer_date', 'orders',
+                    ['CustomerId', sa.text('OrderDate DESC'), sa.text('OrderTime DESC')])
+    op.create_index('ix_orders_store_date', 'orders',
+                    ['StoreId', sa.text('OrderDate DESC'), sa.text('OrderTime DESC')])
+    # Superseded by ix_orders_customer_date
+    op.drop_index('ix_orders_customer_id', table_name='orders')
+
+    # Cart: open carts by customer, checked-out rows by order
+    op.create_index('ix_cart_open_customer', 'cart', ['CustomerId', sa.text('DateAdded DESC')],
+                    sqlite_where=sa.text('OrderId IS NULL'))
+    op.create_index('ix_cart_order_id', 'cart', ['OrderId'],
+                    sqlite_where=sa.text('OrderId IS NOT NULL'))
+
+    # Reviews: approved reviews of a product, newest first
+    op.create_index('ix_reviews_product_approved', 'reviews',
+                    ['ProductId', 'StoreId', sa.text('DateCreated DESC')],
+                    sqlite_where=sa.text('IsApproved = 1'))
+
+    # Inventory: a vendor's active items, and per-store totals (covering)
+    op.create_index('ix_inventory_vendor_active', 'inventory',
+                    ['VendorId', sa.text('DateModified DESC')],
+                    sqlite_where=sa.text('IsActive = 1'))
+    op.create_index('ix_inventory_store', 'inventory', ['StoreId', 'ItemId', 'Quantity'])
+    # Superseded by uq_inventory_vendor_item
+    op.drop_index('ix_inventory_vendor_id', table_name='inventory')
+
+    # Categories tree and wishlist, in display order
+    op.create_index('ix_categories_parent_sort', 'Categories',
+                    ['ParentCategoryId', 'SortOrder', 'CategoryName'])
+    op.create_index('ix_wishlist_customer_date', 'wishlist',
+                    ['CustomerId', sa.text('DateAdded DESC')])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_wishlist_customer_date', table_name='wishlist')
+    op.drop_index('ix_categories_parent_sort', table_name='Categories')
+    op.create_index('ix_inventory_vendor_id', 'inventory', ['VendorId'], unique=False)
+    op.drop_index('ix_inventory_store', table_name='inventory')
+    op.drop_index('ix_inventory_vendor_active', table_name='inventory')
+    op.drop_index('ix_reviews_product_approved', table_name='reviews')
+    op.drop_index('ix_cart_order_id', table_name='cart')
+    op.drop_index('ix_cart_open_customer', table_name='cart')
+    op.create_index('ix_orders_customer_id', 'orders', ['CustomerId'], unique=False)
+    op.drop_index('ix_orders_store_date', table_name='orders')
+    op.drop_index('ix_orders_customer_date', table_name='orders')
@@ -0,0 +1,36 @@
+"""FTS5 product search index with sync triggers
+
+Revision ID: 003_product_search
+Revises: 002_hot_path_indexes
+Create Date: 2024-06-15 00:00:00
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+# Shared with database.create_search_index so both paths build the same index
+from backend.database import SEARCH_INDEX_SCHEMA, SEARCH_INDEX_BACKFILL
+
+# revision identifiers, used by Alembic.
+revision: str = '003_product_search'
+down_revision: Union[str, None] = '002_hot_path_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_TRIGGERS = (
+    'trg_store_search_insert', 'trg_store_search_update', 'trg_store_search_delete',
+    'trg_inventory_search_insert', 'trg_inventory_search_update', 'trg_inventory_search_delete',
+    'trg_categories_search_update',
+)
+
+
+def upgrade() -> None:
+    for statement in SEARCH_INDEX_SCHEMA + SEARCH_INDEX_BACKFILL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for trigger in SEARCH_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS product_search_vocab")
+    op.execute("DROP TABLE IF EXISTS product_search")
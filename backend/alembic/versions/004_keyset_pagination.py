@@ -0,0 +1,36 @@
+"""Indexes for keyset pagination of the product and admin order listings
+
+Revision ID: 004_keyset_pagination
+Revises: 003_product_search
+Create Date: 2024-07-01 00:00:00
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '004_keyset_pagination'
+down_revision: Union[str, None] = '003_product_search'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Active products, one index per sort order of get_products_with_filters
+    op.create_index('ix_store_active_date', 'Store', ['DateAdded', 'StoreId', 'ItemId'],
+                    sqlite_where=sa.text('IsActive = 1'))
+    op.create_index('ix_store_active_price', 'Store', ['Price', 'StoreId', 'ItemId'],
+                    sqlite_where=sa.text('IsActive = 1'))
+    op.create_index('ix_store_active_name', 'Store', ['ItemName', 'StoreId', 'ItemId'],
+                    sqlite_where=sa.text('IsActive = 1'))
+
+    # Orders newest first, in the grouping order of get_all_orders_admin
+    op.create_index('ix_orders_date', 'orders', ['OrderDate', 'OrderTime', 'OrderId'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_orders_date', table_name='orders')
+    op.drop_index('ix_store_active_name', table_name='Store')
+    op.drop_index('ix_store_active_price', table_name='Store')
+    op.drop_index('ix_store_active_date', table_name='Store')
@@ -0,0 +1,37 @@
+"""Admin dashboard counters maintained by triggers, and the aggregate snapshot
+
+Revision ID: 005_dashboard_stats
+Revises: 004_keyset_pagination
+Create Date: 2024-07-08 00:00:00
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+# Shared with database.create_dashboard_tables so both paths build the same schema
+from backend.database import DASHBOARD_SCHEMA, DASHBOARD_COUNTER_BACKFILL
+
+# revision identifiers, used by Alembic.
+revision: str = '005_dashboard_stats'
+down_revision: Union[str, None] = '004_keyset_pagination'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DASHBOARD_TRIGGERS = tuple(
+    f"trg_{table}_dashboard_{event}"
+    for table in ('user', 'store', 'orders')
+    for event in ('insert', 'update', 'delete')
+)
+
+
+def upgrade() -> None:
+    for statement in DASHBOARD_SCHEMA:
+        op.execute(statement)
+    op.execute(DASHBOARD_COUNTER_BACKFILL)
+
+
+def downgrade() -> None:
+    for trigger in DASHBOARD_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS dashboard_snapshot")
+    op.execute("DROP TABLE IF EXISTS dashboard_counters")
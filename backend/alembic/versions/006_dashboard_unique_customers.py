@@ -0,0 +1,33 @@
+"""Count unique customers in the dashboard counters
+
+Revision ID: 006_dashboard_unique_customers
+Revises: 005_dashboard_stats
+Create Date: 2024-07-15 00:00:00
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+from backend.database import DASHBOARD_SCHEMA, DASHBOARD_COUNTER_BACKFILL
+
+# revision identifiers, used by Alembic.
+revision: str = '006_dashboard_unique_customers'
+down_revision: Union[str, None] = '005_dashboard_stats'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ORDER_TRIGGERS = ('trg_orders_dashboard_insert', 'trg_orders_dashboard_delete')
+
+
+def upgrade() -> None:
+    # Recreate the orders triggers from the current schema, then recount
+    for trigger in ORDER_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    for statement in DASHBOARD_SCHEMA:
+        op.execute(statement)
+    op.execute(DASHBOARD_COUNTER_BACKFILL)
+
+
+def downgrade() -> None:
+    # The triggers' unique_customers branch updates no row once the counter is gone
+    op.execute("DELETE FROM dashboard_counters WHERE Name = 'unique_customers'")
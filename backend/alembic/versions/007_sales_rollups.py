@@ -0,0 +1,33 @@
+"""Daily and hourly sales rollups maintained by triggers on orders
+
+Revision ID: 007_sales_rollups
+Revises: 006_dashboard_unique_customers
+Create Date: 2024-07-22 00:00:00
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# Shared with database.create_sales_rollup_tables so both paths build the same schema
+from backend.database import SALES_ROLLUP_SCHEMA, SALES_ROLLUP_BACKFILL
+
+# revision identifiers, used by Alembic.
+revision: str = '007_sales_rollups'
+down_revision: Union[str, None] = '006_dashboard_unique_customers'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for statement in SALES_ROLLUP_SCHEMA:
+        op.execute(statement)
+    for statement in SALES_ROLLUP_BACKFILL:
+        op.get_bind().execute(sa.text(statement), {'since': None})
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_orders_rollup_update")
+    op.execute("DROP TRIGGER IF EXISTS trg_orders_rollup_insert")
+    for table in ('sales_daily_customers', 'sales_hourly', 'sales_daily_totals', 'sales_daily'):
+        op.execute(f"DROP TABLE IF EXISTS {table}")
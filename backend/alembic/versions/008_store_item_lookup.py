@@ -0,0 +1,26 @@
+"""Index for finding the store of an active item by ItemId alone
+
+Revision ID: 008_store_item_lookup
+Revises: 007_sales_rollups
+Create Date: 2024-08-05 00:00:00
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '008_store_item_lookup'
+down_revision: Union[str, None] = '007_sales_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # /cart/add called with a productId and no storeId
+    op.create_index('ix_store_active_item', 'Store', ['ItemId', 'StoreId'],
+                    sqlite_where=sa.text('IsActive = 1'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_store_active_item', table_name='Store')
@@ -0,0 +1,33 @@
+"""Count stores in the dashboard counters
+
+Revision ID: 009_dashboard_total_stores
+Revises: 008_store_item_lookup
+Create Date: 2024-08-12 00:00:00
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+from backend.database import DASHBOARD_SCHEMA, DASHBOARD_COUNTER_BACKFILL
+
+# revision identifiers, used by Alembic.
+revision: str = '009_dashboard_total_stores'
+down_revision: Union[str, None] = '008_store_item_lookup'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STORE_TRIGGERS = ('trg_store_total_stores_insert', 'trg_store_total_stores_update',
+                  'trg_store_total_stores_delete')
+
+
+def upgrade() -> None:
+    # The schema statements are idempotent; only the new Store triggers are created
+    for statement in DASHBOARD_SCHEMA:
+        op.execute(statement)
+    op.execute(DASHBOARD_COUNTER_BACKFILL)
+
+
+def downgrade() -> None:
+    for trigger in STORE_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DELETE FROM dashboard_counters WHERE Name = 'total_stores'")
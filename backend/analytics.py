@@ -0,0 +1,248 @@
+"""
+Dashboard and sales analytics.
+
+Each metric is its own aggregate over the index that answers it, a counter
+maintained by the dashboard triggers or a read of the sales rollups, so no
+query joins two unrelated tables and multiplies their rows, and sales
+reports read O(days) rollup rows rather than O(orders) order lines.
+
+Usage:
+    python -m backend.analytics backfill [--since YYYY-MM-DD]
+"""
+import argparse
+import logging
+
+from .database import get_db_read_connection, rebuild_sales_rollups, LINE_REVENUE
+
+logger = logging.getLogger(__name__)
+
+
+def _counters(cursor, *names):
+    cursor.execute(f"""
+        SELECT Name, Value FROM dashboard_counters WHERE Name IN ({', '.join('?' * len(names))})
+    """, names)
+    values = {row['Name']: row['Value'] for row in cursor.fetchall()}
+    return [values.get(name, 0) for name in names]
+
+
+def get_global_stats():
+    """Marketplace wide totals"""
+    with get_db_read_connection() as conn:
+        cursor = conn.cursor()
+        total_orders, total_revenue, unique_customers, total_users, total_stores = _counters(
+            cursor, 'total_orders', 'total_revenue', 'unique_customers', 'total_users', 'total_stores')
+
+    return {
+        'total_orders': total_orders,
+        'total_revenue': total_revenue,
+        'unique_customers': unique_customers,
+        'total_users': total_users,
+        'total_stores': total_stores,
+    }
+
+
+def get_vendor_stats(vendor_id):
+    """Totals for one store: orders and revenue from its own order lines, stock from inventory"""
+    with get_db_read_connection() as conn:
+        cursor = conn.cursor()
+        # Revenue is the store's own lines: TotalAmount is the whole order's
+        # total, repeated on every line and covering other stores' items
+        cursor.execute(f"""
+            SELECT COUNT(DISTINCT OrderId) AS total_orders,
+                   COALESCE(SUM({LINE_REVENUE.format('orders')}), 0) AS total_revenue,
+                   COUNT(DISTINCT CustomerId) AS unique_customers
+            FROM orders
+            WHERE StoreId = ?
+        """, (vendor_id,))
+        orders = cursor.fetchone()
+
+        cursor.execute("""
+            SELECT COUNT(*) AS total_products, COALESCE(SUM(Quantity), 0) AS total_inventory
+            FROM inventory
+            WHERE StoreId = ?
+        """, (vendor_id,))
+        inventory = cursor.fetchone()
+
+    return {
+        'total_orders': orders['total_orders'],
+        'total_revenue': orders['total_revenue'],
+        'unique_customers': orders['unique_customers'],
+        'total_products': inventory['total_products'],
+        'total_inventory': inventory['total_inventory'],
+    }
+
+
+def get_dashboard_stats(vendor_id=None):
+    """Vendor stats for vendor_id, otherwise the global stats"""
+    if vendor_id:
+        return get_vendor_stats(vendor_id)
+    return get_global_stats()
+
+
+# Grouping of rollup days for each reporting period
+PERIOD_BUCKETS = {
+    'day': "Day",
+    'week': "strftime('%Y-W%W', Day)",
+    'month': "substr(Day, 1, 7)",
+    'year': "substr(Day, 1, 4)",
+}
+# Date modifiers giving the default start of the range from its end date
+DEFAULT_WINDOWS = {
+    'day': ('-29 days',),
+    'week': ('-83 days',),
+    'month': ('start of month', '-11 months'),
+    'year': ('start of year', '-4 years'),
+}
+
+
+def _date_range(cursor, period, start_date, end_date):
+    """Resolve the reported range, ending today and spanning DEFAULT_WINDOWS by default"""
+    cursor.execute("SELECT date(COALESCE(?, 'now'))", (end_date,))
+    end_date = cursor.fetchone()[0]
+    if start_date is None:
+        modifiers = DEFAULT_WINDOWS[period]
+        cursor.execute(f"SELECT date(?{', ?' * len(modifiers)})", (end_date, *modifiers))
+        start_date = cursor.fetchone()[0]
+    return start_date, end_date
+
+
+def _sales(row):
+    return {'orders': row['Orders'] or 0, 'units': row['Units'] or 0, 'revenue': row['Revenue'] or 0}
+
+
+def get_admin_analytics(period='month', start_date=None, end_date=None):
+    """
+    Marketplace sales between start_date and end_date (ISO dates), grouped
+    by period (day, week, month or year), with the top categories and stores.
+    Customers are counted once per day, so a bucket's figure is customer-days.
+    """
+    if period not in PERIOD_BUCKETS:
+        raise ValueError(f"Unknown period: {period}")
+    with get_db_read_connection() as conn:
+        cursor = conn.cursor()
+        start_date, end_date = _date_range(cursor, period, start_date, end_date)
+        cursor.execute(f"""
+            SELECT {PERIOD_BUCKETS[period]} AS Bucket, SUM(Orders) AS Orders, SUM(Units) AS Units,
+                   SUM(Revenue) AS Revenue, SUM(Customers) AS Customers
+            FROM sales_daily_totals
+            WHERE Day BETWEEN ? AND ?
+            GROUP BY Bucket
+            ORDER BY Bucket
+        """, (start_date, end_date))
+        series = [dict(_sales(row), period=row['Bucket'], customers=row['Customers'])
+                  for row in cursor.fetchall()]
+
+        cursor.execute("""
+            SELECT d.CategoryId, c.CategoryName, c.CategoryNameHindi,
+                   SUM(d.Orders) AS Orders, SUM(d.Units) AS Units, SUM(d.Revenue) AS Revenue
+            FROM sales_daily d
+            LEFT JOIN Categories c ON c.CategoryId = d.CategoryId
+            WHERE d.Day BETWEEN ? AND ?
+            GROUP BY d.CategoryId
+            ORDER BY Revenue DESC
+            LIMIT 10
+        """, (start_date, end_date))
+        top_categories = [dict(_sales(row), category_id=row['CategoryId'], name=row['CategoryName'],
+                               name_hindi=row['CategoryNameHindi'])
+                          for row in cursor.fetchall()]
+
+        cursor.execute("""
+            SELECT StoreId, SUM(Orders) AS Orders, SUM(Units) AS Units, SUM(Revenue) AS Revenue
+            FROM sales_daily
+            WHERE Day BETWEEN ? AND ?
+            GROUP BY StoreId
+            ORDER BY Revenue DESC
+            LIMIT 10
+        """, (start_date, end_date))
+        top_stores = [dict(_sales(row), store_id=row['StoreId']) for row in cursor.fetchall()]
+
+    return {
+        'period': period,
+        'start_date': start_date,
+        'end_date': end_date,
+        'totals': {
+            'orders': sum(bucket['orders'] for bucket in series),
+            'units': sum(bucket['units'] for bucket in series),
+            'revenue': sum(bucket['revenue'] for bucket in series),
+        },
+        'series': series,
+        'top_categories': top_categories,
+        'top_stores': top_stores,
+    }
+
+
+def get_vendor_analytics(user_id, start_date=None, end_date=None):
+    """
+    Daily sales of a vendor's store between start_date and end_date (the
+    last 30 days by default), by category and by hour of day.
+    """
+    with get_db_read_connection() as conn:
+        cursor = conn.cursor()
+        # Vendors without a StoreID are keyed by their user id, as in retrieve_orders_by_vendor
+        cursor.execute("SELECT COALESCE(StoreID, UserId) FROM User WHERE UserId = ?", (user_id,))
+        row = cursor.fetchone()
+        store_id = row[0] if row else user_id
+        start_date, end_date = _date_range(cursor, 'day', start_date, end_date)
+
+        cursor.execute("""
+            SELECT Day, SUM(Orders) AS Orders, SUM(Units) AS Units,
+                   SUM(Revenue) AS Revenue, SUM(Customers) AS Customers
+            FROM sales_daily
+            WHERE StoreId = ? AND Day BETWEEN ? AND ?
+            GROUP BY Day
+            ORDER BY Day
+        """, (store_id, start_date, end_date))
+        series = [dict(_sales(row), day=row['Day'], customers=row['Customers'])
+                  for row in cursor.fetchall()]
+
+        cursor.execute("""
+            SELECT d.CategoryId, c.CategoryName, c.CategoryNameHindi,
+                   SUM(d.Orders) AS Orders, SUM(d.Units) AS Units, SUM(d.Revenue) AS Revenue
+            FROM sales_daily d
+            LEFT JOIN Categories c ON c.CategoryId = d.CategoryId
+            WHERE d.StoreId = ? AND d.Day BETWEEN ? AND ?
+            GROUP BY d.CategoryId
+            ORDER BY Revenue DESC
+        """, (store_id, start_date, end_date))
+        categories = [dict(_sales(row), category_id=row['CategoryId'], name=row['CategoryName'],
+                           name_hindi=row['CategoryNameHindi'])
+                      for row in cursor.fetchall()]
+
+        cursor.execute("""
+            SELECT CAST(substr(Hour, 12, 2) AS INTEGER) AS HourOfDay, SUM(Orders) AS Orders,
+                   SUM(Units) AS Units, SUM(Revenue) AS Revenue
+            FROM sales_hourly
+            WHERE StoreId = ? AND Hour >= ? AND Hour < date(?, '+1 day')
+            GROUP BY HourOfDay
+            ORDER BY HourOfDay
+        """, (store_id, start_date, end_date))
+        hourly = [dict(_sales(row), hour=row['HourOfDay']) for row in cursor.fetchall()]
+
+    return {
+        'store_id': store_id,
+        'start_date': start_date,
+        'end_date': end_date,
+        'totals': {
+            'orders': sum(day['orders'] for day in series),
+            'units': sum(day['units'] for day in series),
+            'revenue': sum(day['revenue'] for day in series),
+        },
+        'series': series,
+        'categories': categories,
+        'hourly': hourly,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sales rollup maintenance")
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    backfill = subcommands.add_parser('backfill', help="recompute the sales rollups from orders")
+    backfill.add_argument('--since', help="first day to recompute (YYYY-MM-DD); all history by default")
+    args = parser.parse_args()
+
+    if args.command == 'backfill':
+        rebuild_sales_rollups(args.since)
+
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,8 @@ if __package__:
     from .config import Config
     from .utils import success_response, error_response
     from .extensions import limiter
+    from .cache import configure_cache_backend
+    from .cache_backends import create_cache_backend
     from .auth import auth_bp
     from .products import products_bp
     from .cart import cart_bp
@@ -26,6 +28,8 @@ else:
     from backend.config import Config
     from backend.utils import success_response, error_response
     from backend.extensions import limiter
+    from backend.cache import configure_cache_backend
+    from backend.cache_backends import create_cache_backend
     from backend.auth import auth_bp
     from backend.products import products_bp
     from backend.cart import cart_bp
@@ -55,6 +59,10 @@ def create_app():
     # Create upload folders
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     os.makedirs(os.path.join(app.config['UPLOAD_FOLDER'], 'products'), exist_ok=True)
+    # Share cache entries and invalidations between workers when configured
+    cache_backend = create_cache_backend()
+    if cache_backend is not None:
+        configure_cache_backend(cache_backend)
     #init rate-limiter
     limiter.init_app(app)
     register_error_handlers(app)
@@ -352,8 +360,7 @@ def create_app():
     
     return app
 
-# Create app instance
-app = create_app()
-
+# The WSGI app instance lives in wsgi.py, so importing create_app (as the
+# tests do) does not initialize the configured database
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    create_app().run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
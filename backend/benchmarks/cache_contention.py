@@ -0,0 +1,112 @@
+"""
+Contention benchmark for the in-memory cache.
+
+Simulates gunicorn gthread workers: each thread serves requests that read a
+few hot keys and occasionally miss on a key whose factory is a slow database
+query. Compares a single global lock held across the factory (the previous
+behaviour) with the sharded, single-flight cache.
+
+Usage:
+    python -m backend.benchmarks.cache_contention --threads 16 --requests 2000
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+
+from ..cache import InMemoryCache
+
+
+class GlobalLockCache(InMemoryCache):
+    """Baseline: one lock for every key, factory runs while holding it"""
+
+    def __init__(self):
+        super().__init__('global_lock', shards=1)
+        self._global_lock = threading.RLock()
+
+    def get(self, key):
+        with self._global_lock:
+            return super().get(key)
+
+    def set(self, key, value, ttl=300):
+        with self._global_lock:
+            super().set(key, value, ttl)
+
+    def get_or_set(self, key, factory, ttl=300):
+        with self._global_lock:
+            value = super().get(key)
+            if value is None:
+                value = factory()
+                super().set(key, value, ttl)
+            return value
+
+
+def run(cache, threads, requests, hot_keys, miss_ratio, query_time):
+    latencies = []
+    latencies_lock = threading.Lock()
+    factory_calls = [0]
+
+    def slow_query():
+        factory_calls[0] += 1
+        time.sleep(query_time)
+        return {'rows': list(range(20))}
+
+    for i in range(hot_keys):
+        cache.set(f"product:{i}", {'id': i})
+
+    def worker(seed):
+        rng = random.Random(seed)
+        local = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            for _ in range(5):
+                cache.get(f"product:{rng.randrange(hot_keys)}")
+            if rng.random() < miss_ratio:
+                key = f"search:{rng.randrange(hot_keys * 10)}"
+                cache.get_or_set(key, slow_query, ttl=1)
+            local.append(time.perf_counter() - started)
+        with latencies_lock:
+            latencies.extend(local)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests_per_sec': len(latencies) / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p99_ms': latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        'factory_calls': factory_calls[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=2000, help='requests per thread')
+    parser.add_argument('--hot-keys', type=int, default=200)
+    parser.add_argument('--miss-ratio', type=float, default=0.02)
+    parser.add_argument('--query-ms', type=float, default=5.0)
+    args = parser.parse_args()
+
+    candidates = [
+        ('global lock', GlobalLockCache()),
+        ('sharded x1', InMemoryCache('bench', shards=1)),
+        ('sharded x16', InMemoryCache('bench', shards=16)),
+    ]
+    print(f"{'cache':<14}{'req/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'queries':>10}")
+    for label, cache in candidates:
+        result = run(cache, args.threads, args.requests, args.hot_keys,
+                     args.miss_ratio, args.query_ms / 1000)
+        print(f"{label:<14}{result['requests_per_sec']:>12.0f}{result['p50_ms']:>10.3f}"
+              f"{result['p99_ms']:>10.3f}{result['factory_calls']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Latency benchmark for get_dashboard_stats.
+
+Loads synthetic users, stores, inventory and order lines into a temporary
+database (a catalog of a million Store rows by default), then times the
+global and per-vendor stats against the single joined query they replace. The old global query cross joins orders, users
+and stores, so it only runs when that product is small enough to finish.
+
+Usage:
+    python -m backend.benchmarks.dashboard_stats --orders 1000000
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from unittest import mock
+
+from .. import analytics, database, db_utils
+from ..config import Config
+
+LEGACY_GLOBAL = """
+    SELECT COUNT(DISTINCT o.OrderId), SUM(o.TotalAmount), COUNT(DISTINCT o.CustomerId),
+           COUNT(DISTINCT u.UserId), COUNT(DISTINCT s.StoreId)
+    FROM orders o
+    LEFT JOIN User u ON 1=1
+    LEFT JOIN Store s ON 1=1
+"""
+LEGACY_VENDOR = """
+    SELECT COUNT(DISTINCT o.OrderId), SUM(o.TotalAmount), COUNT(DISTINCT o.CustomerId),
+           COUNT(i.ItemId), SUM(i.Quantity)
+    FROM orders o
+    LEFT JOIN inventory i ON o.StoreId = i.StoreId
+    WHERE o.StoreId = ?
+"""
+# Rows the legacy global query may join before it is skipped
+LEGACY_GLOBAL_LIMIT = 50_000_000
+
+
+def load(orders, users, stores, items_per_store, batch=50000):
+    rng = random.Random(42)
+    database.initialize_database()
+    with db_utils.get_pooled_connection() as conn:
+        conn.executemany("INSERT INTO User (AccountType, Email, Name, Password) VALUES (?, ?, ?, 'x')", [
+            ('vendor' if n < stores else 'customer', f'user{n}@example.com', f'User {n}') for n in range(users)
+        ])
+        conn.executemany("INSERT INTO Store (StoreId, ItemId, Quantity, Price, ItemName, CategoryId) "
+                         "VALUES (?, ?, 10, ?, 'Item', ?)", [
+            (store, item, rng.randint(50, 5000), rng.randint(1, 10))
+            for store in range(1, stores + 1) for item in range(items_per_store)
+        ])
+        conn.executemany("INSERT INTO inventory (VendorId, VendorName, StoreId, ItemId, ItemName, Quantity, Price) "
+                         "VALUES (?, 'Vendor', ?, ?, 'Item', ?, 100)", [
+            (store, store, item, rng.randint(0, 100))
+            for store in range(1, stores + 1) for item in range(items_per_store)
+        ])
+        conn.commit()
+
+        line = order = 0
+        statuses = ['pending', 'confirmed', 'shipped', 'delivered', 'delivered', 'cancelled']
+        while line < orders:
+            rows = []
+            while len(rows) < batch and line < orders:
+                order += 1
+                customer = rng.randint(stores + 1, users)
+                status = rng.choice(statuses)
+                day = f'2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}'
+                for _ in range(min(rng.randint(1, 3), orders - line)):
+                    store = rng.randint(1, stores)
+                    rows.append((store, rng.randrange(items_per_store), customer, rng.randint(1, 3),
+                                 rng.randint(50, 5000), f'BS{order}', status, day, f'{order % 86400:05d}'))
+                    line += 1
+            conn.executemany("""
+                INSERT INTO orders (StoreId, ItemId, CustomerId, Quantity, Price, ItemName,
+                                    OrderId, OrderStatus, OrderDate, OrderTime, TotalAmount)
+                VALUES (?, ?, ?, ?, ?, 'Item', ?, ?, ?, ?, 0)
+            """, rows)
+            conn.commit()
+        conn.execute("ANALYZE")
+
+
+def timed(fn, runs):
+    latencies = []
+    for n in range(runs):
+        started = time.perf_counter()
+        fn(n)
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.99) - 1] * 1000
+
+
+def legacy(query, *params):
+    with db_utils.get_read_connection() as conn:
+        conn.execute(query, params).fetchone()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--orders', type=int, default=1000000)
+    parser.add_argument('--users', type=int, default=50000)
+    parser.add_argument('--stores', type=int, default=2000)
+    parser.add_argument('--items-per-store', type=int, default=500)
+    parser.add_argument('--runs', type=int, default=50)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        with mock.patch.object(Config, 'DATABASE_PATH', os.path.join(tmp_dir, 'bench.db')):
+            db_utils.reset_connection_pools()
+            started = time.perf_counter()
+            load(args.orders, args.users, args.stores, args.items_per_store)
+            print(f"loaded {args.orders} order lines in {time.perf_counter() - started:.1f}s")
+
+            store = lambda n: n % args.stores + 1
+            candidates = [
+                ('global', lambda n: analytics.get_dashboard_stats()),
+                ('vendor', lambda n: analytics.get_dashboard_stats(store(n))),
+                ('legacy vendor', lambda n: legacy(LEGACY_VENDOR, store(n))),
+            ]
+            joined = args.orders * args.users * args.stores * args.items_per_store
+            if joined <= LEGACY_GLOBAL_LIMIT:
+                candidates.append(('legacy global', lambda n: legacy(LEGACY_GLOBAL)))
+            else:
+                print(f"legacy global skipped: it would join {joined:,} rows")
+
+            print(f"{'stats':<16}{'p50 ms':>10}{'p99 ms':>10}")
+            for label, fn in candidates:
+                p50, p99 = timed(fn, args.runs if 'legacy' not in label else min(args.runs, 5))
+                print(f"{label:<16}{p50:>10.2f}{p99:>10.2f}")
+            db_utils.reset_connection_pools()
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
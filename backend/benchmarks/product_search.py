@@ -0,0 +1,116 @@
+"""
+Latency benchmark for product search.
+
+Builds a catalog of synthetic Store items in a temporary database (the FTS5
+index is filled by its triggers) and compares search_products with the
+leading-wildcard LIKE scan it replaces.
+
+Usage:
+    python -m backend.benchmarks.product_search --items 1000000 --queries 200
+"""
+import argparse
+import itertools
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from unittest import mock
+
+from .. import database, db_utils
+from ..config import Config
+
+SYLLABLES = ['ka', 'ri', 'sa', 'ree', 'dhu', 'ba', 'ni', 'pa', 'shmi', 'na', 'ja', 'ip',
+             'ur', 'ta', 'la', 'mo', 'hi', 'ra', 'ga', 'de', 'vi', 'ku', 'rt', 'chi']
+
+
+def make_vocabulary(size, rng):
+    """Pseudo-words; catalog text draws from them with a Zipf-like skew"""
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    words = sorted(words)
+    rng.shuffle(words)  # frequency rank is unrelated to spelling
+    cumulative = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(size)))
+    return words, cumulative
+
+
+def build_catalog(items, words, cumulative, batch=50000):
+    rng = random.Random(42)
+    database.initialize_database()
+    with db_utils.get_pooled_connection() as conn:
+        for start in range(0, items, batch):
+            rows = []
+            for n in range(start, min(items, start + batch)):
+                name = ' '.join(rng.choices(words, cum_weights=cumulative, k=3))
+                description = ' '.join(rng.choices(words, cum_weights=cumulative, k=12))
+                rows.append((n // 1000 + 1, n, 10, rng.randint(50, 5000), name, rng.randint(1, 10), description))
+            conn.executemany("""
+                INSERT INTO Store (StoreId, ItemId, Quantity, Price, ItemName, CategoryId, Description)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            conn.commit()
+
+
+def timed(fn, queries):
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        fn(query)
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.99) - 1] * 1000
+
+
+def like_scan(query):
+    """The previous approach: a total plus the first page, both by full scan"""
+    with db_utils.get_read_connection() as conn:
+        pattern = f"%{query}%"
+        conn.execute("""
+            SELECT COUNT(*) FROM Store WHERE IsActive = 1 AND (ItemName LIKE ? OR Description LIKE ?)
+        """, (pattern, pattern)).fetchone()
+        conn.execute("""
+            SELECT * FROM Store WHERE IsActive = 1 AND (ItemName LIKE ? OR Description LIKE ?)
+            LIMIT 20
+        """, (pattern, pattern)).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--items', type=int, default=1000000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--vocabulary', type=int, default=50000)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        with mock.patch.object(Config, 'DATABASE_PATH', os.path.join(tmp_dir, 'bench.db')):
+            db_utils.reset_connection_pools()
+            rng = random.Random(7)
+            words, cumulative = make_vocabulary(args.vocabulary, rng)
+            started = time.perf_counter()
+            build_catalog(args.items, words, cumulative)
+            print(f"indexed {args.items} items in {time.perf_counter() - started:.1f}s")
+
+            # Queries use the words shoppers type: neither the rarest nor stop-word common
+            searchable = words[50:5000]
+            queries = [' '.join(rng.sample(searchable, rng.randint(1, 2))) for _ in range(args.queries)]
+            typos = [word[:-1] + 'x' + word[-1] for word in rng.sample(searchable, args.queries)]
+            candidates = [
+                ('LIKE scan', like_scan, queries),
+                ('fts5', lambda q: database.search_products({'query': q, 'per_page': 20}), queries),
+                ('fts5 prefix', lambda q: database.search_products({'query': q[:4], 'per_page': 20}), queries),
+                ('fts5 typo', lambda q: database.search_products({'query': q, 'per_page': 20}), typos),
+            ]
+            print(f"{'search':<14}{'p50 ms':>10}{'p99 ms':>10}")
+            for label, fn, inputs in candidates:
+                p50, p99 = timed(fn, inputs)
+                print(f"{label:<14}{p50:>10.2f}{p99:>10.2f}")
+            db_utils.reset_connection_pools()
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
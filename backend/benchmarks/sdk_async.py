@@ -0,0 +1,81 @@
+"""
+Reconciliation benchmark for the async Razorpay client.
+
+Fetches payments from a local mock API that answers after --latency ms,
+first one after another with Client as the reconciliation jobs did, then
+all together with AsyncClient at several concurrency limits.
+
+Usage:
+    python -m backend.benchmarks.sdk_async --fetches 200 --latency 20
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ..razorpay_sdk import AsyncClient, Client
+from ..razorpay_sdk.registry import pooled_session
+
+
+class PaymentHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        body = json.dumps({'id': self.path.rsplit('/', 1)[-1], 'entity': 'payment'}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def sequential(base_url, ids):
+    client = Client(session=pooled_session(1), auth=('key_id', 'key_secret'), base_url=base_url)
+    started = time.perf_counter()
+    for payment_id in ids:
+        client.payment.fetch(payment_id)
+    return time.perf_counter() - started
+
+
+async def concurrent(base_url, ids, max_concurrency):
+    async with AsyncClient(auth=('key_id', 'key_secret'), base_url=base_url,
+                           max_concurrency=max_concurrency) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client.payment.fetch(payment_id) for payment_id in ids))
+        return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--fetches', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=20, help="server latency in ms")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[5, 10, 20])
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PaymentHandler)
+    server.latency = args.latency / 1000
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    base_url = 'http://127.0.0.1:{}'.format(server.server_port)
+    ids = ['pay_{}'.format(n) for n in range(args.fetches)]
+
+    try:
+        print(f"{'client':<22}{'total s':>10}{'fetches/s':>12}")
+        elapsed = sequential(base_url, ids)
+        print(f"{'Client, sequential':<22}{elapsed:>10.2f}{len(ids) / elapsed:>12.0f}")
+        for limit in args.concurrency:
+            elapsed = asyncio.run(concurrent(base_url, ids, limit))
+            label = f"AsyncClient, {limit}"
+            print(f"{label:<22}{elapsed:>10.2f}{len(ids) / elapsed:>12.0f}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Startup benchmark for the Razorpay SDK.
+
+Times importing the package, and importing and constructing a Client, in
+fresh interpreters, so every run pays the full cost a worker or CLI script
+pays; then times constructing a Client and building a request's
+User-Agent header in this process. With --breakdown it lists the slowest
+modules of one client import from python -X importtime.
+
+Usage:
+    python -m backend.benchmarks.sdk_import --runs 20 --breakdown
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(code, *flags):
+    """Run code in a fresh interpreter that imports the SDK as a top level package"""
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR)
+    return subprocess.run([sys.executable, *flags, '-c', code], env=env, check=True,
+                          capture_output=True, text=True)
+
+
+STARTUP = {
+    'import razorpay_sdk': "import razorpay_sdk",
+    'import Client': "from razorpay_sdk import Client",
+    'new Client': "from razorpay_sdk import Client; Client(auth=('key_id', 'key_secret'))",
+    'new Client + order': "from razorpay_sdk import Client; Client(auth=('key_id', 'key_secret')).order",
+}
+
+
+def startup_times(statement, runs):
+    """Seconds spent running statement, measured inside each child"""
+    code = f"import time; started = time.perf_counter(); {statement}; print(time.perf_counter() - started)"
+    run_python(code)  # warm the bytecode cache
+    return sorted(float(run_python(code).stdout) for _ in range(runs))
+
+
+def slowest_modules(count):
+    """(cumulative microseconds, module) for the slowest modules of one client import"""
+    timings = []
+    for line in run_python(STARTUP['import Client'], '-X', 'importtime').stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line.split('|')
+        timings.append((int(cumulative), module.rstrip()))
+    return sorted(timings, reverse=True)[:count]
+
+
+def in_process_times(runs):
+    """Seconds to construct a Client and to build a request's User-Agent header, in this process"""
+    sys.path.insert(0, BACKEND_DIR)
+    from razorpay_sdk import Client
+
+    session = Client(auth=('key_id', 'key_secret')).session
+    client = Client(session=session, auth=('key_id', 'key_secret'))
+    candidates = {
+        'Client()': lambda: Client(session=session, auth=('key_id', 'key_secret')),
+        'user-agent header': lambda: client._update_user_agent_header({}),
+    }
+    timings = {}
+    for label, fn in candidates.items():
+        latencies = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            fn()
+            latencies.append(time.perf_counter() - started)
+        timings[label] = sorted(latencies)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=10000)
+    parser.add_argument('--breakdown', type=int, nargs='?', const=10, default=0,
+                        help="list this many of the slowest modules (10 by default)")
+    args = parser.parse_args()
+
+    print(f"{'measure':<22}{'p50 ms':>10}{'max ms':>10}")
+    for label, statement in STARTUP.items():
+        times = startup_times(statement, args.runs)
+        print(f"{label:<22}{statistics.median(times) * 1000:>10.2f}{times[-1] * 1000:>10.2f}")
+    for label, times in in_process_times(args.requests).items():
+        print(f"{label:<22}{statistics.median(times) * 1000:>10.4f}{times[-1] * 1000:>10.4f}")
+
+    if args.breakdown:
+        print(f"\n{'cumulative ms':>14}  module")
+        for cumulative, module in slowest_modules(args.breakdown):
+            print(f"{cumulative / 1000:>14.2f}  {module}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Pagination benchmark for Razorpay list APIs.
+
+Walks every payment of a local mock API that answers each page after
+--latency ms, while the caller spends --work ms per payment: first with
+the hand-rolled count/skip loop callers used to write, then with
+iter_all(), which prefetches the next page, and with iter_all() split
+into parallel from/to windows.
+
+Usage:
+    python -m backend.benchmarks.sdk_pagination --payments 2000 --latency 50
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from ..razorpay_sdk import Client
+from ..razorpay_sdk.registry import pooled_session
+
+START = 1700000000
+
+
+class PaymentListHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        query = {key: int(values[0]) for key, values in parse_qs(urlparse(self.path).query).items()}
+        time.sleep(self.server.latency)
+        newest = min(query.get('to', START + self.server.payments - 1), START + self.server.payments - 1)
+        oldest = max(query.get('from', START), START)
+        created = range(newest - query['skip'], oldest - 1, -1)[:query['count']]
+        items = [{'id': 'pay_{}'.format(at - START), 'entity': 'payment', 'created_at': at}
+                 for at in created]
+        body = json.dumps({'entity': 'collection', 'count': len(items), 'items': items}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def manual_loop(client):
+    skip = 0
+    while True:
+        items = client.payment.all({'count': 100, 'skip': skip})['items']
+        yield from items
+        if len(items) < 100:
+            return
+        skip += len(items)
+
+
+def consume(payments, work):
+    started = time.perf_counter()
+    count = 0
+    for _ in payments:
+        time.sleep(work)
+        count += 1
+    return count, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--payments', type=int, default=2000)
+    parser.add_argument('--latency', type=float, default=50, help="server latency per page in ms")
+    parser.add_argument('--work', type=float, default=0.5, help="caller time per payment in ms")
+    parser.add_argument('--windows', type=int, default=4)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PaymentListHandler)
+    server.latency = args.latency / 1000
+    server.payments = args.payments
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    client = Client(session=pooled_session(args.windows), auth=('key_id', 'key_secret'),
+                    base_url='http://127.0.0.1:{}'.format(server.server_port))
+    window = {'from': START, 'to': START + args.payments - 1}
+    candidates = {
+        'count/skip loop': lambda: manual_loop(client),
+        'iter_all': lambda: client.payment.iter_all(),
+        'iter_all, {} windows'.format(args.windows):
+            lambda: client.payment.iter_all(window, windows=args.windows),
+    }
+
+    try:
+        print(f"{'walk':<22}{'payments':>10}{'total s':>10}")
+        for label, walk in candidates.items():
+            count, elapsed = consume(walk(), args.work / 1000)
+            print(f"{label:<22}{count:>10}{elapsed:>10.2f}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -2,125 +2,582 @@
 Caching module for database query results.
 Provides in-memory caching with TTL support for frequently accessed data.
 """
+import sys
+import json
+import math
 import time
+import heapq
+import hashlib
+import random
+import logging
+import itertools
 import threading
+from collections import OrderedDict
 from typing import Any, Optional, Callable
 from functools import wraps
 
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+# Default bounds for each cache instance
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # 64MB
+DEFAULT_SHARDS = 16
+
+# Encoded arguments longer than this are replaced by a fixed-size digest
+MAX_KEY_ARGS_LENGTH = 64
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """Approximate memory footprint of a cached value in bytes"""
+    size = sys.getsizeof(value)
+    if isinstance(value, CachedResult):
+        # @cached wraps each result; its payload is what takes the space
+        return size + estimate_size(value.value, _depth)
+    if _depth >= 3:
+        return size
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+                    for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _depth + 1) for item in value)
+    elif hasattr(value, 'keys') and hasattr(value, '__getitem__'):
+        # sqlite3.Row and other mapping-like rows
+        size += sum(estimate_size(value[k], _depth + 1) for k in value.keys())
+    return size
+
 
 class CacheEntry:
     """Represents a single cache entry with TTL support"""
     
-    def __init__(self, value: Any, ttl: int):
+    __slots__ = ('value', 'expires_at', 'size', 'tags')
+    
+    def __init__(self, value: Any, ttl: int, size: int = 0, tags: tuple = ()):
         self.value = value
         self.expires_at = time.time() + ttl if ttl > 0 else float('inf')
+        self.size = size
+        self.tags = tags
     
     def is_expired(self) -> bool:
         return time.time() > self.expires_at
 
 
+class _CacheShard:
+    """
+    One lock-protected slice of an InMemoryCache.
+    
+    Entries are kept in LRU order and bounded by count and approximate size;
+    eviction pops the least recently used entry in O(1). Expiry times sit in
+    a heap, so cleanup only touches entries that have actually expired.
+    Tags map to the keys in this shard that carry them.
+    """
+    
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.inflight = {}  # key -> _Flight for get_or_set computations in progress
+        self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._expiry_heap = []  # (expires_at, sequence, key, entry)
+        self._sequence = itertools.count()
+        self._bytes = 0
+        self._tags = {}  # tag -> set of keys
+        self.generation = 0  # bumped by tag invalidation
+        self.stats = {'hits': 0, 'misses': 0, 'sets': 0, 'evictions': 0,
+                      'expirations': 0, 'single_flight_waits': 0, 'invalidations': 0}
+    
+    def _unlink(self, key: str, entry: CacheEntry) -> None:
+        self._bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+    
+    def _remove(self, key: str) -> CacheEntry:
+        entry = self._cache.pop(key)
+        self._unlink(key, entry)
+        return entry
+    
+    def _evict(self) -> None:
+        """Drop least recently used entries until the shard is within bounds"""
+        while self._cache and (len(self._cache) > self.max_entries or self._bytes > self.max_bytes):
+            key, entry = self._cache.popitem(last=False)
+            self._unlink(key, entry)
+            self.stats['evictions'] += 1
+    
+    def lookup(self, key: str) -> Optional[Any]:
+        """Get a live value; the caller holds the lock"""
+        entry = self._cache.get(key)
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+        if entry.is_expired():
+            self._remove(key)
+            self.stats['expirations'] += 1
+            self.stats['misses'] += 1
+            return None
+        self._cache.move_to_end(key)
+        self.stats['hits'] += 1
+        return entry.value
+    
+    def store(self, key: str, entry: CacheEntry) -> None:
+        """Insert an entry; the caller holds the lock"""
+        if key in self._cache:
+            self._remove(key)
+        self._cache[key] = entry
+        self._bytes += entry.size
+        for tag in entry.tags:
+            self._tags.setdefault(tag, set()).add(key)
+        self.stats['sets'] += 1
+        if entry.expires_at != float('inf'):
+            heapq.heappush(self._expiry_heap, (entry.expires_at, next(self._sequence), key, entry))
+        self._evict()
+        # Heap items for replaced or evicted entries are skipped lazily; compact occasionally
+        if len(self._expiry_heap) > 2 * len(self._cache) + 64:
+            self._expiry_heap = [item for item in self._expiry_heap
+                                 if self._cache.get(item[2]) is item[3]]
+            heapq.heapify(self._expiry_heap)
+    
+    def discard(self, key: str) -> bool:
+        """Delete a key; the caller holds the lock"""
+        if key in self._cache:
+            self._remove(key)
+            return True
+        return False
+    
+    def invalidate_tags(self, tags) -> int:
+        """Remove every entry carrying one of the tags"""
+        removed = 0
+        with self.lock:
+            self.generation += 1
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    if key in self._cache:
+                        self._remove(key)
+                        removed += 1
+            self.stats['invalidations'] += removed
+        return removed
+    
+    def clear(self) -> None:
+        with self.lock:
+            self._cache.clear()
+            self._expiry_heap.clear()
+            self._tags.clear()
+            self._bytes = 0
+    
+    def cleanup_expired(self, now: float) -> int:
+        removed = 0
+        with self.lock:
+            while self._expiry_heap and self._expiry_heap[0][0] < now:
+                _, _, key, entry = heapq.heappop(self._expiry_heap)
+                if self._cache.get(key) is entry:
+                    self._remove(key)
+                    removed += 1
+            self.stats['expirations'] += removed
+        return removed
+    
+    def keys(self) -> list:
+        with self.lock:
+            return list(self._cache.keys())
+    
+    def snapshot(self) -> dict:
+        with self.lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._cache)
+            stats['bytes'] = self._bytes
+        return stats
+
+
+class _Flight:
+    """A get_or_set computation other callers can wait on"""
+    
+    __slots__ = ('event', 'value', 'error')
+    
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
 class InMemoryCache:
     """
     Thread-safe in-memory cache implementation with TTL support.
+    
+    Keys are spread over independently locked shards, so a slow operation on
+    one key never blocks unrelated keys. Each shard is an LRU bounded by count
+    and approximate size, with heap-based expiry.
+    
+    With a shared backend attached (see cache_backends), local misses fall
+    through to the backend, writes go to both, and deletions and tag
+    invalidations are broadcast so other processes drop their local copies.
+    Backend failures are logged and the cache keeps working locally.
     """
     
-    def __init__(self):
-        self._cache: dict[str, CacheEntry] = {}
-        self._lock = threading.RLock()
+    def __init__(self, name: str = 'cache', max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES, shards: int = DEFAULT_SHARDS,
+                 backend=None):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._shards = [
+            _CacheShard(max(1, max_entries // shards), max(1, max_bytes // shards))
+            for _ in range(shards)
+        ]
+        self.backend = None
+        if backend is not None:
+            self.attach_backend(backend)
+    
+    def _shard(self, key: str) -> _CacheShard:
+        return self._shards[hash(key) % len(self._shards)]
+    
+    def attach_backend(self, backend) -> None:
+        """Share entries through a CacheBackend and follow its invalidations"""
+        self.backend = backend
+        backend.subscribe(self._apply_remote_invalidation)
+    
+    def _apply_remote_invalidation(self, message: dict) -> None:
+        """Drop local copies invalidated by another process"""
+        if message.get('namespace') != self.name:
+            return
+        op, items = message.get('op'), message.get('items', [])
+        if op == 'tags':
+            for shard in self._shards:
+                shard.invalidate_tags(items)
+        elif op == 'delete':
+            for key in items:
+                shard = self._shard(key)
+                with shard.lock:
+                    shard.discard(key)
+        elif op == 'clear':
+            for shard in self._shards:
+                shard.clear()
+    
+    def _backend_call(self, method: str, *args, default=None):
+        try:
+            return getattr(self.backend, method)(self.name, *args)
+        except Exception as e:
+            self.backend.stats['errors'] += 1
+            logger.warning(f"Shared cache {method} failed for {self.name}: {e}")
+            return default
+    
+    def _load_shared(self, key: str, shard: _CacheShard) -> Optional[Any]:
+        """Copy a backend entry into the local shard; returns its value"""
+        found = self._backend_call('get', key)
+        if found is None:
+            return None
+        value, expires_at, tags = found
+        entry = CacheEntry(value, 0, estimate_size(key) + estimate_size(value), tuple(tags))
+        entry.expires_at = expires_at
+        with shard.lock:
+            shard.store(key, entry)
+        return value
     
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
-        with self._lock:
-            entry = self._cache.get(key)
-            if entry is None:
-                return None
-            if entry.is_expired():
-                del self._cache[key]
-                return None
-            return entry.value
-    
-    def set(self, key: str, value: Any, ttl: int = 300) -> None:
-        """Set value in cache with TTL (default 5 minutes)"""
-        with self._lock:
-            self._cache[key] = CacheEntry(value, ttl)
+        shard = self._shard(key)
+        with shard.lock:
+            value = shard.lookup(key)
+        if value is None and self.backend is not None:
+            value = self._load_shared(key, shard)
+        return value
+    
+    def set(self, key: str, value: Any, ttl: int = 300, tags=(), generation: int = None) -> bool:
+        """
+        Set value in cache with TTL (default 5 minutes) and optional invalidation tags.
+        
+        A value computed from data read earlier can pass the generation() taken
+        before reading; a tagged value is then dropped if a tag invalidation has
+        happened since. Returns whether the value was stored.
+        """
+        entry = CacheEntry(value, ttl, estimate_size(key) + estimate_size(value), tuple(tags))
+        shard = self._shard(key)
+        with shard.lock:
+            stored = not (tags and generation is not None and shard.generation != generation)
+            if stored:
+                shard.store(key, entry)
+        if stored and self.backend is not None:
+            self._backend_call('set', key, value, ttl, entry.tags)
+        return stored
+    
+    def generation(self, key: str) -> int:
+        """Tag invalidation counter covering key, for set(generation=...)"""
+        shard = self._shard(key)
+        with shard.lock:
+            return shard.generation
     
     def delete(self, key: str) -> bool:
         """Delete key from cache"""
-        with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                return True
-            return False
+        shard = self._shard(key)
+        with shard.lock:
+            deleted = shard.discard(key)
+        if self.backend is not None:
+            self._backend_call('delete', key)
+        return deleted
     
     def clear(self) -> None:
         """Clear all cache entries"""
-        with self._lock:
-            self._cache.clear()
+        for shard in self._shards:
+            shard.clear()
+        if self.backend is not None:
+            self._backend_call('clear')
+    
+    def invalidate_tags(self, *tags: str) -> int:
+        """Remove entries carrying any of the tags; cost is O(tagged keys)"""
+        removed = sum(shard.invalidate_tags(tags) for shard in self._shards)
+        if self.backend is not None:
+            removed = max(removed, self._backend_call('invalidate_tags', tags, default=0))
+        return removed
+    
+    def keys(self) -> list:
+        """Snapshot of the keys currently cached"""
+        return [key for shard in self._shards for key in shard.keys()]
     
     def cleanup_expired(self) -> int:
         """Remove expired entries and return count of removed entries"""
-        with self._lock:
-            expired_keys = [
-                key for key, entry in self._cache.items()
-                if entry.is_expired()
-            ]
-            for key in expired_keys:
-                del self._cache[key]
-            return len(expired_keys)
-    
-    def get_or_set(self, key: str, factory: Callable[[], Any], ttl: int = 300) -> Any:
+        now = time.time()
+        return sum(shard.cleanup_expired(now) for shard in self._shards)
+    
+    def get_or_set(self, key: str, factory: Callable[[], Any], ttl: Any = 300,
+                   accept: Callable[[Any], bool] = None, tags=()) -> Any:
         """
         Get value from cache or compute and store it if not present.
-        This is an atomic operation to prevent cache stampede.
+        Concurrent misses on the same key wait for a single computation
+        (single-flight); the factory runs without holding any cache lock.
+        
+        Args:
+            ttl: Seconds to keep the value, or a callable computing it from the value
+            accept: Optional check a cached value must pass to be served
+            tags: Invalidation tags for the stored value
+        
+        A factory result of None is returned but not stored.
         """
-        with self._lock:
-            # Double-check pattern within lock
-            entry = self._cache.get(key)
-            if entry is None or entry.is_expired():
-                value = factory()
-                self._cache[key] = CacheEntry(value, ttl)
+        shard = self._shard(key)
+        with shard.lock:
+            value = shard.lookup(key)
+            if value is not None and (accept is None or accept(value)):
                 return value
-            return entry.value
+            flight = shard.inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = shard.inflight[key] = _Flight()
+                generation = shard.generation
+            else:
+                shard.stats['single_flight_waits'] += 1
+        
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        
+        try:
+            if self.backend is not None:
+                value = self._load_shared(key, shard)
+                if value is not None and (accept is None or accept(value)):
+                    flight.value = value
+                    return value
+            value = factory()
+            flight.value = value
+            if value is not None:
+                # An invalidation during the computation may have made it stale
+                self.set(key, value, ttl(value) if callable(ttl) else ttl, tags, generation)
+            return value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with shard.lock:
+                shard.inflight.pop(key, None)
+            flight.event.set()
+    
+    def get_stats(self) -> dict:
+        """Return hit, miss and eviction counters with current size"""
+        stats = {}
+        for shard in self._shards:
+            for name, value in shard.snapshot().items():
+                stats[name] = stats.get(name, 0) + value
+        stats['shards'] = len(self._shards)
+        stats['max_entries'] = self.max_entries
+        stats['max_bytes'] = self.max_bytes
+        if self.backend is not None:
+            stats['backend'] = type(self.backend).__name__
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
 
 
 # Global cache instance
-cache = InMemoryCache()
+cache = InMemoryCache('cache')
 
 
-def cached(ttl: int = 300, key_prefix: str = ''):
+class CachedResult:
+    """A memoized function result with its freshness window"""
+    
+    __slots__ = ('value', 'fresh_until', 'compute_time')
+    
+    def __init__(self, value: Any, ttl: int, compute_time: float):
+        self.value = value
+        self.fresh_until = time.time() + ttl if ttl > 0 else float('inf')
+        self.compute_time = compute_time
+    
+    def is_fresh(self, now: float = None) -> bool:
+        return (now or time.time()) < self.fresh_until
+    
+    def expires_early(self, now: float, beta: float) -> bool:
+        """
+        Probabilistic early expiry (XFetch): the closer the entry is to expiring
+        and the longer it took to compute, the likelier a caller refreshes it now.
+        """
+        if beta <= 0 or self.fresh_until == float('inf'):
+            return False
+        return now - self.compute_time * beta * math.log(random.random()) >= self.fresh_until
+
+
+def _encode_key_part(value: Any) -> str:
+    """Canonical text for key material: dict order is irrelevant, types stay distinct"""
+    try:
+        return json.dumps(value, sort_keys=True, separators=(',', ':'), default=_encode_fallback)
+    except TypeError:
+        # Dict keys of mixed types cannot be sorted; order them by their text instead
+        return json.dumps(_canonicalize(value), separators=(',', ':'), default=_encode_fallback)
+
+
+def _encode_fallback(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return {'<set>': sorted(value, key=_encode_key_part)}
+    return f"{type(value).__name__}:{value!r}"
+
+
+def _canonicalize(value: Any) -> Any:
+    if isinstance(value, dict):
+        return sorted([_encode_key_part(k), _canonicalize(v)] for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return [_canonicalize(v) for v in value]
+    return value
+
+
+def make_cache_key(namespace: str, key_material: Any) -> str:
+    """
+    Build a versioned cache key: v{CACHE_KEY_VERSION}:{namespace}:{arguments}.
+    Arguments are canonically encoded and hashed when long, so keys stay short
+    and equal arguments always produce the same key.
+    """
+    encoded = _encode_key_part(key_material)
+    if len(encoded) > MAX_KEY_ARGS_LENGTH:
+        encoded = '#' + hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()
+    return f"v{Config.CACHE_KEY_VERSION}:{namespace}:{encoded}"
+
+
+def cached(ttl: int = 300, key_prefix: str = '', negative_ttl: int = 0,
+           stale_ttl: int = 0, early_expiry_beta: float = 0.0, tags=(), key: Callable = None):
     """
     Decorator to cache function results.
     
     Args:
         ttl: Time to live in seconds (default 5 minutes)
         key_prefix: Prefix for cache key
+        negative_ttl: Cache None results for this many seconds (0 disables)
+        stale_ttl: Serve an expired result for up to this many seconds while it
+            is refreshed in the background (stale-while-revalidate)
+        early_expiry_beta: Enables probabilistic early refresh ahead of expiry;
+            1.0 is the usual setting, larger values refresh earlier
+        tags: Invalidation tags for each result; either a fixed iterable or a
+            callable receiving the call's arguments and returning the tags
+        key: Optional callable receiving the call's arguments and returning the
+            key material, for functions whose arguments are not all significant
+    
+    The decorated function gets invalidate(*args, **kwargs) and
+    cache_key(*args, **kwargs) helpers.
     """
     def decorator(func: Callable) -> Callable:
+        refreshing = set()
+        refreshing_lock = threading.Lock()
+        namespace = f"{key_prefix}{func.__name__}"
+        
+        def build_key(*args, **kwargs) -> str:
+            if key is not None:
+                return make_cache_key(namespace, key(*args, **kwargs))
+            return make_cache_key(namespace, [args, kwargs] if kwargs else args)
+        
+        def compute(args, kwargs) -> Optional[CachedResult]:
+            started = time.perf_counter()
+            value = func(*args, **kwargs)
+            elapsed = time.perf_counter() - started
+            if value is None:
+                return CachedResult(None, negative_ttl, elapsed) if negative_ttl > 0 else None
+            return CachedResult(value, ttl, elapsed)
+        
+        def storage_ttl(result: CachedResult) -> int:
+            if result.value is None:
+                return negative_ttl
+            return ttl + stale_ttl if ttl > 0 else 0
+        
+        def tags_for(args, kwargs) -> tuple:
+            return tuple(tags(*args, **kwargs) if callable(tags) else tags)
+        
+        def store(cache_key, result, entry_tags, generation):
+            # generation is taken before computing, as get_or_set does on a miss,
+            # so a result read before a tag invalidation is not cached after it
+            if result is not None:
+                cache.set(cache_key, result, storage_ttl(result), tags=entry_tags,
+                          generation=generation)
+        
+        def refresh_in_background(cache_key, args, kwargs):
+            with refreshing_lock:
+                if cache_key in refreshing:
+                    return
+                refreshing.add(cache_key)
+            generation = cache.generation(cache_key)
+            
+            def run():
+                try:
+                    store(cache_key, compute(args, kwargs), tags_for(args, kwargs), generation)
+                except Exception as e:
+                    logger.warning(f"Background refresh of {cache_key} failed: {e}")
+                finally:
+                    with refreshing_lock:
+                        refreshing.discard(cache_key)
+            
+            threading.Thread(target=run, daemon=True).start()
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Build cache key from function name and arguments
-            cache_key = f"{key_prefix}{func.__name__}"
-            if args:
-                cache_key += f":{':'.join(str(arg) for arg in args)}"
-            if kwargs:
-                cache_key += f":{':'.join(f'{k}={v}' for k, v in sorted(kwargs.items()))}"
+            cache_key = build_key(*args, **kwargs)
             
             # Try to get from cache
-            cached_value = cache.get(cache_key)
-            if cached_value is not None:
-                return cached_value
+            result = cache.get(cache_key)
+            if result is not None:
+                now = time.time()
+                fresh = result.is_fresh(now)
+                if fresh and not result.expires_early(now, early_expiry_beta):
+                    return result.value
+                if stale_ttl > 0:
+                    # Serve the stale (or soon to expire) value and refresh behind it
+                    refresh_in_background(cache_key, args, kwargs)
+                    return result.value
+                if fresh:
+                    # Picked for early refresh: this caller recomputes ahead of expiry
+                    generation = cache.generation(cache_key)
+                    result = compute(args, kwargs)
+                    store(cache_key, result, tags_for(args, kwargs), generation)
+                    return result.value if result is not None else None
             
-            # Compute and cache result
-            result = func(*args, **kwargs)
-            cache.set(cache_key, result, ttl)
-            return result
+            # Compute and cache result, once for concurrent callers
+            result = cache.get_or_set(
+                cache_key,
+                lambda: compute(args, kwargs),
+                ttl=storage_ttl,
+                accept=CachedResult.is_fresh,
+                tags=tags_for(args, kwargs)
+            )
+            return result.value if result is not None else None
         
         # Add cache invalidation method
-        wrapper.invalidate = lambda *args, **kwargs: cache.delete(
-            f"{key_prefix}{func.__name__}" + 
-            (f":{':'.join(str(arg) for arg in args)}" if args else '') +
-            (f":{':'.join(f'{k}={v}' for k, v in sorted(kwargs.items()))}" if kwargs else '')
-        )
+        wrapper.invalidate = lambda *args, **kwargs: cache.delete(build_key(*args, **kwargs))
+        wrapper.cache_key = build_key
         
         return wrapper
     return decorator
@@ -129,7 +586,8 @@ def cached(ttl: int = 300, key_prefix: str = ''):
 def invalidate_cache(key_pattern: str = None):
     """
     Invalidate cache entries.
-    If key_pattern is provided, only matching keys are invalidated.
+    If key_pattern is provided, keys containing it as a substring are
+    invalidated; this scans every key, so prefer invalidate_tags for writes.
     Otherwise, entire cache is cleared.
     """
     if key_pattern is None:
@@ -137,12 +595,8 @@ def invalidate_cache(key_pattern: str = None):
     else:
         # Note: This is a simple implementation; for production, 
         # consider using a more sophisticated pattern matching
-        with cache._lock:
-            keys_to_delete = [
-                key for key in cache._cache.keys()
-                if key_pattern in key
-            ]
-            for key in keys_to_delete:
+        for key in cache.keys():
+            if key_pattern in key:
                 cache.delete(key)
 
 
@@ -153,10 +607,9 @@ def start_cache_cleanup(interval: int = 60):
         while True:
             time.sleep(interval)
             try:
-                removed = cache.cleanup_expired()
+                removed = sum(c.cleanup_expired() for c in named_caches().values())
                 if removed > 0:
-                    import logging
-                    logging.getLogger(__name__).debug(f"Cleaned up {removed} expired cache entries")
+                    logger.debug(f"Cleaned up {removed} expired cache entries")
             except Exception:
                 pass
     
@@ -166,6 +619,45 @@ def start_cache_cleanup(interval: int = 60):
 
 
 # Default cache instances for common data
-categories_cache = InMemoryCache()
-products_cache = InMemoryCache()
-user_cache = InMemoryCache()
+categories_cache = InMemoryCache('categories_cache', max_entries=1000)
+products_cache = InMemoryCache('products_cache')
+user_cache = InMemoryCache('user_cache', max_entries=5000)
+
+
+def configure_cache_backend(backend) -> None:
+    """Attach a shared backend (e.g. from cache_backends.create_cache_backend) to every named cache"""
+    for c in named_caches().values():
+        c.attach_backend(backend)
+
+
+def named_caches() -> dict:
+    """Return every module-level cache instance by name"""
+    return {c.name: c for c in (cache, categories_cache, products_cache, user_cache)}
+
+
+def invalidate_tags(*tags: str) -> int:
+    """Invalidate entries carrying any of the tags across every named cache"""
+    return sum(c.invalidate_tags(*tags) for c in named_caches().values())
+
+
+# Tag builders shared by cached readers and the writes that invalidate them
+def product_tag(store_id, item_id) -> str:
+    # ItemIds repeat across stores; a product is the (StoreId, ItemId) pair
+    return f"product:{store_id}:{item_id}"
+
+
+def category_tag(category_id) -> str:
+    return f"category:{category_id}"
+
+
+def vendor_tag(vendor_id) -> str:
+    return f"vendor:{vendor_id}"
+
+
+def store_tag(store_id) -> str:
+    return f"store:{store_id}"
+
+
+def get_cache_stats() -> dict:
+    """Get hit, miss and eviction counters for each named cache"""
+    return {name: c.get_stats() for name, c in named_caches().items()}
@@ -0,0 +1,398 @@
+"""
+Shared cache backends for Bharatshaala Backend.
+
+InMemoryCache keeps a per-process copy of hot entries; a backend attached to
+it shares entries between worker processes and broadcasts invalidations so
+every worker drops its local copy. Two implementations are provided:
+
+- SQLiteCacheBackend: a cache file on local disk, for workers on one host
+- RedisCacheBackend: any Redis-protocol server, selected through REDIS_URL
+"""
+
+import os
+import json
+import time
+import uuid
+import pickle
+import sqlite3
+import logging
+import threading
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+# (value, expires_at, tags) as returned by CacheBackend.get
+BackendEntry = Tuple[Any, float, tuple]
+
+
+class CacheBackend:
+    """
+    Interface for a cache shared between processes.
+
+    Keys and tags are scoped by namespace (the owning cache's name).
+    Deletions, tag invalidations and clears are broadcast to every other
+    process; subscribers receive messages of the form
+    {'origin', 'namespace', 'op': 'delete' | 'tags' | 'clear', 'items'}.
+    Values must be picklable.
+    """
+
+    def __init__(self):
+        self.node_id = uuid.uuid4().hex
+        self._listeners = []
+        self._listener_pid = None
+        self._listener_lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'sets': 0, 'errors': 0,
+                      'published': 0, 'received': 0}
+
+    def get(self, namespace: str, key: str) -> Optional[BackendEntry]:
+        raise NotImplementedError
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float, tags: Iterable[str] = ()) -> None:
+        raise NotImplementedError
+
+    def delete(self, namespace: str, key: str) -> None:
+        raise NotImplementedError
+
+    def invalidate_tags(self, namespace: str, tags: Iterable[str]) -> int:
+        raise NotImplementedError
+
+    def clear(self, namespace: str) -> None:
+        raise NotImplementedError
+
+    def _start_listener(self) -> None:
+        """Start receiving broadcasts in this process"""
+        raise NotImplementedError
+
+    def subscribe(self, callback: Callable[[dict], None]) -> None:
+        """Register a callback for invalidations made by other processes"""
+        self._listeners.append(callback)
+        self.ensure_listener()
+
+    def ensure_listener(self) -> None:
+        """(Re)start the listener, e.g. in a worker forked after setup"""
+        if not self._listeners or self._listener_pid == os.getpid():
+            return
+        with self._listener_lock:
+            if self._listener_pid != os.getpid():
+                self._listener_pid = os.getpid()
+                self._start_listener()
+
+    @property
+    def origin(self) -> str:
+        """Identifies this backend in this process (forked workers differ)"""
+        return f"{self.node_id}:{os.getpid()}"
+
+    def _message(self, namespace: str, op: str, items=()) -> str:
+        self.stats['published'] += 1
+        return json.dumps({'origin': self.origin, 'namespace': namespace,
+                           'op': op, 'items': list(items)})
+
+    def _dispatch(self, payload) -> None:
+        """Deliver a broadcast from another process to the local listeners"""
+        message = json.loads(payload)
+        if message.get('origin') == self.origin:
+            return
+        self.stats['received'] += 1
+        for callback in self._listeners:
+            try:
+                callback(message)
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener failed: {e}")
+
+    def close(self) -> None:
+        pass
+
+    def get_stats(self) -> dict:
+        return dict(self.stats, backend=type(self).__name__)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Cache shared through a SQLite file.
+
+    Invalidations are appended to an event table that each process polls,
+    so a worker sees another worker's invalidation within poll_interval.
+    """
+
+    EVENT_RETENTION = 300  # seconds an invalidation event is kept for pollers
+
+    def __init__(self, path: str, poll_interval: float = 0.5):
+        super().__init__()
+        self.path = path
+        self.poll_interval = poll_interval
+        self._local = threading.local()
+        self._last_event = None
+        self._poll_lock = threading.Lock()
+        self._poll_thread = None
+        self._connection().executescript("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                Namespace TEXT NOT NULL,
+                Key TEXT NOT NULL,
+                Value BLOB NOT NULL,
+                ExpiresAt REAL,
+                Tags TEXT NOT NULL DEFAULT '[]',
+                PRIMARY KEY (Namespace, Key)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS cache_tags (
+                Namespace TEXT NOT NULL,
+                Tag TEXT NOT NULL,
+                Key TEXT NOT NULL,
+                PRIMARY KEY (Namespace, Tag, Key)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_cache_tags_key ON cache_tags(Namespace, Key);
+            CREATE TABLE IF NOT EXISTS cache_events (
+                Seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                Payload TEXT NOT NULL,
+                CreatedAt REAL NOT NULL
+            );
+        """)
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread and process; connections never cross a fork"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _write(self, statements) -> None:
+        """Run (sql, params) pairs in one immediate transaction"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, params in statements:
+                conn.execute(sql, params)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _publish(self, namespace: str, op: str, items=()):
+        return ("INSERT INTO cache_events (Payload, CreatedAt) VALUES (?, ?)",
+                (self._message(namespace, op, items), time.time()))
+
+    def get(self, namespace, key):
+        self.ensure_listener()
+        row = self._connection().execute(
+            "SELECT Value, ExpiresAt, Tags FROM cache_entries WHERE Namespace = ? AND Key = ?",
+            (namespace, key)).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        expires_at = row[1] if row[1] is not None else float('inf')
+        return pickle.loads(row[0]), expires_at, tuple(json.loads(row[2]))
+
+    def set(self, namespace, key, value, ttl, tags=()):
+        tags = list(tags)
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        expires_at = time.time() + ttl if ttl > 0 else None
+        statements = [
+            ("DELETE FROM cache_tags WHERE Namespace = ? AND Key = ?", (namespace, key)),
+            ("INSERT OR REPLACE INTO cache_entries (Namespace, Key, Value, ExpiresAt, Tags) "
+             "VALUES (?, ?, ?, ?, ?)", (namespace, key, data, expires_at, json.dumps(tags))),
+        ]
+        statements += [("INSERT OR IGNORE INTO cache_tags (Namespace, Tag, Key) VALUES (?, ?, ?)",
+                        (namespace, tag, key)) for tag in tags]
+        self._write(statements)
+        self.stats['sets'] += 1
+
+    def _delete_keys(self, namespace, keys):
+        statements = []
+        for key in keys:
+            statements.append(("DELETE FROM cache_tags WHERE Namespace = ? AND Key = ?",
+                               (namespace, key)))
+            statements.append(("DELETE FROM cache_entries WHERE Namespace = ? AND Key = ?",
+                               (namespace, key)))
+        return statements
+
+    def delete(self, namespace, key):
+        self._write(self._delete_keys(namespace, [key]) +
+                    [self._publish(namespace, 'delete', [key])])
+
+    def invalidate_tags(self, namespace, tags):
+        tags = list(tags)
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            keys = set()
+            for tag in tags:
+                keys.update(row[0] for row in conn.execute(
+                    "SELECT Key FROM cache_tags WHERE Namespace = ? AND Tag = ?", (namespace, tag)))
+            for sql, params in self._delete_keys(namespace, keys):
+                conn.execute(sql, params)
+            conn.execute(*self._publish(namespace, 'tags', tags))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return len(keys)
+
+    def clear(self, namespace):
+        self._write([
+            ("DELETE FROM cache_tags WHERE Namespace = ?", (namespace,)),
+            ("DELETE FROM cache_entries WHERE Namespace = ?", (namespace,)),
+            self._publish(namespace, 'clear'),
+        ])
+
+    def cleanup_expired(self) -> int:
+        """Drop expired entries and old events; run occasionally"""
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("""
+                DELETE FROM cache_tags WHERE EXISTS (
+                    SELECT 1 FROM cache_entries e
+                    WHERE e.Namespace = cache_tags.Namespace AND e.Key = cache_tags.Key
+                      AND e.ExpiresAt <= ?)
+            """, (now,))
+            removed = conn.execute("DELETE FROM cache_entries WHERE ExpiresAt <= ?", (now,)).rowcount
+            conn.execute("DELETE FROM cache_events WHERE CreatedAt < ?", (now - self.EVENT_RETENTION,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return removed
+
+    def poll(self) -> int:
+        """Deliver invalidation events published since the last poll"""
+        with self._poll_lock:
+            conn = self._connection()
+            if self._last_event is None:
+                self._last_event = conn.execute(
+                    "SELECT COALESCE(MAX(Seq), 0) FROM cache_events").fetchone()[0]
+                return 0
+            rows = conn.execute("SELECT Seq, Payload FROM cache_events WHERE Seq > ? ORDER BY Seq",
+                                (self._last_event,)).fetchall()
+            for seq, payload in rows:
+                self._last_event = seq
+                self._dispatch(payload)
+            return len(rows)
+
+    def _start_listener(self):
+        self._last_event = None
+        self.poll()
+
+        def poll_loop():
+            while True:
+                time.sleep(self.poll_interval)
+                try:
+                    self.poll()
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    logger.warning(f"Polling cache events failed: {e}")
+
+        self._poll_thread = threading.Thread(target=poll_loop, daemon=True)
+        self._poll_thread.start()
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache shared through a Redis-protocol server.
+
+    Each tag is a set of the keys carrying it; invalidations are broadcast on
+    a pub/sub channel. Pass an existing client (e.g. fakeredis) or a URL.
+    """
+
+    def __init__(self, url: str = None, client=None, prefix: str = 'bharatshaala:cache'):
+        super().__init__()
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError("The redis package is required for RedisCacheBackend")
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        self.channel = f"{prefix}:invalidate"
+        self._pubsub_thread = None
+
+    def _key(self, namespace, key):
+        return f"{self.prefix}:{namespace}:k:{key}"
+
+    def _tag(self, namespace, tag):
+        return f"{self.prefix}:{namespace}:t:{tag}"
+
+    def get(self, namespace, key):
+        self.ensure_listener()
+        data = self.client.get(self._key(namespace, key))
+        if data is None:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return pickle.loads(data)
+
+    def set(self, namespace, key, value, ttl, tags=()):
+        tags = tuple(tags)
+        expires_at = time.time() + ttl if ttl > 0 else float('inf')
+        data = pickle.dumps((value, expires_at, tags), pickle.HIGHEST_PROTOCOL)
+        full_key = self._key(namespace, key)
+        pipe = self.client.pipeline()
+        pipe.set(full_key, data, px=int(ttl * 1000) if ttl > 0 else None)
+        for tag in tags:
+            pipe.sadd(self._tag(namespace, tag), full_key)
+        pipe.execute()
+        self.stats['sets'] += 1
+
+    def delete(self, namespace, key):
+        self.client.delete(self._key(namespace, key))
+        self.client.publish(self.channel, self._message(namespace, 'delete', [key]))
+
+    def invalidate_tags(self, namespace, tags):
+        tags = list(tags)
+        pipe = self.client.pipeline()
+        for tag in tags:
+            pipe.smembers(self._tag(namespace, tag))
+        keys = set()
+        for members in pipe.execute():
+            keys.update(members)
+        pipe = self.client.pipeline()
+        if keys:
+            pipe.delete(*keys)
+        pipe.delete(*[self._tag(namespace, tag) for tag in tags])
+        pipe.execute()
+        self.client.publish(self.channel, self._message(namespace, 'tags', tags))
+        return len(keys)
+
+    def clear(self, namespace):
+        keys = list(self.client.scan_iter(match=f"{self.prefix}:{namespace}:*"))
+        if keys:
+            self.client.delete(*keys)
+        self.client.publish(self.channel, self._message(namespace, 'clear'))
+
+    def _start_listener(self):
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.channel)
+
+        def listen_loop():
+            while True:
+                try:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get('type') == 'message':
+                        self._dispatch(message['data'])
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    logger.warning(f"Receiving cache invalidations failed: {e}")
+                    time.sleep(1.0)
+
+        self._pubsub_thread = threading.Thread(target=listen_loop, daemon=True)
+        self._pubsub_thread.start()
+
+
+def create_cache_backend(kind: str = None, url: str = None) -> Optional[CacheBackend]:
+    """Build the backend named by Config.CACHE_BACKEND ('memory' means none)"""
+    kind = (kind or Config.CACHE_BACKEND).lower()
+    if kind == 'memory':
+        return None
+    if kind == 'sqlite':
+        return SQLiteCacheBackend(url or Config.CACHE_SQLITE_PATH)
+    if kind == 'redis':
+        return RedisCacheBackend(url or Config.CACHE_REDIS_URL)
+    raise ValueError(f"Unknown cache backend: {kind}")
@@ -30,6 +30,27 @@ def get_cart():
     except Exception as e:
         return error_response(f"Failed to retrieve cart: {str(e)}", 500)
 
+def _quantity(value):
+    """A positive integer quantity, or None"""
+    if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+        return value
+    return None
+
+def _identifier(value):
+    """A positive integer id, sent as a JSON number or a numeric string, or None"""
+    if isinstance(value, str) and value.strip().isdecimal():
+        value = int(value)
+    if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+        return value
+    return None
+
+def _cart_error(e):
+    if e.reason == 'not_found':
+        return error_response(str(e), 404)
+    if e.reason == 'checked_out':
+        return error_response(str(e), 409)
+    return error_response(str(e), 400)
+
 @cart_bp.route('/cart/add', methods=['POST'])
 @limiter.limit(Config.LIMIT_WRITE_CART)
 @jwt_required()
@@ -38,47 +59,83 @@ def add_to_cart():
         user_id = get_jwt_identity()
         data = request.get_json()
         
+        store_id = data.get('storeId') or None
         product_id = data.get('productId')
-        quantity = data.get('quantity', 1)
+        quantity = _quantity(data.get('quantity', 1))
         
         if not product_id:
             return error_response("Product ID is required", 400)
         
-        if quantity <= 0:
+        if quantity is None:
             return error_response("Quantity must be greater than 0", 400)
         
-        # Check if product exists and is available
-        product = database.get_product_by_id(product_id)
-        if not product:
-            return error_response("Product not found", 404)
-        
-        if product['status'] != 'active':
-            return error_response("Product is not available", 400)
+        # One upsert checks the product, its stock and any existing cart line;
+        # without a storeId the product's store is looked up
+        try:
+            item = database.upsert_cart_item(user_id, store_id, product_id, quantity)
+        except database.CartError as e:
+            return _cart_error(e)
         
-        if product['stock_quantity'] < quantity:
-            return error_response("Insufficient stock", 400)
+        return success_response({'cart_id': item['cart_id'], 'quantity': item['quantity']},
+                                "Item added to cart successfully")
         
-        # Check if item already exists in cart
-        existing_item = database.get_cart_item(user_id, product_id)
-        
-        if existing_item:
-            # Update quantity
-            new_quantity = existing_item['quantity'] + quantity
-            if product['stock_quantity'] < new_quantity:
-                return error_response("Insufficient stock for total quantity", 400)
-            
-            success = database.update_cart_item_quantity(existing_item['id'], new_quantity)
+    except Exception as e:
+        return error_response(f"Failed to add to cart: {str(e)}", 500)
+
+def _batch_operations(data, allowed_ops):
+    """
+    Parse the operations of a batch request. Returns the well formed ones
+    for the database and a result slot per entry, already filled with
+    'invalid' for malformed entries, or an error message for the request.
+    """
+    entries = data.get('operations') if isinstance(data, dict) else None
+    if not isinstance(entries, list) or not entries:
+        return None, None, "Operations are required"
+    
+    if len(entries) > Config.BATCH_MAX_OPERATIONS:
+        return None, None, f"At most {Config.BATCH_MAX_OPERATIONS} operations per request"
+    
+    operations, slots = [], []
+    for entry in entries:
+        entry = entry if isinstance(entry, dict) else {}
+        op = entry.get('op', 'add')
+        quantity = _quantity(entry.get('quantity', 1))
+        # Ids are matched against integer keys, so "12" must become 12
+        store_id, item_id = _identifier(entry.get('storeId')), _identifier(entry.get('productId'))
+        if (op not in allowed_ops or store_id is None or item_id is None
+                or (op != 'remove' and quantity is None)):
+            slots.append({'op': op, 'store_id': entry.get('storeId'), 'item_id': entry.get('productId'),
+                          'status': 'invalid'})
         else:
-            # Add new item to cart
-            success = database.add_to_cart(user_id, product_id, quantity, product['price'])
+            operations.append({'op': op, 'store_id': store_id, 'item_id': item_id,
+                               'quantity': quantity})
+            slots.append(None)
+    return operations, slots, None
+
+def _batch_results(slots, results):
+    """Fill the result slots left open for well formed operations, in order"""
+    results = iter(results)
+    return [slot or next(results) for slot in slots]
+
+@cart_bp.route('/cart/batch', methods=['POST'])
+@limiter.limit(Config.LIMIT_WRITE_CART)
+@jwt_required()
+def batch_update_cart():
+    try:
+        user_id = get_jwt_identity()
         
-        if not success:
-            return error_response("Failed to add item to cart", 500)
+        operations, slots, error = _batch_operations(request.get_json(), ('add', 'set', 'remove'))
+        if error:
+            return error_response(error, 400)
         
-        return success_response(None, "Item added to cart successfully")
+        # Stock is checked for every item at once and all operations are
+        # applied in one transaction; each reports its own outcome
+        results = database.apply_cart_batch(user_id, operations)
+        
+        return success_response(_batch_results(slots, results), "Cart updated")
         
     except Exception as e:
-        return error_response(f"Failed to add to cart: {str(e)}", 500)
+        return error_response(f"Failed to update cart: {str(e)}", 500)
 
 @cart_bp.route('/cart/items/<int:item_id>', methods=['PUT'])
 @limiter.limit(Config.LIMIT_WRITE_CART)
@@ -88,23 +145,15 @@ def update_cart_item(item_id):
         user_id = get_jwt_identity()
         data = request.get_json()
         
-        quantity = data.get('quantity')
-        if not quantity or quantity <= 0:
+        quantity = _quantity(data.get('quantity'))
+        if quantity is None:
             return error_response("Valid quantity is required", 400)
         
-        # Check if cart item belongs to user
-        cart_item = database.get_cart_item_by_id(item_id)
-        if not cart_item or cart_item['user_id'] != int(user_id):
-            return error_response("Cart item not found", 404)
-        
-        # Check stock availability
-        product = database.get_product_by_id(cart_item['product_id'])
-        if product['stock_quantity'] < quantity:
-            return error_response("Insufficient stock", 400)
-        
-        success = database.update_cart_item_quantity(item_id, quantity)
-        if not success:
-            return error_response("Failed to update cart item", 500)
+        # Ownership and stock are checked by the update itself
+        try:
+            database.set_cart_item_quantity(user_id, item_id, quantity)
+        except database.CartError as e:
+            return _cart_error(e)
         
         return success_response(None, "Cart item updated successfully")
         
@@ -118,15 +167,9 @@ def remove_from_cart(item_id):
     try:
         user_id = get_jwt_identity()
         
-        # Check if cart item belongs to user
-        cart_item = database.get_cart_item_by_id(item_id)
-        if not cart_item or cart_item['user_id'] != int(user_id):
+        if not database.remove_cart_item(user_id, item_id):
             return error_response("Cart item not found", 404)
         
-        success = database.remove_from_cart(item_id)
-        if not success:
-            return error_response("Failed to remove item from cart", 500)
-        
         return success_response(None, "Item removed from cart successfully")
         
     except Exception as e:
@@ -192,6 +235,24 @@ def add_to_wishlist():
     except Exception as e:
         return error_response(f"Failed to add to wishlist: {str(e)}", 500)
 
+@cart_bp.route('/wishlist/batch', methods=['POST'])
+@limiter.limit(Config.LIMIT_WRITE_CART)
+@jwt_required()
+def batch_update_wishlist():
+    try:
+        user_id = get_jwt_identity()
+        
+        operations, slots, error = _batch_operations(request.get_json(), ('add', 'remove'))
+        if error:
+            return error_response(error, 400)
+        
+        results = database.apply_wishlist_batch(user_id, operations)
+        
+        return success_response(_batch_results(slots, results), "Wishlist updated")
+        
+    except Exception as e:
+        return error_response(f"Failed to update wishlist: {str(e)}", 500)
+
 @cart_bp.route('/wishlist/<int:product_id>', methods=['DELETE'])
 @limiter.limit(Config.LIMIT_WRITE_CART)
 @jwt_required()
@@ -10,8 +10,12 @@ class Config:
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
     
-    # Database Configuration
-    DATABASE_URL = os.environ.get('DATABASE_URL') or 'sqlite:///bharatshaala.db'
+    # Database Configuration (single source for the pools, helpers and Alembic).
+    # The default is sql.db, the file the application has always written to.
+    DATABASE_URL = os.environ.get('DATABASE_URL') or 'sqlite:///sql.db'
+    DATABASE_PATH = DATABASE_URL.replace('sqlite:///', '', 1)
+    DATABASE_TIMEOUT = 30.0  # seconds to wait on a locked database
+    DATABASE_READ_POOL_SIZE = int(os.environ.get('DATABASE_READ_POOL_SIZE') or 4)
     
     # API Configuration
     API_VERSION = 'v1'
@@ -20,6 +24,7 @@ class Config:
     # Razorpay Configuration
     RAZORPAY_KEY_ID = os.environ.get('RAZORPAY_KEY_ID') or 'rzp_test_BXNSan3NdLPrPa'
     RAZORPAY_KEY_SECRET = os.environ.get('RAZORPAY_KEY_SECRET') or 'jQLMopwxI1FrtqnrHg3j9e3R'
+    RAZORPAY_POOL_SIZE = int(os.environ.get('RAZORPAY_POOL_SIZE') or 10)  # keep-alive connections per worker
     
     # Upload Configuration
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER') or 'uploads'
@@ -39,6 +44,14 @@ class Config:
     # Pagination
     DEFAULT_PAGE_SIZE = 20
     MAX_PAGE_SIZE = 100
+    # Cursor-paginated listings report a row count cached for this many seconds
+    PAGINATION_COUNT_TTL = int(os.environ.get('PAGINATION_COUNT_TTL', 60))
+    # Admin dashboard aggregates older than this are recomputed in the background
+    DASHBOARD_SNAPSHOT_MAX_AGE = int(os.environ.get('DASHBOARD_SNAPSHOT_MAX_AGE', 60))
+    # Seconds the category tree is cached; category writes invalidate it sooner
+    CATEGORY_TREE_TTL = int(os.environ.get('CATEGORY_TREE_TTL', 3600))
+    # Most operations a single cart or wishlist batch request may apply
+    BATCH_MAX_OPERATIONS = int(os.environ.get('BATCH_MAX_OPERATIONS', 100))
     
     # Application Settings
     SHIPPING_COST = 100
@@ -51,6 +64,12 @@ class Config:
     RATELIMIT_KEY_PREFIX = "rate_limit"
     RATELIMIT_HEADERS_ENABLED = True
 
+    # Shared cache backend: 'memory' (per process), 'sqlite' or 'redis'
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+    CACHE_SQLITE_PATH = os.environ.get('CACHE_SQLITE_PATH') or 'bharatshaala_cache.db'
+    CACHE_REDIS_URL = os.environ.get('REDIS_URL') or 'redis://localhost:6379/0'
+    CACHE_KEY_VERSION = os.environ.get('CACHE_KEY_VERSION', '1')  # bump on deploy to drop every @cached entry
+
     #Rate Limits
     LIMIT_AUTH = "5 per 15 minutes"
     LIMIT_READ_ADMIN = "60 per minute"
@@ -63,7 +82,7 @@ class Config:
     LIMIT_ORDERS_READ_ORDER= "60 per minute"
     LIMIT_ORDERS_WRITE_ORDER= "10 per minute"
     LIMIT_READ_PRODUCTS= "100 per minute"
-    LIMIT_SEARCH_PRODUCTS= "2 per second"
+    LIMIT_SEARCH_PRODUCTS= "10 per second"
     LIMIT_WRITE_PRODUCTS= "5 per minute"
     LIMIT_READ_VENDOR= "60 per minute"
     LIMIT_WRITE_VENDOR= "20 per minute"
\ No newline at end of file
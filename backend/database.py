@@ -2,31 +2,41 @@ import sqlite3
 import json
 import datetime
 import hashlib
+import html
 import uuid
 import logging
 import os
+import threading
+import time
 from contextlib import contextmanager
 from functools import wraps
 from flask_bcrypt import Bcrypt
 
 # Import new modules for optimization
-from .cache import cache, cached, categories_cache, products_cache
+from .config import Config
+from .cache import (
+    cache, cached, categories_cache, products_cache, invalidate_tags, make_cache_key,
+    product_tag, category_tag, vendor_tag, store_tag
+)
 from .db_utils import (
     get_pooled_connection, 
+    get_read_connection,
     transaction, 
     with_retry, 
     QueryLogger,
     query_logger,
     enable_query_logging,
-    get_connection_pool
+    get_connection_pool,
+    get_pool_stats,
+    get_cached_query
 )
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Database configuration
-DATABASE_NAME = 'sql.db'
+# Database configuration (kept for backward compatibility; Config is the source)
+DATABASE_NAME = Config.DATABASE_PATH
 
 # Initialize Bcrypt
 bcrypt = Bcrypt()
@@ -34,20 +44,18 @@ bcrypt = Bcrypt()
 # Context manager for database connections
 @contextmanager
 def get_db_connection():
-    """Context manager for database connections with proper error handling"""
-    conn = None
-    try:
-        conn = sqlite3.connect(DATABASE_NAME)
-        conn.row_factory = sqlite3.Row  # Enable column access by name
+    """
+    Borrow a connection from the shared pool.
+    Nested calls on the same thread reuse the connection already held.
+    """
+    with get_pooled_connection() as conn:
+        yield conn
+
+@contextmanager
+def get_db_read_connection():
+    """Borrow a read-only connection for helpers that never write"""
+    with get_read_connection() as conn:
         yield conn
-    except sqlite3.Error as e:
-        if conn:
-            conn.rollback()
-        logger.error(f"Database error: {e}")
-        raise
-    finally:
-        if conn:
-            conn.close()
 
 # Database initialization
 def initialize_database():
@@ -63,6 +71,10 @@ def initialize_database():
         create_reviews_table()
         create_categories_table()
         create_wishlist_table()
+        create_indexes()
+        create_search_index()
+        create_dashboard_tables()
+        create_sales_rollup_tables()
         
         # Insert default data
         insert_default_invitation_codes()
@@ -73,6 +85,143 @@ def initialize_database():
         logger.error(f"Database initialization failed: {e}")
         raise
 
+# Secondary indexes, one per hot lookup path (mirrored by alembic 002_hot_path_indexes)
+HOT_PATH_INDEXES = (
+    # get_user_orders
+    "CREATE INDEX IF NOT EXISTS ix_orders_customer_date ON orders(CustomerId, OrderDate DESC, OrderTime DESC)",
+    # retrieve_orders_by_vendor, vendor get_dashboard_stats
+    "CREATE INDEX IF NOT EXISTS ix_orders_store_date ON orders(StoreId, OrderDate DESC, OrderTime DESC)",
+    # get_order_summary, update_order_status, add_review
+    "CREATE INDEX IF NOT EXISTS ix_orders_order_id ON orders(OrderId)",
+    # select_user_cart, clear_user_cart, add_order_id: only open carts are read by customer
+    "CREATE INDEX IF NOT EXISTS ix_cart_open_customer ON cart(CustomerId, DateAdded DESC) WHERE OrderId IS NULL",
+    # update_cart
+    "CREATE INDEX IF NOT EXISTS ix_cart_order_id ON cart(OrderId) WHERE OrderId IS NOT NULL",
+    # get_product_reviews
+    "CREATE INDEX IF NOT EXISTS ix_reviews_product_approved ON reviews(ProductId, StoreId, DateCreated DESC) WHERE IsApproved = 1",
+    # retrieve_data_from_inventory
+    "CREATE INDEX IF NOT EXISTS ix_inventory_vendor_active ON inventory(VendorId, DateModified DESC) WHERE IsActive = 1",
+    # vendor get_dashboard_stats (covering)
+    "CREATE INDEX IF NOT EXISTS ix_inventory_store ON inventory(StoreId, ItemId, Quantity)",
+    # get_order_summary
+    "CREATE INDEX IF NOT EXISTS ix_payments_order_id ON payments(OrderId)",
+    # get_categories
+    "CREATE INDEX IF NOT EXISTS ix_categories_parent_sort ON Categories(ParentCategoryId, SortOrder, CategoryName)",
+    # get_user_wishlist
+    "CREATE INDEX IF NOT EXISTS ix_wishlist_customer_date ON wishlist(CustomerId, DateAdded DESC)",
+    # get_products_with_filters, one per sort order (mirrored by alembic 004_keyset_pagination)
+    "CREATE INDEX IF NOT EXISTS ix_store_active_date ON Store(DateAdded, StoreId, ItemId) WHERE IsActive = 1",
+    "CREATE INDEX IF NOT EXISTS ix_store_active_price ON Store(Price, StoreId, ItemId) WHERE IsActive = 1",
+    "CREATE INDEX IF NOT EXISTS ix_store_active_name ON Store(ItemName, StoreId, ItemId) WHERE IsActive = 1",
+    # upsert_cart_item without a store (mirrored by alembic 008_store_item_lookup)
+    "CREATE INDEX IF NOT EXISTS ix_store_active_item ON Store(ItemId, StoreId) WHERE IsActive = 1",
+    # get_all_orders_admin
+    "CREATE INDEX IF NOT EXISTS ix_orders_date ON orders(OrderDate, OrderTime, OrderId)",
+)
+
+def create_indexes():
+    """Create the hot path indexes and refresh planner statistics"""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        for statement in HOT_PATH_INDEXES:
+            cursor.execute(statement)
+        conn.commit()
+        cursor.execute("PRAGMA optimize")
+
+# KEYSET PAGINATION
+def _keyset_clause(key_columns, after, descending=True, nullable=False):
+    """
+    SQL conditions for the rows strictly past the cursor key after, in the
+    order of key_columns, each with its parameters. A row value comparison
+    lets SQLite seek into the index rather than step over an OFFSET.
+    
+    With nullable, the leading sort column may be NULL, which SQLite sorts
+    before every value. A comparison with NULL is never true, so the rows
+    past the cursor are split into segments that are read one after another:
+    the rows with a value and those with a NULL, each still an index seek.
+    The remaining key columns must not be NULL.
+    """
+    scalar = lambda value: isinstance(value, (str, int, float))
+    if len(after) != len(key_columns) or not ((after[0] is None and nullable) or scalar(after[0])) \
+            or not all(map(scalar, after[1:])):
+        raise ValueError("Invalid cursor")
+    operator = '<' if descending else '>'
+    
+    def seek(columns, values):
+        params = {f"after_{n}": value for n, value in enumerate(values)}
+        placeholders = ', '.join(f":{name}" for name in params)
+        return f"({', '.join(columns)}) {operator} ({placeholders})", params
+    
+    leading = key_columns[0]
+    if after[0] is not None:
+        segments = [seek(key_columns, after)]
+        if descending and nullable:
+            segments.append((f"{leading} IS NULL", {}))
+        return [(f"AND {condition}", params) for condition, params in segments]
+    if len(key_columns) == 1:
+        raise ValueError("Invalid cursor")
+    condition, params = seek(key_columns[1:], after[1:])
+    segments = [(f"{leading} IS NULL AND {condition}", params)]
+    if not descending:
+        segments.append((f"{leading} IS NOT NULL", {}))
+    return [(f"AND {condition}", params) for condition, params in segments]
+
+def _count_rows(query, params):
+    with get_db_read_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(get_cached_query(f"SELECT COUNT(*) FROM ({query})"), params)
+        return cursor.fetchone()[0]
+
+@cached(ttl=Config.PAGINATION_COUNT_TTL, key_prefix='counts:')
+def _approximate_count(query, params):
+    """Row count of a listing, shared by every request for PAGINATION_COUNT_TTL seconds"""
+    return _count_rows(query, params)
+
+def _fetch_page(query, params, key_columns, page, per_page, after=None, descending=True, nullable=False):
+    """
+    Fetch one page of query: a SELECT without ORDER BY or LIMIT whose WHERE
+    clause ends with a {seek} placeholder. Rows are ordered by key_columns,
+    which must end in a unique column; nullable when the first of them may
+    be NULL.
+    
+    With after=None, pages by OFFSET with an exact count. Otherwise reads the
+    rows past the cursor key after (() for the first page); one extra row
+    decides whether there is a next page and the count is a cached estimate,
+    so the cost does not depend on how deep the page is.
+    Returns (rows, total_count, next_key); next_key is None on the last page.
+    """
+    params = dict(params)
+    segments = [('', {})]
+    if after is None:
+        total_count = _count_rows(query.format(seek=''), params)
+        params.update(limit=per_page, offset=(page - 1) * per_page)
+    else:
+        total_count = _approximate_count(query.format(seek=''), params)
+        if after:
+            segments = _keyset_clause(key_columns, after, descending, nullable)
+        params.update(offset=0)
+    direction = 'DESC' if descending else 'ASC'
+    order_by = ', '.join(f"{column} {direction}" for column in key_columns)
+    
+    rows = []
+    with get_db_read_connection() as conn:
+        cursor = conn.cursor()
+        for seek, seek_params in segments:
+            if after is not None:
+                # One extra row decides whether there is a next page
+                params.update(limit=per_page + 1 - len(rows))
+                if params['limit'] <= 0:
+                    break
+            cursor.execute(get_cached_query(
+                f"{query.format(seek=seek)} ORDER BY {order_by} LIMIT :limit OFFSET :offset"),
+                dict(params, **seek_params))
+            rows.extend(cursor.fetchall())
+    if after is None or len(rows) <= per_page:
+        return rows, total_count, None
+    rows = rows[:per_page]
+    next_key = tuple(rows[-1][column.rsplit('.', 1)[-1]] for column in key_columns)
+    return rows, total_count, next_key
+
 # USER TABLE
 def create_user_table():
     """Create user table with proper constraints"""
@@ -136,7 +285,7 @@ def add_customer_details(email, name, password, accountType, invitationCode=None
 
 def check_email(email):
     """Check if email exists and return user ID"""
-    with get_db_connection() as conn:
+    with get_db_read_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('SELECT UserId FROM User WHERE Email = ?', (email,))
         result = cursor.fetchone()
@@ -144,7 +293,7 @@ def check_email(email):
 
 def check_password(userID, password):
     """Verify user password with proper bcrypt verification"""
-    with get_db_connection() as conn:
+    with get_db_read_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('SELECT Password FROM User WHERE UserId = ?', (userID,))
         result = cursor.fetchone()
@@ -154,7 +303,7 @@ def check_password(userID, password):
 
 def get_user_details(user_id):
     """Get comprehensive user details"""
-    with get_db_connection() as conn:
+    with get_db_read_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("""
             SELECT UserId, AccountType, Email, Name, StoreID, PhoneNumber, 
@@ -176,7 +325,7 @@ def update_user_profile(user_id, **kwargs):
         set_clause = ', '.join([f"{k} = ?" for k in updates.keys()])
         values = list(updates.values()) + [user_id]
         
-        cursor.execute(f"UPDATE User SET {set_clause} WHERE UserId = ?", values)
+        cursor.execute(get_cached_query(f"UPDATE User SET {set_clause} WHERE UserId = ?"), values)
         conn.commit()
         return cursor.rowcount > 0
 
@@ -187,6 +336,40 @@ def update_last_login(user_id):
         cursor.execute("UPDATE User SET LastLogin = CURRENT_TIMESTAMP WHERE UserId = ?", (user_id,))
         conn.commit()
 
+def get_all_users(page, per_page, role=None, status=None, search=None, after=None):
+    """
+    Admin user listing, newest first. status is active, inactive or
+    suspended (both stored as inactive). See _fetch_page for after.
+    Returns (users, total_count, next_key).
+    """
+    rows, total_count, next_key = _fetch_page("""
+        SELECT UserId, AccountType, Email, Name, PhoneNumber, City, State,
+               DateCreated, LastLogin, IsActive, IsVerified
+        FROM User
+        WHERE (:role IS NULL OR AccountType = :role)
+          AND (:is_active IS NULL OR IsActive = :is_active)
+          AND (:pattern IS NULL OR Name LIKE :pattern OR Email LIKE :pattern)
+          {seek}
+    """, {
+        'role': role,
+        'is_active': {'active': 1, 'inactive': 0, 'suspended': 0}.get(status),
+        'pattern': f"%{search}%" if search else None
+    }, ('UserId',), page, per_page, after)
+    users = [{
+        'id': row['UserId'],
+        'account_type': row['AccountType'],
+        'email': row['Email'],
+        'name': row['Name'],
+        'phone_number': row['PhoneNumber'],
+        'city': row['City'],
+        'state': row['State'],
+        'date_created': row['DateCreated'],
+        'last_login': row['LastLogin'],
+        'is_active': bool(row['IsActive']),
+        'is_verified': bool(row['IsVerified']),
+    } for row in rows]
+    return users, total_count, next_key
+
 # INVITATION CODES TABLE
 def create_invitationcodes_table():
     """Create invitation codes table"""
@@ -235,7 +418,7 @@ def insert_default_invitation_codes():
 
 def check_invitation_code(invitationCode):
     """Check invitation code and return store ID"""
-    with get_db_connection() as conn:
+    with get_db_read_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("""
             SELECT StoreId FROM InvitationCodes 
@@ -282,25 +465,29 @@ def insert_into_table_Store(StoreId, ItemId, Quantity, Price, ItemName, Image=No
             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """, (StoreId, ItemId, Quantity, Price, ItemName, Image, CategoryId, Description))
         conn.commit()
-        logger.info(f"Item {ItemName} added to store {StoreId}")
+    invalidate_tags(*_store_listing_tags(StoreId, CategoryId))
+    logger.info(f"Item {ItemName} added to store {StoreId}")
 
+def _store_listing_tags(StoreId, category_id=None, search_term=None):
+    return (store_tag(StoreId), category_tag(category_id)) if category_id else (store_tag(StoreId),)
+
+@cached(ttl=300, key_prefix='store_items:', tags=_store_listing_tags)
 def select_store_items(StoreId, category_id=None, search_term=None):
     """Select store items with optional filtering"""
-    with get_db_connection() as conn:
+    with get_db_read_connection() as conn:
         cursor = conn.cursor()
-        query = "SELECT * FROM Store WHERE StoreId = ? AND IsActive = 1"
-        params = [StoreId]
-        
-        if category_id:
-            query += " AND CategoryId = ?"
-            params.append(category_id)
-        
-        if search_term:
-            query += " AND (ItemName LIKE ? OR Description LIKE ?)"
-            params.extend([f"%{search_term}%", f"%{search_term}%"])
-        
-        cursor.execute(query, params)
-        return cursor.fetchall()
+        # One statement text for every filter combination, so it is prepared once per connection
+        cursor.execute(get_cached_query("""
+            SELECT * FROM Store
+            WHERE StoreId = :store_id AND IsActive = 1
+              AND (:category_id IS NULL OR CategoryId = :category_id)
+              AND (:pattern IS NULL OR ItemName LIKE :pattern OR Description LIKE :pattern)
+        """), {
+            'store_id': StoreId,
+            'category_id': category_id or None,
+            'pattern': f"%{search_term}%" if search_term else None
+        })
+        return [dict(row) for row in cursor.fetchall()]
 
 def updateitem(item_id, vendor_id, item_name, quantity, price, description=None):
     """Update store item with validation"""
@@ -310,9 +497,12 @@ def updateitem(item_id, vendor_id, item_name, quantity, price, description=None)
             UPDATE Store 
             SET Quantity = ?, Price = ?, ItemName = ?, Description = ?, DateModified = CURRENT_TIMESTAMP
             WHERE ItemId = ? AND StoreId = ?
+            RETURNING CategoryId
         """, (quantity, price, item_name, description, item_id, vendor_id))
+        rows = cursor.fetchall()
         conn.commit()
-        return cursor.rowcount > 0
+    _invalidate_store_item(item_id, vendor_id, rows)
+    return len(rows) > 0
 
 def delete_store_item(item_id, vendor_id):
     """Soft delete store item"""
@@ -321,9 +511,63 @@ def delete_store_item(item_id, vendor_id):
         cursor.execute("""
             UPDATE Store SET IsActive = 0, DateModified = CURRENT_TIMESTAMP 
             WHERE StoreId = ? AND ItemId = ?
+            RETURNING CategoryId
         """, (vendor_id, item_id))
+        rows = cursor.fetchall()
         conn.commit()
-        return cursor.rowcount > 0
+    _invalidate_store_item(item_id, vendor_id, rows)
+    return len(rows) > 0
+
+def _invalidate_store_item(item_id, store_id, rows):
+    """Drop cached entries for a changed store item and the listings showing it"""
+    if rows:
+        tags = [product_tag(store_id, item_id), store_tag(store_id)]
+        tags += [category_tag(row[0]) for row in rows if row[0] is not None]
+        invalidate_tags(*tags)
+
+# Sort orders of the public product listing; DateAdded is the only one that may be NULL
+PRODUCT_SORT_COLUMNS = {'created_at': 's.DateAdded', 'price': 's.Price', 'name': 's.ItemName'}
+
+def get_products_with_filters(filters, after=None):
+    """
+    List active Store products.
+    
+    filters: category_id, market_id (a StoreId), min_price, max_price,
+    sort_by (created_at, price or name), sort_order, page and per_page.
+    See _fetch_page for after. Returns (products, total_count, next_key).
+    """
+    sort_column = PRODUCT_SORT_COLUMNS.get(filters.get('sort_by'), PRODUCT_SORT_COLUMNS['created_at'])
+    rows, total_count, next_key = _fetch_page("""
+        SELECT s.StoreId, s.ItemId, s.ItemName, s.Description, s.Price, s.Quantity,
+               s.CategoryId, c.CategoryName, s.DateAdded
+        FROM Store s
+        LEFT JOIN Categories c ON c.CategoryId = s.CategoryId
+        WHERE s.IsActive = 1
+          AND (:category_id IS NULL OR s.CategoryId = :category_id)
+          AND (:store_id IS NULL OR s.StoreId = :store_id)
+          AND (:min_price IS NULL OR s.Price >= :min_price)
+          AND (:max_price IS NULL OR s.Price <= :max_price)
+          {seek}
+    """, {
+        'category_id': filters.get('category_id'),
+        'store_id': filters.get('market_id'),
+        'min_price': filters.get('min_price'),
+        'max_price': filters.get('max_price')
+    }, (sort_column, 's.StoreId', 's.ItemId'),
+        filters.get('page') or 1, filters.get('per_page') or Config.DEFAULT_PAGE_SIZE,
+        after, descending=filters.get('sort_order') != 'asc', nullable=sort_column == 's.DateAdded')
+    products = [{
+        'id': row['ItemId'],
+        'store_id': row['StoreId'],
+        'name': row['ItemName'],
+        'description': row['Description'],
+        'price': row['Price'],
+        'stock_quantity': row['Quantity'],
+        'category_id': row['CategoryId'],
+        'category_name': row['CategoryName'],
+        'created_at': row['DateAdded'],
+    } for row in rows]
+    return products, total_count, next_key
 
 # CART TABLE
 def create_cart_table():
@@ -356,34 +600,203 @@ def insert_into_table_cart(StoreId, ItemId, CustomerID, Quantity, Price, ItemNam
     """Add item to cart or update quantity if exists"""
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        
-        # Check if item already exists in cart
         cursor.execute("""
-            SELECT CartId, Quantity FROM cart 
-            WHERE StoreId = ? AND ItemId = ? AND CustomerId = ? AND OrderId IS NULL
-        """, (StoreId, ItemId, CustomerID))
-        
-        existing = cursor.fetchone()
-        
-        if existing:
-            # Update quantity
-            new_quantity = existing['Quantity'] + Quantity
-            cursor.execute("""
-                UPDATE cart SET Quantity = ?, DateAdded = CURRENT_TIMESTAMP 
-                WHERE CartId = ?
-            """, (new_quantity, existing['CartId']))
-        else:
-            # Insert new item
-            cursor.execute("""
-                INSERT INTO cart (StoreId, ItemId, CustomerId, Quantity, Price, ItemName) 
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (StoreId, ItemId, CustomerID, Quantity, Price, ItemName))
-        
+            INSERT INTO cart (StoreId, ItemId, CustomerId, Quantity, Price, ItemName) 
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(StoreId, ItemId, CustomerId) DO UPDATE SET
+                Quantity = cart.Quantity + excluded.Quantity, DateAdded = CURRENT_TIMESTAMP
+            WHERE cart.OrderId IS NULL
+        """, (StoreId, ItemId, CustomerID, Quantity, Price, ItemName))
+        conn.commit()
+
+class CartError(Exception):
+    """
+    A refused cart change; reason is 'not_found', 'insufficient_stock',
+    'checked_out' (the line belongs to an order) or 'ambiguous' (the item
+    is sold by more than one store and none was given)
+    """
+
+    def __init__(self, message, reason, available=None):
+        super().__init__(message)
+        self.reason = reason
+        self.available = available
+
+# Adds quantity to the open cart line, or sets it when :replace, in one
+# statement that also checks the item is active and has the stock; refused
+# changes return no row. Price and name are the store's current ones.
+_CART_UPSERT = """
+    INSERT INTO cart (StoreId, ItemId, CustomerId, Quantity, Price, ItemName)
+    SELECT StoreId, ItemId, :customer_id, :quantity, Price, ItemName
+    FROM Store
+    WHERE StoreId = :store_id AND ItemId = :item_id AND IsActive = 1 AND Quantity >= :quantity
+    ON CONFLICT(StoreId, ItemId, CustomerId) DO UPDATE SET
+        Quantity = CASE WHEN :replace THEN excluded.Quantity ELSE cart.Quantity + excluded.Quantity END,
+        Price = excluded.Price,
+        ItemName = excluded.ItemName,
+        DateAdded = CURRENT_TIMESTAMP
+    WHERE cart.OrderId IS NULL
+      AND (:replace OR cart.Quantity + excluded.Quantity <= (
+          SELECT Quantity FROM Store WHERE StoreId = excluded.StoreId AND ItemId = excluded.ItemId))
+    RETURNING CartId, Quantity
+"""
+
+def _cart_refusal(cursor, customer_id, store_id, item_id):
+    """Why _CART_UPSERT refused a line; only read once a change has failed"""
+    cursor.execute("""
+        SELECT s.Quantity, c.OrderId FROM Store s
+        LEFT JOIN cart c ON c.StoreId = s.StoreId AND c.ItemId = s.ItemId AND c.CustomerId = ?
+        WHERE s.StoreId = ? AND s.ItemId = ? AND s.IsActive = 1
+    """, (customer_id, store_id, item_id))
+    row = cursor.fetchone()
+    if row is None:
+        return {'status': 'not_found'}
+    if row['OrderId'] is not None:
+        return {'status': 'checked_out'}
+    return {'status': 'insufficient_stock', 'available': row['Quantity']}
+
+def _item_store(cursor, item_id):
+    """The one store with the item active, for callers that only know the item"""
+    cursor.execute("SELECT StoreId FROM Store WHERE ItemId = ? AND IsActive = 1 LIMIT 2", (item_id,))
+    stores = cursor.fetchall()
+    if not stores:
+        raise CartError("Product not found", 'not_found')
+    if len(stores) > 1:
+        raise CartError("Store ID is required for this product", 'ambiguous')
+    return stores[0]['StoreId']
+
+def upsert_cart_item(customer_id, store_id, item_id, quantity, replace=False):
+    """
+    Add quantity of an item to the cart, or set it when replace. Without a
+    store_id the item's only active store is used. Returns the cart_id and
+    new quantity; raises CartError if the change is refused.
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        if store_id is None:
+            store_id = _item_store(cursor, item_id)
+        cursor.execute(_CART_UPSERT, {
+            'customer_id': customer_id, 'store_id': store_id, 'item_id': item_id,
+            'quantity': quantity, 'replace': replace,
+        })
+        rows = cursor.fetchall()
+        conn.commit()
+        if rows:
+            return {'cart_id': rows[0]['CartId'], 'quantity': rows[0]['Quantity']}
+        refusal = _cart_refusal(cursor, customer_id, store_id, item_id)
+
+    if refusal['status'] == 'not_found':
+        raise CartError("Product not found", 'not_found')
+    if refusal['status'] == 'checked_out':
+        raise CartError("Product is in an order being checked out", 'checked_out')
+    raise CartError("Insufficient stock", refusal['status'], refusal['available'])
+
+def _item_keys_in(keys):
+    """An IN (...) test on (StoreId, ItemId) for keys, and its parameters; it searches by key"""
+    values = ', '.join(['(?, ?)'] * len(keys))
+    return (f"(StoreId, ItemId) IN (SELECT column1, column2 FROM (VALUES {values}))",
+            [value for key in keys for value in key])
+
+def apply_cart_batch(customer_id, operations):
+    """
+    Apply add, set and remove operations to the open cart in one transaction.
+    operations holds dicts with op, store_id, item_id and quantity. Stock for
+    every item is read with one query and each operation is checked against
+    it and the cart as the earlier operations left it; the changed lines are
+    then written with executemany. Returns one result per operation, in
+    order, with status 'ok' (and the new quantity), 'not_found',
+    'checked_out' or 'insufficient_stock' (and the quantity available).
+    """
+    keys = list(dict.fromkeys((op['store_id'], op['item_id']) for op in operations))
+    if not keys:
+        return []
+    in_keys, key_params = _item_keys_in(keys)
+    results = []
+    with transaction() as conn:
+        stock = {(row['StoreId'], row['ItemId']): row for row in conn.execute(f"""
+            SELECT StoreId, ItemId, Quantity, Price, ItemName FROM Store WHERE IsActive = 1 AND {in_keys}
+        """, key_params)}
+        before, checked_out = {}, set()
+        for row in conn.execute(f"""
+            SELECT StoreId, ItemId, Quantity, OrderId FROM cart WHERE CustomerId = ? AND {in_keys}
+        """, [customer_id, *key_params]):
+            key = (row['StoreId'], row['ItemId'])
+            if row['OrderId'] is None:
+                before[key] = row['Quantity']
+            else:
+                checked_out.add(key)
+
+        cart = dict(before)
+        for op in operations:
+            key = (op['store_id'], op['item_id'])
+            result = {'op': op['op'], 'store_id': key[0], 'item_id': key[1]}
+            if op['op'] == 'remove':
+                result['status'] = 'ok' if cart.pop(key, None) is not None else 'not_found'
+            elif key not in stock:
+                result['status'] = 'not_found'
+            elif key in checked_out:
+                result['status'] = 'checked_out'
+            else:
+                quantity = op['quantity'] + (cart.get(key, 0) if op['op'] == 'add' else 0)
+                if quantity > stock[key]['Quantity']:
+                    result.update(status='insufficient_stock', available=stock[key]['Quantity'])
+                else:
+                    cart[key] = quantity
+                    result.update(status='ok', quantity=quantity)
+            results.append(result)
+
+        conn.executemany("""
+            INSERT INTO cart (StoreId, ItemId, CustomerId, Quantity, Price, ItemName)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(StoreId, ItemId, CustomerId) DO UPDATE SET
+                Quantity = excluded.Quantity, Price = excluded.Price,
+                ItemName = excluded.ItemName, DateAdded = CURRENT_TIMESTAMP
+            WHERE cart.OrderId IS NULL
+        """, [(key[0], key[1], customer_id, quantity, stock[key]['Price'], stock[key]['ItemName'])
+              for key, quantity in cart.items() if before.get(key) != quantity])
+        conn.executemany("""
+            DELETE FROM cart WHERE StoreId = ? AND ItemId = ? AND CustomerId = ? AND OrderId IS NULL
+        """, [(key[0], key[1], customer_id) for key in before if key not in cart])
+    return results
+
+def set_cart_item_quantity(customer_id, cart_id, quantity):
+    """Set the quantity of an open cart line, checking stock in the same statement"""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            UPDATE cart SET Quantity = :quantity, DateAdded = CURRENT_TIMESTAMP
+            WHERE CartId = :cart_id AND CustomerId = :customer_id AND OrderId IS NULL
+              AND :quantity <= (SELECT Quantity FROM Store s
+                                WHERE s.StoreId = cart.StoreId AND s.ItemId = cart.ItemId AND s.IsActive = 1)
+            RETURNING Quantity
+        """, {'quantity': quantity, 'cart_id': cart_id, 'customer_id': customer_id})
+        rows = cursor.fetchall()
+        conn.commit()
+        if rows:
+            return rows[0]['Quantity']
+
+        cursor.execute("""
+            SELECT s.Quantity FROM cart c
+            LEFT JOIN Store s ON s.StoreId = c.StoreId AND s.ItemId = c.ItemId AND s.IsActive = 1
+            WHERE c.CartId = ? AND c.CustomerId = ? AND c.OrderId IS NULL
+        """, (cart_id, customer_id))
+        row = cursor.fetchone()
+        if row is None:
+            raise CartError("Cart item not found", 'not_found')
+        raise CartError("Insufficient stock", 'insufficient_stock', row['Quantity'] or 0)
+
+def remove_cart_item(customer_id, cart_id):
+    """Remove an open cart line belonging to the customer"""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            DELETE FROM cart WHERE CartId = ? AND CustomerId = ? AND OrderId IS NULL
+        """, (cart_id, customer_id))
         conn.commit()
+        return cursor.rowcount > 0
 
 def select_user_cart(CustomerId):
     """Get user's cart items"""
-    with get_db_connection() as conn:
+    with get_db_read_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("""
             SELECT c.*, s.Image, s.Description 
@@ -461,41 +874,127 @@ def create_orders_table():
             conn.commit()
             logger.info("Orders table created successfully")
 
+class CheckoutError(Exception):
+    """A cart that cannot become an order: it is empty or asks for more than is in stock"""
+
+    def __init__(self, message, items=()):
+        super().__init__(message)
+        self.items = list(items)
+
+# Cart lines with the stock they draw on; ItemName and Price are as added to the cart
+_CHECKOUT_LINES = """
+    SELECT c.StoreId, c.ItemId, c.CustomerId, c.Quantity, c.Price, c.ItemName, s.Quantity AS InStock
+    FROM cart c
+    LEFT JOIN Store s ON s.StoreId = c.StoreId AND s.ItemId = c.ItemId AND s.IsActive = 1
+    WHERE {}
+"""
+
+def _place_order(conn, order_id, lines, order_status, delivery_address):
+    """
+    Take stock for the cart lines and write them as order lines, inside the
+    caller's transaction. The decrement is guarded by Quantity >= ?, so stock
+    never goes below zero; raises CheckoutError naming the short lines.
+    Returns the order total.
+    """
+    short = [{'store_id': line['StoreId'], 'item_id': line['ItemId'], 'requested': line['Quantity'],
+              'available': line['InStock'] or 0}
+             for line in lines if line['InStock'] is None or line['InStock'] < line['Quantity']]
+    if short:
+        raise CheckoutError("Insufficient stock", short)
+
+    cursor = conn.executemany("""
+        UPDATE Store SET Quantity = Quantity - ?
+        WHERE StoreId = ? AND ItemId = ? AND Quantity >= ?
+    """, [(line['Quantity'], line['StoreId'], line['ItemId'], line['Quantity']) for line in lines])
+    if cursor.rowcount != len(lines):
+        raise CheckoutError("Insufficient stock")
+
+    now = datetime.datetime.now()
+    order_date, order_time = now.date().isoformat(), now.strftime('%H:%M:%S')
+    total_amount = sum(line['Price'] * line['Quantity'] for line in lines)
+    conn.executemany("""
+        INSERT INTO orders (StoreId, ItemId, CustomerId, Quantity, Price, ItemName,
+                            OrderId, OrderStatus, OrderDate, OrderTime, DeliveryAddress, TotalAmount)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [(line['StoreId'], line['ItemId'], line['CustomerId'], line['Quantity'], line['Price'],
+           line['ItemName'], order_id, order_status, order_date, order_time, delivery_address, total_amount)
+          for line in lines])
+    return total_amount
+
+def _invalidate_ordered_items(lines):
+    """Drop cached listings showing stock that an order took or gave back"""
+    tags = {product_tag(line['StoreId'], line['ItemId']) for line in lines}
+    tags |= {store_tag(line['StoreId']) for line in lines}
+    if tags:
+        invalidate_tags(*tags)
+
+def checkout_cart(customer_id, delivery_address=None, order_status='pending'):
+    """
+    Turn a customer's open cart into an order in one BEGIN IMMEDIATE
+    transaction: stock is taken, the order lines are written and the cart is
+    emptied together, so a checkout happens whole or not at all.
+    Raises CheckoutError if the cart is empty or any line is out of stock.
+    """
+    order_id = generate_order_id()
+    with transaction() as conn:
+        lines = conn.execute(_CHECKOUT_LINES.format("c.CustomerId = ? AND c.OrderId IS NULL"),
+                             (customer_id,)).fetchall()
+        if not lines:
+            raise CheckoutError("Cart is empty")
+        total_amount = _place_order(conn, order_id, lines, order_status, delivery_address)
+        conn.execute("DELETE FROM cart WHERE CustomerId = ? AND OrderId IS NULL", (customer_id,))
+
+    _invalidate_ordered_items(lines)
+    logger.info(f"Order {order_id} placed with {len(lines)} lines")
+    return {
+        'order_id': order_id,
+        'total_amount': total_amount,
+        'items': [{'store_id': line['StoreId'], 'item_id': line['ItemId'], 'name': line['ItemName'],
+                   'quantity': line['Quantity'], 'price': line['Price']} for line in lines],
+    }
+
+def cancel_checkout(order_id):
+    """
+    Undo checkout_cart for an order that was never paid for: its lines are
+    cancelled, their stock is returned and they go back into the cart.
+    """
+    with transaction() as conn:
+        lines = conn.execute("""
+            SELECT StoreId, ItemId, CustomerId, Quantity, Price, ItemName FROM orders
+            WHERE OrderId = ? AND OrderStatus = 'pending'
+        """, (order_id,)).fetchall()
+        conn.executemany("""
+            UPDATE Store SET Quantity = Quantity + ? WHERE StoreId = ? AND ItemId = ?
+        """, [(line['Quantity'], line['StoreId'], line['ItemId']) for line in lines])
+        conn.execute("""
+            UPDATE orders SET OrderStatus = 'cancelled' WHERE OrderId = ? AND OrderStatus = 'pending'
+        """, (order_id,))
+        conn.executemany("""
+            INSERT INTO cart (StoreId, ItemId, CustomerId, Quantity, Price, ItemName)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(StoreId, ItemId, CustomerId) DO NOTHING
+        """, [tuple(line) for line in lines])
+
+    _invalidate_ordered_items(lines)
+    return len(lines) > 0
+
 def update_cart(order_id, order_status, delivery_address=None):
-    """Move cart items to orders"""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        
-        current_datetime = datetime.datetime.now()
-        order_date = current_datetime.date()
-        order_time = current_datetime.time()
-        
-        # Get cart items
-        cursor.execute("SELECT * FROM cart WHERE OrderId = ?", (order_id,))
-        cart_items = cursor.fetchall()
-        
-        total_amount = sum(item['Price'] * item['Quantity'] for item in cart_items)
-        
-        # Insert into orders
-        for item in cart_items:
-            cursor.execute("""
-                INSERT INTO orders (StoreId, ItemId, CustomerId, Quantity, Price, ItemName, 
-                                  OrderId, OrderStatus, OrderDate, OrderTime, DeliveryAddress, TotalAmount) 
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (item['StoreId'], item['ItemId'], item['CustomerId'], item['Quantity'], 
-                  item['Price'], item['ItemName'], order_id, order_status, order_date, 
-                  order_time, delivery_address, total_amount))
-        
+    """Move the cart items tagged with order_id to orders, in one transaction"""
+    with transaction() as conn:
+        lines = conn.execute(_CHECKOUT_LINES.format("c.OrderId = ?"), (order_id,)).fetchall()
+        if lines:
+            _place_order(conn, order_id, lines, order_status, delivery_address)
+
         # Remove from cart if order is complete
         if order_status in ['confirmed', 'processing']:
-            cursor.execute("DELETE FROM cart WHERE OrderId = ?", (order_id,))
-        
-        conn.commit()
-        logger.info(f"Order {order_id} updated with status {order_status}")
+            conn.execute("DELETE FROM cart WHERE OrderId = ?", (order_id,))
+
+    _invalidate_ordered_items(lines)
+    logger.info(f"Order {order_id} updated with status {order_status}")
 
 def get_user_orders(customer_id, status=None):
     """Get user's orders with optional status filter"""
-    with get_db_connection() as conn:
+    with get_db_read_connection() as conn:
         cursor = conn.cursor()
         query = """
             SELECT OrderId, OrderStatus, OrderDate, OrderTime, DeliveryAddress, 
@@ -512,7 +1011,7 @@ def get_user_orders(customer_id, status=None):
         
         query += " GROUP BY OrderId ORDER BY OrderDate DESC, OrderTime DESC"
         
-        cursor.execute(query, params)
+        cursor.execute(get_cached_query(query), params)
         return cursor.fetchall()
 
 def update_order_status(order_id, new_status, tracking_number=None):
@@ -532,16 +1031,16 @@ def update_order_status(order_id, new_status, tracking_number=None):
         
         params.append(order_id)
         
-        cursor.execute(f"""
+        cursor.execute(get_cached_query(f"""
             UPDATE orders SET {', '.join(update_fields)} 
             WHERE OrderId = ?
-        """, params)
+        """), params)
         conn.commit()
         return cursor.rowcount > 0
 
 def retrieve_orders_by_vendor(vendor_id, status=None):
     """Get orders for a specific vendor"""
-    with get_db_connection() as conn:
+    with get_db_read_connection() as conn:
         cursor = conn.cursor()
         query = """
             SELECT o.*, u.Name as CustomerName, u.Email as CustomerEmail, u.PhoneNumber
@@ -557,7 +1056,7 @@ def retrieve_orders_by_vendor(vendor_id, status=None):
         
         query += " ORDER BY o.OrderDate DESC, o.OrderTime DESC"
         
-        cursor.execute(query, params)
+        cursor.execute(get_cached_query(query), params)
         orders = cursor.fetchall()
         
         # Convert to JSON format
@@ -575,6 +1074,45 @@ def retrieve_orders_by_vendor(vendor_id, status=None):
         
         return json.dumps(orders_list, indent=4)
 
+def get_all_orders_admin(page, per_page, status=None, payment_status=None,
+                         start_date=None, end_date=None, after=None):
+    """
+    Admin order listing, one row per order, newest first. See _fetch_page
+    for after. Returns (orders, total_count, next_key).
+    """
+    # Grouping by the full sort key (constant within an order) lets the
+    # groups stream out of ix_orders_date in order
+    rows, total_count, next_key = _fetch_page("""
+        SELECT OrderId, CustomerId, OrderStatus, PaymentStatus, OrderDate, OrderTime,
+               DeliveryAddress, MAX(TotalAmount) AS TotalAmount, COUNT(*) AS ItemCount,
+               GROUP_CONCAT(ItemName, ', ') AS Items
+        FROM orders
+        WHERE (:status IS NULL OR OrderStatus = :status)
+          AND (:payment_status IS NULL OR PaymentStatus = :payment_status)
+          AND (:start_date IS NULL OR OrderDate >= :start_date)
+          AND (:end_date IS NULL OR OrderDate <= :end_date)
+          {seek}
+        GROUP BY OrderDate, OrderTime, OrderId
+    """, {
+        'status': status,
+        'payment_status': payment_status,
+        'start_date': start_date,
+        'end_date': end_date
+    }, ('OrderDate', 'OrderTime', 'OrderId'), page, per_page, after)
+    orders = [{
+        'order_id': row['OrderId'],
+        'customer_id': row['CustomerId'],
+        'status': row['OrderStatus'],
+        'payment_status': row['PaymentStatus'],
+        'order_date': row['OrderDate'],
+        'order_time': row['OrderTime'],
+        'delivery_address': row['DeliveryAddress'],
+        'total_amount': row['TotalAmount'],
+        'item_count': row['ItemCount'],
+        'items': row['Items'],
+    } for row in rows]
+    return orders, total_count, next_key
+
 # INVENTORY TABLE
 def create_inventory_table():
     """Create comprehensive inventory table"""
@@ -626,30 +1164,28 @@ def add_to_inventory(vendor_id, vendor_name, item_id, item_name, item_desc, imag
         """, (vendor_id, vendor_name, store_id, item_id, item_name, item_desc, 
               image, quantity, price, category_id, sku))
         conn.commit()
-        logger.info(f"Item {item_name} added to inventory for vendor {vendor_id}")
+    invalidate_tags(vendor_tag(vendor_id))
+    logger.info(f"Item {item_name} added to inventory for vendor {vendor_id}")
 
+@cached(ttl=300, key_prefix='inventory:', tags=lambda vendor_id, *args, **kwargs: (vendor_tag(vendor_id),))
 def retrieve_data_from_inventory(vendor_id, category_id=None, low_stock_only=False):
     """Retrieve inventory data with optional filters"""
-    with get_db_connection() as conn:
+    with get_db_read_connection() as conn:
         cursor = conn.cursor()
-        query = """
+        # One statement text for every filter combination, so it is prepared once per connection
+        cursor.execute(get_cached_query("""
             SELECT i.*, c.CategoryName 
             FROM inventory i
             LEFT JOIN Categories c ON i.CategoryId = c.CategoryId
-            WHERE i.VendorId = ? AND i.IsActive = 1
-        """
-        params = [vendor_id]
-        
-        if category_id:
-            query += " AND i.CategoryId = ?"
-            params.append(category_id)
-        
-        if low_stock_only:
-            query += " AND i.Quantity <= i.MinStockLevel"
-        
-        query += " ORDER BY i.DateModified DESC"
-        
-        cursor.execute(query, params)
+            WHERE i.VendorId = :vendor_id AND i.IsActive = 1
+              AND (:category_id IS NULL OR i.CategoryId = :category_id)
+              AND (:low_stock_only = 0 OR i.Quantity <= i.MinStockLevel)
+            ORDER BY i.DateModified DESC
+        """), {
+            'vendor_id': vendor_id,
+            'category_id': category_id or None,
+            'low_stock_only': 1 if low_stock_only else 0
+        })
         columns = [column[0] for column in cursor.description]
         rows = cursor.fetchall()
         
@@ -676,9 +1212,13 @@ def update_inventory_quantity(vendor_id, item_id, new_quantity):
             UPDATE inventory 
             SET Quantity = ?, DateModified = CURRENT_TIMESTAMP 
             WHERE VendorId = ? AND ItemId = ?
+            RETURNING StoreId
         """, (new_quantity, vendor_id, item_id))
+        rows = cursor.fetchall()
         conn.commit()
-        return cursor.rowcount > 0
+    if rows:
+        invalidate_tags(vendor_tag(vendor_id), *(product_tag(row[0], item_id) for row in rows))
+    return len(rows) > 0
 
 # PAYMENT TABLE
 def create_payment_table():
@@ -737,10 +1277,10 @@ def update_payment_status(payment_id, status, transaction_id=None, gateway_respo
         
         params.append(payment_id)
         
-        cursor.execute(f"""
+        cursor.execute(get_cached_query(f"""
             UPDATE payments SET {', '.join(updates)} 
             WHERE PaymentId = ?
-        """, params)
+        """), params)
         conn.commit()
         return cursor.rowcount > 0
 
@@ -799,7 +1339,7 @@ def add_review(product_id, store_id, customer_id, rating, review_title=None, rev
 
 def get_product_reviews(product_id, store_id, limit=10, offset=0):
     """Get reviews for a product"""
-    with get_db_connection() as conn:
+    with get_db_read_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("""
             SELECT r.*, u.Name as CustomerName 
@@ -862,26 +1402,129 @@ def insert_default_categories():
             conn.commit()
             logger.info("Default categories inserted")
 
+# Tag on the cached category tree; category writes invalidate it
+CATEGORY_TREE_TAG = 'category_tree'
+
+def _nest_categories(rows):
+    """
+    Nest category rows, already in display order, under their parents.
+    Categories whose parent is missing from rows are left out, so hiding a
+    category hides its subtree.
+    """
+    nodes = {row['CategoryId']: {
+        'category_id': row['CategoryId'],
+        'name': row['CategoryName'],
+        'name_hindi': row['CategoryNameHindi'],
+        'parent_id': row['ParentCategoryId'],
+        'description': row['Description'],
+        'is_active': bool(row['IsActive']),
+        'sort_order': row['SortOrder'],
+        'children': [],
+    } for row in rows}
+    roots = []
+    for node in nodes.values():
+        if node['parent_id'] is None:
+            roots.append(node)
+        elif node['parent_id'] in nodes:
+            nodes[node['parent_id']]['children'].append(node)
+
+    reachable, pending = {}, list(roots)
+    while pending:
+        node = pending.pop()
+        reachable[node['category_id']] = node
+        pending.extend(node['children'])
+    return roots, reachable
+
+def _load_category_tree():
+    """Both views of the category tree from one query, each versioned by a hash of its content"""
+    with get_db_read_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT CategoryId, CategoryName, CategoryNameHindi, ParentCategoryId, Description,
+                   IsActive, SortOrder
+            FROM Categories
+            ORDER BY SortOrder, CategoryName
+        """)
+        rows = cursor.fetchall()
+
+    trees = {}
+    for view, view_rows in (('all', rows), ('active', [row for row in rows if row['IsActive']])):
+        roots, nodes = _nest_categories(view_rows)
+        payload = json.dumps(roots, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        trees[view] = {
+            'version': hashlib.sha256(payload.encode()).hexdigest()[:32],
+            'categories': roots,
+            'nodes': nodes,
+        }
+    return trees
+
+def get_category_tree(include_inactive=False):
+    """
+    The whole category hierarchy with Hindi names, built in memory once and
+    cached until a category write invalidates it. Returns the nested
+    categories, the nodes by id and a version that changes with the content.
+    """
+    trees = categories_cache.get_or_set(
+        make_cache_key('category_tree', ()), _load_category_tree,
+        ttl=Config.CATEGORY_TREE_TTL, tags=(CATEGORY_TREE_TAG,)
+    )
+    return trees['all' if include_inactive else 'active']
+
+def invalidate_category_tree(category_id=None):
+    """Drop the cached tree, and cached listings of category_id, after a category write"""
+    tags = [CATEGORY_TREE_TAG]
+    if category_id is not None:
+        tags.append(category_tag(category_id))
+    invalidate_tags(*tags)
+
 def get_categories(parent_id=None, include_inactive=False):
     """Get categories with optional parent filter"""
+    tree = get_category_tree(include_inactive)
+    if parent_id is None:
+        return tree['categories']
+    parent = tree['nodes'].get(parent_id)
+    return parent['children'] if parent else []
+
+def get_category_by_id(category_id, include_inactive=False):
+    """A category with its subtree, or None"""
+    return get_category_tree(include_inactive)['nodes'].get(category_id)
+
+def create_category(name, description=None, parent_id=None, name_hindi=None):
+    """Create a category; returns its id, or -1 if the name is taken"""
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        query = "SELECT * FROM Categories WHERE 1=1"
-        params = []
-        
-        if parent_id is not None:
-            query += " AND ParentCategoryId = ?"
-            params.append(parent_id)
-        else:
-            query += " AND ParentCategoryId IS NULL"
-        
-        if not include_inactive:
-            query += " AND IsActive = 1"
-        
-        query += " ORDER BY SortOrder, CategoryName"
-        
-        cursor.execute(query, params)
-        return cursor.fetchall()
+        try:
+            cursor.execute("""
+                INSERT INTO Categories (CategoryName, CategoryNameHindi, ParentCategoryId, Description) 
+                VALUES (?, ?, ?, ?)
+            """, (name, name_hindi, parent_id, description))
+            conn.commit()
+        except sqlite3.IntegrityError:
+            return -1
+        category_id = cursor.lastrowid
+
+    invalidate_category_tree()
+    return category_id
+
+def update_category(category_id, name, description=None, is_active=True, name_hindi=None):
+    """Update a category; the Hindi name is kept unless name_hindi is given"""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                UPDATE Categories
+                SET CategoryName = ?, Description = ?, IsActive = ?,
+                    CategoryNameHindi = COALESCE(?, CategoryNameHindi)
+                WHERE CategoryId = ?
+            """, (name, description, 1 if is_active else 0, name_hindi, category_id))
+            conn.commit()
+        except sqlite3.IntegrityError:
+            return False
+        updated = cursor.rowcount > 0
+
+    if updated:
+        invalidate_category_tree(category_id)
+    return updated
 
 # WISHLIST TABLE
 def create_wishlist_table():
@@ -936,7 +1579,7 @@ def remove_from_wishlist(customer_id, store_id, item_id):
 
 def get_user_wishlist(customer_id):
     """Get user's wishlist"""
-    with get_db_connection() as conn:
+    with get_db_read_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("""
             SELECT w.*, s.Image, s.Description 
@@ -947,10 +1590,738 @@ def get_user_wishlist(customer_id):
         """, (customer_id,))
         return cursor.fetchall()
 
+def apply_wishlist_batch(customer_id, operations):
+    """
+    Apply add and remove operations to the wishlist in one transaction, with
+    one query reading the items and one the wishlist. Returns one result per
+    operation, in order, with status 'ok', 'exists' (already wished for) or
+    'not_found'.
+    """
+    keys = list(dict.fromkeys((op['store_id'], op['item_id']) for op in operations))
+    if not keys:
+        return []
+    in_keys, key_params = _item_keys_in(keys)
+    results = []
+    with transaction() as conn:
+        items = {(row['StoreId'], row['ItemId']): row for row in conn.execute(f"""
+            SELECT StoreId, ItemId, Price, ItemName FROM Store WHERE IsActive = 1 AND {in_keys}
+        """, key_params)}
+        before = {(row['StoreId'], row['ItemId']) for row in conn.execute(f"""
+            SELECT StoreId, ItemId FROM wishlist WHERE CustomerId = ? AND {in_keys}
+        """, [customer_id, *key_params])}
+
+        wished = set(before)
+        for op in operations:
+            key = (op['store_id'], op['item_id'])
+            result = {'op': op['op'], 'store_id': key[0], 'item_id': key[1]}
+            if op['op'] == 'remove':
+                result['status'] = 'ok' if key in wished else 'not_found'
+                wished.discard(key)
+            elif key in wished:
+                result['status'] = 'exists'
+            elif key not in items:
+                result['status'] = 'not_found'
+            else:
+                wished.add(key)
+                result['status'] = 'ok'
+            results.append(result)
+
+        conn.executemany("""
+            INSERT INTO wishlist (CustomerId, StoreId, ItemId, ItemName, Price) VALUES (?, ?, ?, ?, ?)
+        """, [(customer_id, key[0], key[1], items[key]['ItemName'], items[key]['Price'])
+              for key in wished - before])
+        conn.executemany("""
+            DELETE FROM wishlist WHERE CustomerId = ? AND StoreId = ? AND ItemId = ?
+        """, [(customer_id, key[0], key[1]) for key in before - wished])
+    return results
+
+# PRODUCT SEARCH (FTS5)
+# Devanagari vowel signs and viramas are combining marks, which unicode61 would
+# otherwise treat as separators and split Hindi words apart
+_DEVANAGARI_MARKS = ''.join(
+    chr(c) for start, end in ((0x0900, 0x0904), (0x093A, 0x0950), (0x0951, 0x0958), (0x0962, 0x0964))
+    for c in range(start, end)
+)
+
+# FTS rowids: Store rows are keyed by (StoreId, ItemId), inventory rows by InventoryId
+_STORE_SEARCH_KEY = "(({0}.StoreId * 2147483648 + {0}.ItemId) * 2)"
+_INVENTORY_SEARCH_KEY = "({0}.InventoryId * 2 + 1)"
+
+_SEARCH_COLUMNS = ("ItemName, Description, CategoryName, CategoryNameHindi, "
+                   "Source, StoreId, ItemId, CategoryId, Price")
+
+def _search_row(source, row, description):
+    """SELECT list producing one product_search row from a Store/inventory row alias"""
+    key = _STORE_SEARCH_KEY if source == 'store' else _INVENTORY_SEARCH_KEY
+    return f"""
+        {key.format(row)}, {row}.ItemName, {row}.{description},
+        (SELECT CategoryName FROM Categories WHERE CategoryId = {row}.CategoryId),
+        (SELECT CategoryNameHindi FROM Categories WHERE CategoryId = {row}.CategoryId),
+        '{source}', {row}.StoreId, {row}.ItemId, {row}.CategoryId, {row}.Price
+    """
+
+SEARCH_INDEX_SCHEMA = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS product_search USING fts5(
+        ItemName, Description, CategoryName, CategoryNameHindi,
+        Source UNINDEXED, StoreId UNINDEXED, ItemId UNINDEXED,
+        CategoryId UNINDEXED, Price UNINDEXED,
+        tokenize = "unicode61 remove_diacritics 2 tokenchars '{_DEVANAGARI_MARKS}'",
+        prefix = '2 3'
+    )
+    """,
+    # Indexed terms with their document counts, used for typo correction
+    "CREATE VIRTUAL TABLE IF NOT EXISTS product_search_vocab USING fts5vocab(product_search, 'row')",
+    # Name matches outrank category matches, which outrank description matches
+    "INSERT INTO product_search(product_search, rank) VALUES ('rank', 'bm25(10.0, 2.0, 4.0, 4.0)')",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_store_search_insert AFTER INSERT ON Store
+    WHEN new.IsActive = 1 BEGIN
+        INSERT INTO product_search(rowid, {_SEARCH_COLUMNS})
+        SELECT {_search_row('store', 'new', 'Description')};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_store_search_update
+    AFTER UPDATE OF ItemName, Description, CategoryId, Price, IsActive ON Store BEGIN
+        DELETE FROM product_search WHERE rowid = {_STORE_SEARCH_KEY.format('old')};
+        INSERT INTO product_search(rowid, {_SEARCH_COLUMNS})
+        SELECT {_search_row('store', 'new', 'Description')} WHERE new.IsActive = 1;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_store_search_delete AFTER DELETE ON Store BEGIN
+        DELETE FROM product_search WHERE rowid = {_STORE_SEARCH_KEY.format('old')};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_inventory_search_insert AFTER INSERT ON inventory
+    WHEN new.IsActive = 1 BEGIN
+        INSERT INTO product_search(rowid, {_SEARCH_COLUMNS})
+        SELECT {_search_row('inventory', 'new', 'ItemDesc')};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_inventory_search_update
+    AFTER UPDATE OF ItemName, ItemDesc, CategoryId, Price, IsActive ON inventory BEGIN
+        DELETE FROM product_search WHERE rowid = {_INVENTORY_SEARCH_KEY.format('old')};
+        INSERT INTO product_search(rowid, {_SEARCH_COLUMNS})
+        SELECT {_search_row('inventory', 'new', 'ItemDesc')} WHERE new.IsActive = 1;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_inventory_search_delete AFTER DELETE ON inventory BEGIN
+        DELETE FROM product_search WHERE rowid = {_INVENTORY_SEARCH_KEY.format('old')};
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_categories_search_update
+    AFTER UPDATE OF CategoryName, CategoryNameHindi ON Categories BEGIN
+        UPDATE product_search SET CategoryName = new.CategoryName, CategoryNameHindi = new.CategoryNameHindi
+        WHERE CategoryId = new.CategoryId;
+    END
+    """,
+)
+
+# Index every active Store and inventory row (initial fill and rebuilds)
+SEARCH_INDEX_BACKFILL = (
+    f"""
+    INSERT INTO product_search(rowid, {_SEARCH_COLUMNS})
+    SELECT {_search_row('store', 's', 'Description')} FROM Store s WHERE s.IsActive = 1
+    """,
+    f"""
+    INSERT INTO product_search(rowid, {_SEARCH_COLUMNS})
+    SELECT {_search_row('inventory', 'i', 'ItemDesc')} FROM inventory i WHERE i.IsActive = 1
+    """,
+)
+
+def create_search_index():
+    """Create the product_search FTS5 index and its sync triggers; fill it when new"""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='product_search';")
+        table_exists = cursor.fetchone()
+        
+        if not table_exists:
+            for statement in SEARCH_INDEX_SCHEMA:
+                cursor.execute(statement)
+            conn.commit()
+            rebuild_search_index()
+            logger.info("Product search index created successfully")
+
+def rebuild_search_index():
+    """Repopulate product_search from the active Store and inventory rows"""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM product_search")
+        for statement in SEARCH_INDEX_BACKFILL:
+            cursor.execute(statement)
+        cursor.execute("INSERT INTO product_search(product_search) VALUES ('optimize')")
+        conn.commit()
+
+def _match_expression(terms):
+    """FTS5 query matching every term; the last term also matches as a prefix"""
+    quoted = ['"' + term.replace('"', '') + '"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+def _edit_distance(a, b, limit):
+    """Levenshtein distance, giving up (returning limit + 1) once it exceeds limit"""
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+def _correct_terms(cursor, terms):
+    """Replace terms missing from the index by their closest indexed term, if any"""
+    corrected = []
+    for term in terms:
+        folded = term.lower()
+        cursor.execute("SELECT 1 FROM product_search_vocab WHERE term = ?", (folded,))
+        if cursor.fetchone() or len(folded) < 4:
+            corrected.append(term)
+            continue
+        # Candidates share the first two characters, which keeps the vocabulary range small
+        limit = 1 if len(folded) < 8 else 2
+        cursor.execute("""
+            SELECT term, doc FROM product_search_vocab
+            WHERE term >= ? AND term < ? AND length(term) BETWEEN ? AND ?
+        """, (folded[:2], folded[:2] + '\U0010ffff', len(folded) - limit, len(folded) + limit))
+        best = None
+        for candidate, docs in cursor.fetchall():
+            distance = _edit_distance(folded, candidate, limit)
+            if distance <= limit and (best is None or (distance, -docs) < best[0]):
+                best = ((distance, -docs), candidate)
+        corrected.append(best[1] if best else term)
+    return corrected
+
+# FTS5 wraps matches in these control characters; the text around them is
+# vendor input, so it is escaped before they become <mark> tags
+_MARK_OPEN, _MARK_CLOSE = '\x02', '\x03'
+
+def _marked_html(text):
+    if text is None:
+        return None
+    return html.escape(text).replace(_MARK_OPEN, '<mark>').replace(_MARK_CLOSE, '</mark>')
+
+def search_products(filters):
+    """
+    Full-text product search ranked by BM25.
+    
+    filters: query (required), category_id, store_id (market_id is accepted
+    as an alias, markets being stores), min_price, max_price, page and
+    per_page. Terms must all match; the last one also matches as a
+    prefix, and when nothing matches, terms absent from the index are
+    corrected to the nearest indexed term. Returns (products, total_count).
+    """
+    terms = (filters.get('query') or '').split()
+    if not terms:
+        return [], 0
+    page = filters.get('page') or 1
+    per_page = filters.get('per_page') or Config.DEFAULT_PAGE_SIZE
+    params = {
+        'category_id': filters.get('category_id'),
+        'store_id': filters.get('store_id') or filters.get('market_id'),
+        'min_price': filters.get('min_price'),
+        'max_price': filters.get('max_price'),
+        'limit': per_page,
+        'offset': (page - 1) * per_page,
+    }
+    where = """
+        product_search MATCH :match
+          AND (:category_id IS NULL OR CategoryId = :category_id)
+          AND (:store_id IS NULL OR StoreId = :store_id)
+          AND (:min_price IS NULL OR Price >= :min_price)
+          AND (:max_price IS NULL OR Price <= :max_price)
+    """
+    with get_db_read_connection() as conn:
+        cursor = conn.cursor()
+        params['match'] = _match_expression(terms)
+        cursor.execute(f"SELECT COUNT(*) FROM product_search WHERE {where}", params)
+        total_count = cursor.fetchone()[0]
+        if total_count == 0:
+            corrected = _correct_terms(cursor, terms)
+            if corrected != terms:
+                params['match'] = _match_expression(corrected)
+                cursor.execute(f"SELECT COUNT(*) FROM product_search WHERE {where}", params)
+                total_count = cursor.fetchone()[0]
+        if total_count == 0:
+            return [], 0
+        
+        cursor.execute(f"""
+            SELECT hit.*, COALESCE(s.Quantity, i.Quantity) AS Quantity
+            FROM (
+                SELECT rowid AS SearchId, Source, StoreId, ItemId, ItemName, Description,
+                       CategoryId, CategoryName, CategoryNameHindi, Price, rank AS Score,
+                       highlight(product_search, 0, :mark_open, :mark_close) AS NameHighlight,
+                       snippet(product_search, -1, :mark_open, :mark_close, '…', 12) AS Snippet
+                FROM product_search
+                WHERE {where}
+                ORDER BY rank
+                LIMIT :limit OFFSET :offset
+            ) hit
+            LEFT JOIN Store s ON hit.Source = 'store' AND s.StoreId = hit.StoreId AND s.ItemId = hit.ItemId
+            LEFT JOIN inventory i ON hit.Source = 'inventory' AND i.InventoryId = hit.SearchId / 2
+            ORDER BY hit.Score
+        """, dict(params, mark_open=_MARK_OPEN, mark_close=_MARK_CLOSE))
+        products = [{
+            'id': row['ItemId'],
+            'store_id': row['StoreId'],
+            'source': row['Source'],
+            'name': row['ItemName'],
+            'name_highlighted': _marked_html(row['NameHighlight']),
+            'description': row['Description'],
+            'snippet': _marked_html(row['Snippet']),
+            'category_id': row['CategoryId'],
+            'category_name': row['CategoryName'],
+            'category_name_hindi': row['CategoryNameHindi'],
+            'price': row['Price'],
+            'stock_quantity': row['Quantity'],
+            'score': row['Score'],
+        } for row in cursor.fetchall()]
+        return products, total_count
+
+# ADMIN DASHBOARD
+# Live totals are kept in dashboard_counters by triggers on the tables they
+# count; the aggregate sections (monthly revenue, top categories, recent
+# orders) are materialized in dashboard_snapshot and refreshed in the background
+# from the sales rollups.
+_ACTIVE_ORDER_STATUSES = "('pending', 'confirmed', 'processing', 'shipped')"
+LINE_REVENUE = "(CASE WHEN {0}.OrderStatus IN ('cancelled', 'refunded') THEN 0 ELSE {0}.Price * {0}.Quantity END)"
+_ORDER_IS_ACTIVE = f"({{0}}.OrderStatus IN {_ACTIVE_ORDER_STATUSES})"
+# Order level counters move with an order's first line only
+_FIRST_ORDER_LINE = "(NOT EXISTS (SELECT 1 FROM orders WHERE OrderId = {0}.OrderId AND OrderDetailId < {0}.OrderDetailId))"
+_ORDER_GONE = "(NOT EXISTS (SELECT 1 FROM orders WHERE OrderId = old.OrderId))"
+_FIRST_CUSTOMER_ORDER = "(NOT EXISTS (SELECT 1 FROM orders WHERE CustomerId = new.CustomerId AND OrderDetailId <> new.OrderDetailId))"
+_CUSTOMER_GONE = "(NOT EXISTS (SELECT 1 FROM orders WHERE CustomerId = old.CustomerId))"
+# A store counts while it has any Store row, active or not
+_FIRST_STORE_ROW = "(new.StoreId IS NOT NULL AND NOT EXISTS (SELECT 1 FROM Store WHERE StoreId = new.StoreId AND rowid <> new.rowid))"
+_STORE_GONE = "(old.StoreId IS NOT NULL AND NOT EXISTS (SELECT 1 FROM Store WHERE StoreId = old.StoreId))"
+
+# Row level contribution of a User or Store row to each counter
+_USER_COUNTERS = {
+    'total_users': "1",
+    'total_vendors': "({0}.AccountType = 'vendor')",
+    'pending_vendor_approvals': "({0}.AccountType = 'vendor' AND NOT {0}.IsVerified)",
+}
+_STORE_COUNTERS = {
+    'total_products': "({0}.IsActive = 1)",
+}
+
+def _counter_update(deltas):
+    """One UPDATE adding each counter's delta expression to its value"""
+    cases = ' '.join(f"WHEN '{name}' THEN {delta}" for name, delta in deltas.items())
+    names = ', '.join(f"'{name}'" for name in deltas)
+    return f"UPDATE dashboard_counters SET Value = Value + CASE Name {cases} END WHERE Name IN ({names});"
+
+def _row_counter_triggers(table, counters, update_columns):
+    name = table.lower()
+    return (
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{name}_dashboard_insert AFTER INSERT ON {table} BEGIN
+            {_counter_update({c: e.format('new') for c, e in counters.items()})}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{name}_dashboard_update
+        AFTER UPDATE OF {update_columns} ON {table} BEGIN
+            {_counter_update({c: f"{e.format('new')} - {e.format('old')}" for c, e in counters.items()})}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{name}_dashboard_delete AFTER DELETE ON {table} BEGIN
+            {_counter_update({c: f"-{e.format('old')}" for c, e in counters.items()})}
+        END
+        """,
+    )
+
+DASHBOARD_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS dashboard_counters (
+        Name TEXT PRIMARY KEY,
+        Value NUMERIC NOT NULL DEFAULT 0
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS dashboard_snapshot (
+        SnapshotId INTEGER PRIMARY KEY CHECK (SnapshotId = 1),
+        Payload TEXT NOT NULL,
+        RefreshedAt REAL NOT NULL
+    )
+    """,
+    *_row_counter_triggers('User', _USER_COUNTERS, 'AccountType, IsVerified'),
+    *_row_counter_triggers('Store', _STORE_COUNTERS, 'IsActive'),
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_store_total_stores_insert AFTER INSERT ON Store BEGIN
+        {_counter_update({'total_stores': _FIRST_STORE_ROW})}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_store_total_stores_update
+    AFTER UPDATE OF StoreId ON Store WHEN new.StoreId IS NOT old.StoreId BEGIN
+        {_counter_update({'total_stores': f"{_FIRST_STORE_ROW} - {_STORE_GONE}"})}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_store_total_stores_delete AFTER DELETE ON Store BEGIN
+        {_counter_update({'total_stores': f"-{_STORE_GONE}"})}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_orders_dashboard_insert AFTER INSERT ON orders BEGIN
+        {_counter_update({
+            'total_revenue': LINE_REVENUE.format('new'),
+            'total_orders': _FIRST_ORDER_LINE.format('new'),
+            'active_orders': f"({_FIRST_ORDER_LINE.format('new')} AND {_ORDER_IS_ACTIVE.format('new')})",
+            'unique_customers': _FIRST_CUSTOMER_ORDER,
+        })}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_orders_dashboard_update
+    AFTER UPDATE OF OrderStatus, Price, Quantity ON orders BEGIN
+        {_counter_update({
+            'total_revenue': f"{LINE_REVENUE.format('new')} - {LINE_REVENUE.format('old')}",
+            'active_orders': f"{_FIRST_ORDER_LINE.format('new')} * "
+                             f"({_ORDER_IS_ACTIVE.format('new')} - {_ORDER_IS_ACTIVE.format('old')})",
+        })}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_orders_dashboard_delete AFTER DELETE ON orders BEGIN
+        {_counter_update({
+            'total_revenue': f"-{LINE_REVENUE.format('old')}",
+            'total_orders': f"-{_ORDER_GONE}",
+            'active_orders': f"-({_ORDER_GONE} AND {_ORDER_IS_ACTIVE.format('old')})",
+            'unique_customers': f"-{_CUSTOMER_GONE}",
+        })}
+    END
+    """,
+)
+
+# Recount every counter from its table (initial fill, and repair after bulk loads)
+DASHBOARD_COUNTER_BACKFILL = f"""
+    INSERT OR REPLACE INTO dashboard_counters (Name, Value)
+    SELECT 'total_users', COUNT(*) FROM User
+    UNION ALL SELECT 'total_vendors', COUNT(*) FROM User WHERE AccountType = 'vendor'
+    UNION ALL SELECT 'pending_vendor_approvals', COUNT(*) FROM User WHERE AccountType = 'vendor' AND NOT IsVerified
+    UNION ALL SELECT 'total_products', COUNT(*) FROM Store WHERE IsActive = 1
+    UNION ALL SELECT 'total_stores', COUNT(DISTINCT StoreId) FROM Store
+    UNION ALL SELECT 'total_orders', COUNT(DISTINCT OrderId) FROM orders
+    UNION ALL SELECT 'active_orders', COUNT(DISTINCT OrderId) FROM orders WHERE OrderStatus IN {_ACTIVE_ORDER_STATUSES}
+    UNION ALL SELECT 'unique_customers', COUNT(DISTINCT CustomerId) FROM orders
+    UNION ALL SELECT 'total_revenue', COALESCE(SUM({LINE_REVENUE.format('orders')}), 0) FROM orders
+"""
+
+_snapshot_refresh_lock = threading.Lock()
+
+def create_dashboard_tables():
+    """Create the dashboard counters and snapshot tables with their triggers"""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='dashboard_counters';")
+        table_exists = cursor.fetchone()
+        
+        if not table_exists:
+            for statement in DASHBOARD_SCHEMA:
+                cursor.execute(statement)
+            cursor.execute(DASHBOARD_COUNTER_BACKFILL)
+            conn.commit()
+            logger.info("Dashboard tables created successfully")
+
+def rebuild_dashboard_counters():
+    """Recount the dashboard counters; writers wait until the recount commits"""
+    with transaction() as conn:
+        conn.execute(DASHBOARD_COUNTER_BACKFILL)
+
+def refresh_dashboard_snapshot():
+    """Recompute the aggregate dashboard sections into dashboard_snapshot"""
+    with get_db_read_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT substr(Day, 1, 7) AS Month, SUM(Revenue) AS Revenue, SUM(Orders) AS Orders
+            FROM sales_daily_totals
+            WHERE Day >= date('now', 'start of month', '-11 months')
+            GROUP BY Month
+            ORDER BY Month
+        """)
+        monthly_revenue = [{'month': row['Month'], 'revenue': row['Revenue'], 'orders': row['Orders']}
+                           for row in cursor.fetchall()]
+        
+        cursor.execute("""
+            SELECT c.CategoryId, c.CategoryName, c.CategoryNameHindi,
+                   SUM(sales_daily.Revenue) AS Revenue, SUM(sales_daily.Units) AS UnitsSold
+            FROM sales_daily
+            JOIN Categories c ON c.CategoryId = sales_daily.CategoryId
+            GROUP BY c.CategoryId
+            ORDER BY Revenue DESC
+            LIMIT 5
+        """)
+        top_categories = [{
+            'category_id': row['CategoryId'],
+            'name': row['CategoryName'],
+            'name_hindi': row['CategoryNameHindi'],
+            'revenue': row['Revenue'],
+            'units_sold': row['UnitsSold'],
+        } for row in cursor.fetchall()]
+        
+        cursor.execute("""
+            SELECT OrderId, CustomerId, OrderStatus, OrderDate, OrderTime,
+                   MAX(TotalAmount) AS TotalAmount, COUNT(*) AS ItemCount
+            FROM orders
+            GROUP BY OrderDate, OrderTime, OrderId
+            ORDER BY OrderDate DESC, OrderTime DESC, OrderId DESC
+            LIMIT 10
+        """)
+        recent_orders = [{
+            'order_id': row['OrderId'],
+            'customer_id': row['CustomerId'],
+            'status': row['OrderStatus'],
+            'order_date': row['OrderDate'],
+            'order_time': row['OrderTime'],
+            'total_amount': row['TotalAmount'],
+            'item_count': row['ItemCount'],
+        } for row in cursor.fetchall()]
+    
+    payload = json.dumps({
+        'monthly_revenue': monthly_revenue,
+        'top_categories': top_categories,
+        'recent_orders': recent_orders,
+    })
+    with get_db_connection() as conn:
+        conn.execute("""
+            INSERT INTO dashboard_snapshot (SnapshotId, Payload, RefreshedAt) VALUES (1, ?, ?)
+            ON CONFLICT(SnapshotId) DO UPDATE SET Payload = excluded.Payload, RefreshedAt = excluded.RefreshedAt
+        """, (payload, time.time()))
+        conn.commit()
+
+def _refresh_snapshot_in_background():
+    """Start one background snapshot refresh unless one is already running"""
+    if not _snapshot_refresh_lock.acquire(blocking=False):
+        return
+    
+    def refresh():
+        try:
+            refresh_dashboard_snapshot()
+        except Exception as e:
+            logger.error(f"Dashboard snapshot refresh failed: {e}")
+        finally:
+            _snapshot_refresh_lock.release()
+    
+    threading.Thread(target=refresh, name='dashboard-snapshot', daemon=True).start()
+
+def get_admin_dashboard_stats():
+    """
+    Admin dashboard: live counters plus the latest aggregate snapshot, read
+    in one statement. A snapshot older than DASHBOARD_SNAPSHOT_MAX_AGE is
+    served as is while a fresh one is computed in the background.
+    """
+    query = """
+        SELECT s.Payload, s.RefreshedAt,
+               (SELECT json_group_object(Name, Value) FROM dashboard_counters) AS Counters
+        FROM dashboard_snapshot s
+        WHERE s.SnapshotId = 1
+    """
+    with get_db_read_connection() as conn:
+        row = conn.execute(query).fetchone()
+    if row is None:
+        # First request after startup on a fresh database
+        refresh_dashboard_snapshot()
+        with get_db_read_connection() as conn:
+            row = conn.execute(query).fetchone()
+    
+    age = max(0.0, time.time() - row['RefreshedAt'])
+    if age > Config.DASHBOARD_SNAPSHOT_MAX_AGE:
+        _refresh_snapshot_in_background()
+    
+    stats = json.loads(row['Counters'])
+    stats.update(json.loads(row['Payload']))
+    stats['snapshot_refreshed_at'] = datetime.datetime.fromtimestamp(
+        row['RefreshedAt'], datetime.timezone.utc).isoformat()
+    stats['snapshot_age_seconds'] = round(age, 1)
+    return stats
+
+# SALES ROLLUPS
+# Orders, units, revenue and unique customers per day, store and category
+# (sales_daily), per day for the whole marketplace (sales_daily_totals) and
+# per hour and store (sales_hourly), kept current by triggers on orders.
+# Orders and customers are counted once per store and day, under the
+# category of their first line there; units and revenue leave out
+# cancelled and refunded lines.
+LINE_UNITS = "(CASE WHEN {0}.OrderStatus IN ('cancelled', 'refunded') THEN 0 ELSE {0}.Quantity END)"
+_LINE_CATEGORY = "COALESCE((SELECT CategoryId FROM Store WHERE StoreId = {0}.StoreId AND ItemId = {0}.ItemId), 0)"
+_LINE_HOUR = "{0}.OrderDate || ' ' || substr({0}.OrderTime, 1, 2)"
+_FIRST_STORE_LINE = ("(NOT EXISTS (SELECT 1 FROM orders WHERE OrderId = new.OrderId AND StoreId = new.StoreId "
+                     "AND OrderDetailId < new.OrderDetailId))")
+_NEW_STORE_CUSTOMER = ("(NOT EXISTS (SELECT 1 FROM sales_daily_customers "
+                       "WHERE Day = new.OrderDate AND StoreId = new.StoreId AND CustomerId = new.CustomerId))")
+_NEW_DAY_CUSTOMER = ("(NOT EXISTS (SELECT 1 FROM sales_daily_customers "
+                     "WHERE Day = new.OrderDate AND CustomerId = new.CustomerId))")
+_UNITS_DELTA = f"{LINE_UNITS.format('new')} - {LINE_UNITS.format('old')}"
+_REVENUE_DELTA = f"{LINE_REVENUE.format('new')} - {LINE_REVENUE.format('old')}"
+
+SALES_ROLLUP_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS sales_daily (
+        Day TEXT NOT NULL,
+        StoreId INTEGER NOT NULL,
+        CategoryId INTEGER NOT NULL,
+        Orders INTEGER NOT NULL DEFAULT 0,
+        Units INTEGER NOT NULL DEFAULT 0,
+        Revenue NUMERIC NOT NULL DEFAULT 0,
+        Customers INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (Day, StoreId, CategoryId)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_sales_daily_store ON sales_daily(StoreId, Day)",
+    """
+    CREATE TABLE IF NOT EXISTS sales_daily_totals (
+        Day TEXT PRIMARY KEY,
+        Orders INTEGER NOT NULL DEFAULT 0,
+        Units INTEGER NOT NULL DEFAULT 0,
+        Revenue NUMERIC NOT NULL DEFAULT 0,
+        Customers INTEGER NOT NULL DEFAULT 0
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS sales_hourly (
+        Hour TEXT NOT NULL,
+        StoreId INTEGER NOT NULL,
+        Orders INTEGER NOT NULL DEFAULT 0,
+        Units INTEGER NOT NULL DEFAULT 0,
+        Revenue NUMERIC NOT NULL DEFAULT 0,
+        PRIMARY KEY (Hour, StoreId)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_sales_hourly_store ON sales_hourly(StoreId, Hour)",
+    # Who has already been counted, per store and day
+    """
+    CREATE TABLE IF NOT EXISTS sales_daily_customers (
+        Day TEXT NOT NULL,
+        StoreId INTEGER NOT NULL,
+        CustomerId INTEGER NOT NULL,
+        PRIMARY KEY (Day, StoreId, CustomerId)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_sales_daily_customers_day ON sales_daily_customers(Day, CustomerId)",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_orders_rollup_insert AFTER INSERT ON orders BEGIN
+        INSERT INTO sales_daily (Day, StoreId, CategoryId, Orders, Units, Revenue, Customers)
+        VALUES (new.OrderDate, new.StoreId, {_LINE_CATEGORY.format('new')}, {_FIRST_STORE_LINE},
+                {LINE_UNITS.format('new')}, {LINE_REVENUE.format('new')}, {_NEW_STORE_CUSTOMER})
+        ON CONFLICT (Day, StoreId, CategoryId) DO UPDATE SET
+            Orders = Orders + excluded.Orders, Units = Units + excluded.Units,
+            Revenue = Revenue + excluded.Revenue, Customers = Customers + excluded.Customers;
+        INSERT INTO sales_daily_totals (Day, Orders, Units, Revenue, Customers)
+        VALUES (new.OrderDate, {_FIRST_ORDER_LINE.format('new')}, {LINE_UNITS.format('new')},
+                {LINE_REVENUE.format('new')}, {_NEW_DAY_CUSTOMER})
+        ON CONFLICT (Day) DO UPDATE SET
+            Orders = Orders + excluded.Orders, Units = Units + excluded.Units,
+            Revenue = Revenue + excluded.Revenue, Customers = Customers + excluded.Customers;
+        INSERT INTO sales_hourly (Hour, StoreId, Orders, Units, Revenue)
+        VALUES ({_LINE_HOUR.format('new')}, new.StoreId, {_FIRST_STORE_LINE},
+                {LINE_UNITS.format('new')}, {LINE_REVENUE.format('new')})
+        ON CONFLICT (Hour, StoreId) DO UPDATE SET
+            Orders = Orders + excluded.Orders, Units = Units + excluded.Units, Revenue = Revenue + excluded.Revenue;
+        INSERT OR IGNORE INTO sales_daily_customers (Day, StoreId, CustomerId)
+        VALUES (new.OrderDate, new.StoreId, new.CustomerId);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_orders_rollup_update
+    AFTER UPDATE OF OrderStatus, Price, Quantity ON orders
+    WHEN {_UNITS_DELTA} <> 0 OR {_REVENUE_DELTA} <> 0 BEGIN
+        UPDATE sales_daily SET Units = Units + {_UNITS_DELTA}, Revenue = Revenue + {_REVENUE_DELTA}
+        WHERE Day = new.OrderDate AND StoreId = new.StoreId AND CategoryId = {_LINE_CATEGORY.format('new')};
+        UPDATE sales_daily_totals SET Units = Units + {_UNITS_DELTA}, Revenue = Revenue + {_REVENUE_DELTA}
+        WHERE Day = new.OrderDate;
+        UPDATE sales_hourly SET Units = Units + {_UNITS_DELTA}, Revenue = Revenue + {_REVENUE_DELTA}
+        WHERE Hour = {_LINE_HOUR.format('new')} AND StoreId = new.StoreId;
+    END
+    """,
+)
+
+# Clear, then recompute from orders, the rollups of days on or after :since (every day when NULL)
+SALES_ROLLUP_CLEAR = (
+    "DELETE FROM sales_daily WHERE :since IS NULL OR Day >= :since",
+    "DELETE FROM sales_daily_totals WHERE :since IS NULL OR Day >= :since",
+    "DELETE FROM sales_hourly WHERE :since IS NULL OR Hour >= :since",
+    "DELETE FROM sales_daily_customers WHERE :since IS NULL OR Day >= :since",
+)
+SALES_ROLLUP_BACKFILL = (
+    f"""
+    INSERT INTO sales_daily (Day, StoreId, CategoryId, Orders, Units, Revenue, Customers)
+    SELECT Day, StoreId, CategoryId, SUM(FirstStoreLine), SUM(Units), SUM(Revenue), SUM(FirstCustomerLine)
+    FROM (
+        SELECT o.OrderDate AS Day, o.StoreId, COALESCE(s.CategoryId, 0) AS CategoryId,
+               {LINE_UNITS.format('o')} AS Units, {LINE_REVENUE.format('o')} AS Revenue,
+               ROW_NUMBER() OVER (PARTITION BY o.OrderId, o.StoreId ORDER BY o.OrderDetailId) = 1 AS FirstStoreLine,
+               ROW_NUMBER() OVER (PARTITION BY o.OrderDate, o.StoreId, o.CustomerId
+                                  ORDER BY o.OrderDetailId) = 1 AS FirstCustomerLine
+        FROM orders o
+        LEFT JOIN Store s ON s.StoreId = o.StoreId AND s.ItemId = o.ItemId
+        WHERE :since IS NULL OR o.OrderDate >= :since
+    )
+    GROUP BY Day, StoreId, CategoryId
+    """,
+    f"""
+    INSERT INTO sales_daily_totals (Day, Orders, Units, Revenue, Customers)
+    SELECT OrderDate, COUNT(DISTINCT OrderId), SUM({LINE_UNITS.format('orders')}),
+           SUM({LINE_REVENUE.format('orders')}), COUNT(DISTINCT CustomerId)
+    FROM orders
+    WHERE :since IS NULL OR OrderDate >= :since
+    GROUP BY OrderDate
+    """,
+    f"""
+    INSERT INTO sales_hourly (Hour, StoreId, Orders, Units, Revenue)
+    SELECT {_LINE_HOUR.format('orders')} AS Hour, StoreId, COUNT(DISTINCT OrderId),
+           SUM({LINE_UNITS.format('orders')}), SUM({LINE_REVENUE.format('orders')})
+    FROM orders
+    WHERE :since IS NULL OR OrderDate >= :since
+    GROUP BY Hour, StoreId
+    """,
+    """
+    INSERT INTO sales_daily_customers (Day, StoreId, CustomerId)
+    SELECT DISTINCT OrderDate, StoreId, CustomerId FROM orders
+    WHERE :since IS NULL OR OrderDate >= :since
+    """,
+)
+
+def create_sales_rollup_tables():
+    """Create the sales rollup tables and their triggers; fill them when new"""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='sales_daily';")
+        table_exists = cursor.fetchone()
+        
+        if not table_exists:
+            for statement in SALES_ROLLUP_SCHEMA:
+                cursor.execute(statement)
+            for statement in SALES_ROLLUP_BACKFILL:
+                cursor.execute(statement, {'since': None})
+            conn.commit()
+            logger.info("Sales rollup tables created successfully")
+
+def rebuild_sales_rollups(since=None):
+    """
+    Recompute the sales rollups from orders, for days on or after since
+    (an ISO date) or for all history. Writers wait until it commits.
+    """
+    with transaction() as conn:
+        for statement in SALES_ROLLUP_CLEAR + SALES_ROLLUP_BACKFILL:
+            conn.execute(statement, {'since': since})
+    logger.info(f"Sales rollups rebuilt since {since or 'the first order'}")
+
 # UTILITY FUNCTIONS
 def get_email(customer_id):
     """Get user email by ID"""
-    with get_db_connection() as conn:
+    with get_db_read_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('SELECT Email FROM User WHERE UserId = ?', (customer_id,))
         result = cursor.fetchone()
@@ -964,7 +2335,7 @@ def generate_order_id():
 
 def get_order_summary(order_id):
     """Get comprehensive order summary"""
-    with get_db_connection() as conn:
+    with get_db_read_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("""
             SELECT 
@@ -990,38 +2361,19 @@ def get_order_summary(order_id):
         return cursor.fetchone()
 
 def get_dashboard_stats(vendor_id=None):
-    """Get dashboard statistics"""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        
-        if vendor_id:
-            # Vendor-specific stats
-            cursor.execute("""
-                SELECT 
-                    COUNT(DISTINCT o.OrderId) as total_orders,
-                    SUM(o.TotalAmount) as total_revenue,
-                    COUNT(DISTINCT o.CustomerId) as unique_customers,
-                    COUNT(i.ItemId) as total_products,
-                    SUM(i.Quantity) as total_inventory
-                FROM orders o
-                LEFT JOIN inventory i ON o.StoreId = i.StoreId
-                WHERE o.StoreId = ?
-            """, (vendor_id,))
-        else:
-            # Admin/global stats
-            cursor.execute("""
-                SELECT 
-                    COUNT(DISTINCT o.OrderId) as total_orders,
-                    SUM(o.TotalAmount) as total_revenue,
-                    COUNT(DISTINCT o.CustomerId) as unique_customers,
-                    COUNT(DISTINCT u.UserId) as total_users,
-                    COUNT(DISTINCT s.StoreId) as total_stores
-                FROM orders o
-                LEFT JOIN User u ON 1=1
-                LEFT JOIN Store s ON 1=1
-            """)
-        
-        return cursor.fetchone()
+    """Get dashboard statistics (see analytics.get_dashboard_stats)"""
+    from . import analytics
+    return analytics.get_dashboard_stats(vendor_id)
+
+def get_admin_analytics(period='month', start_date=None, end_date=None):
+    """Marketplace sales analytics (see analytics.get_admin_analytics)"""
+    from . import analytics
+    return analytics.get_admin_analytics(period, start_date, end_date)
+
+def get_vendor_analytics(user_id, start_date=None, end_date=None):
+    """Sales analytics of a vendor's store (see analytics.get_vendor_analytics)"""
+    from . import analytics
+    return analytics.get_vendor_analytics(user_id, start_date, end_date)
 
 # Legacy functions for backward compatibility
 def Check_Valid_User(username, password):
@@ -1,6 +1,9 @@
 """
 Database utilities for connection pooling, transaction management, and query optimization.
 """
+import os
+import re
+import sys
 import sqlite3
 import logging
 import time
@@ -8,6 +11,10 @@ import threading
 from contextlib import contextmanager
 from typing import Optional, Callable, Any
 from functools import wraps
+from collections import OrderedDict
+from urllib.request import pathname2url
+
+from .config import Config
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +22,19 @@ logger = logging.getLogger(__name__)
 MAX_RETRIES = 3
 RETRY_DELAY = 0.5  # seconds
 QUERY_TIMEOUT = 30  # seconds
+STATEMENT_CACHE_SIZE = 256  # prepared statements kept per connection (sqlite3 default is 128)
+IDLE_CHECK_INTERVAL = 30  # seconds a pooled connection may idle before a liveness probe
+
+# Per-connection setup profile, applied once when a connection is opened
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',  # Enable WAL mode for better concurrency
+    'synchronous': 'NORMAL',
+    'cache_size': -64000,  # 64MB cache
+    'temp_store': 'MEMORY',
+    'mmap_size': 268435456,  # 256MB memory-mapped I/O
+    'busy_timeout': 30000,  # milliseconds
+    'foreign_keys': 'OFF',  # Existing rows are not guaranteed to satisfy the declared references
+}
 
 
 class ConnectionPool:
@@ -22,84 +42,269 @@ class ConnectionPool:
     Simple connection pool for SQLite database.
     Note: SQLite doesn't support true concurrent connections well,
     but this pool helps manage connection reuse efficiently.
+
+    A connection is pinned to the borrowing thread until it is released, so
+    nested helpers on the same thread reuse it instead of taking a second slot.
+    PRAGMAs and connect hooks run once per connection, not once per checkout.
+    
+    With read_only=True connections are opened with mode=ro and query_only,
+    so they can serve WAL snapshots without ever queueing for the write lock.
     """
     
-    def __init__(self, database: str, max_connections: int = 5):
+    def __init__(self, database: str, max_connections: int = 5, timeout: float = 30.0,
+                 pragmas: dict = None, on_connect: list = None,
+                 idle_check_interval: float = IDLE_CHECK_INTERVAL,
+                 read_only: bool = False):
         self.database = database
         self.max_connections = max_connections
-        self._pool = []
+        self.timeout = timeout
+        self.read_only = read_only
+        self.pragmas = dict(DEFAULT_PRAGMAS)
+        if read_only:
+            # The journal mode is a property of the file and belongs to the writer
+            self.pragmas.pop('journal_mode', None)
+            self.pragmas['query_only'] = 'ON'
+        if pragmas:
+            self.pragmas.update(pragmas)
+        self.idle_check_interval = idle_check_interval
+        self._connect_hooks = list(on_connect or [])
+        self._pool = []  # (connection, idle_since, suspect) tuples
         self._lock = threading.Lock()
         self._semaphore = threading.Semaphore(max_connections)
+        self._local = threading.local()
+        self._in_use = 0
+        self._stats = {
+            'checkouts': 0,
+            'hits': 0,
+            'misses': 0,
+            'reentrant': 0,
+            'created': 0,
+            'closed': 0,
+            'probes': 0,
+            'discarded': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+        }
+    
+    def add_connect_hook(self, hook: Callable):
+        """Register a callable run with each newly opened connection"""
+        with self._lock:
+            self._connect_hooks.append(hook)
+    
+    def _create_connection(self):
+        """Open a new connection and apply the setup profile"""
+        if self.read_only:
+            target = f"file:{pathname2url(os.path.abspath(self.database))}?mode=ro"
+        else:
+            target = self.database
+        conn = sqlite3.connect(
+            target,
+            timeout=self.timeout,
+            check_same_thread=False,  # Pooled connections move between threads
+            uri=self.read_only,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        conn.row_factory = sqlite3.Row
+        try:
+            for name, value in self.pragmas.items():
+                conn.execute(f"PRAGMA {name}={value}")
+            for hook in list(self._connect_hooks):
+                hook(conn)
+        except Exception:
+            conn.close()
+            raise
+        with self._lock:
+            self._stats['created'] += 1
+        return conn
+    
+    def _close_connection(self, conn):
+        conn.close()
+        with self._lock:
+            self._stats['closed'] += 1
+    
+    def _is_alive(self, conn) -> bool:
+        """Liveness probe, only used for idle or previously failing connections"""
+        with self._lock:
+            self._stats['probes'] += 1
+        try:
+            conn.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
     
     @contextmanager
     def get_connection(self):
         """Get a connection from the pool"""
+        held = getattr(self._local, 'conn', None)
+        if held is not None:
+            # Re-entrant borrow from the same thread
+            self._local.depth += 1
+            with self._lock:
+                self._stats['reentrant'] += 1
+            try:
+                yield held
+            finally:
+                self._local.depth -= 1
+            return
+        
+        started = time.perf_counter()
         self._semaphore.acquire()
+        waited = time.perf_counter() - started
         conn = None
+        suspect = False
         
         try:
             with self._lock:
-                if self._pool:
-                    conn = self._pool.pop()
-                    # Check if connection is still valid
-                    try:
-                        conn.execute("SELECT 1")
-                    except:
-                        conn = None
+                self._in_use += 1
+                self._stats['checkouts'] += 1
+                self._stats['wait_time_total'] += waited
+                self._stats['wait_time_max'] = max(self._stats['wait_time_max'], waited)
+                entry = self._pool.pop() if self._pool else None
             
-            if conn is None:
-                conn = sqlite3.connect(
-                    self.database,
-                    timeout=30.0,
-                    isolation_level=None  # Autocommit mode for connection pooling
-                )
-                conn.row_factory = sqlite3.Row
+            if entry is not None:
+                conn, idle_since, was_suspect = entry
+                idle_for = time.monotonic() - idle_since
+                if (was_suspect or idle_for > self.idle_check_interval) and not self._is_alive(conn):
+                    self._close_connection(conn)
+                    with self._lock:
+                        self._stats['discarded'] += 1
+                    conn = None
+            
+            with self._lock:
+                self._stats['hits' if conn is not None else 'misses'] += 1
             
-            # Enable WAL mode for better concurrency
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA synchronous=NORMAL")
-            conn.execute("PRAGMA cache_size=-64000")  # 64MB cache
-            conn.execute("PRAGMA temp_store=MEMORY")
+            if conn is None:
+                conn = self._create_connection()
             
+            self._local.conn = conn
+            self._local.depth = 1
             yield conn
             
         except Exception as e:
-            if conn:
-                conn.rollback()
-            logger.error(f"Database error: {e}")
+            # Constraint violations say nothing about the connection itself
+            suspect = isinstance(e, sqlite3.Error) and not isinstance(e, sqlite3.IntegrityError)
+            if isinstance(e, sqlite3.Error):
+                logger.error(f"Database error: {e}")
             raise
         
         finally:
-            if conn:
+            self._local.conn = None
+            if conn is not None:
+                # Never hand out a connection with a half-finished transaction
+                try:
+                    if conn.in_transaction:
+                        conn.rollback()
+                except sqlite3.Error:
+                    suspect = True
                 with self._lock:
                     if len(self._pool) < self.max_connections:
-                        self._pool.append(conn)
-                    else:
-                        conn.close()
+                        self._pool.append((conn, time.monotonic(), suspect))
+                        conn = None
+                if conn is not None:
+                    self._close_connection(conn)
+            with self._lock:
+                self._in_use -= 1
             self._semaphore.release()
+    
+    def held_connection(self):
+        """Return the connection the calling thread currently holds, if any"""
+        return getattr(self._local, 'conn', None)
+    
+    def get_stats(self) -> dict:
+        """Return pool size, wait time and hit/miss counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['max_connections'] = self.max_connections
+            stats['idle'] = len(self._pool)
+            stats['in_use'] = self._in_use
+        checkouts = stats['checkouts']
+        stats['hit_rate'] = stats['hits'] / checkouts if checkouts else 0.0
+        stats['wait_time_avg'] = stats['wait_time_total'] / checkouts if checkouts else 0.0
+        return stats
+    
+    def close_all(self):
+        """Close every idle connection in the pool"""
+        with self._lock:
+            idle = [entry[0] for entry in self._pool]
+            self._pool.clear()
+        for conn in idle:
+            self._close_connection(conn)
 
 
-# Global connection pool instance
+# Global connection pools: one serialized writer and a group of read-only readers
 _connection_pool = None
+_read_pool = None
+_connection_pool_lock = threading.Lock()
 
 
 def get_connection_pool() -> ConnectionPool:
-    """Get or create the global connection pool"""
+    """Get or create the global writer pool (a single serialized connection)"""
     global _connection_pool
     if _connection_pool is None:
-        from .database import DATABASE_NAME
-        _connection_pool = ConnectionPool(
-            Config.DATABASE_URL.replace('sqlite:///', ''),
-            max_connections=5
-        )
+        with _connection_pool_lock:
+            if _connection_pool is None:
+                _connection_pool = ConnectionPool(
+                    Config.DATABASE_PATH,
+                    max_connections=1,
+                    timeout=Config.DATABASE_TIMEOUT
+                )
     return _connection_pool
 
 
+def get_read_pool() -> ConnectionPool:
+    """Get or create the global read-only connection pool"""
+    global _read_pool
+    if _read_pool is None:
+        with _connection_pool_lock:
+            if _read_pool is None:
+                _read_pool = ConnectionPool(
+                    Config.DATABASE_PATH,
+                    max_connections=Config.DATABASE_READ_POOL_SIZE,
+                    timeout=Config.DATABASE_TIMEOUT,
+                    read_only=True
+                )
+    return _read_pool
+
+
+def reset_connection_pools():
+    """Close idle connections and drop both global pools (e.g. after a config change)"""
+    global _connection_pool, _read_pool
+    with _connection_pool_lock:
+        for pool in (_connection_pool, _read_pool):
+            if pool is not None:
+                pool.close_all()
+        _connection_pool = None
+        _read_pool = None
+
+
 @contextmanager
 def get_pooled_connection():
-    """Context manager for getting a pooled connection"""
+    """Context manager for getting the pooled writer connection"""
     pool = get_connection_pool()
-    yield from pool.get_connection()
+    with pool.get_connection() as conn:
+        yield conn
+
+
+@contextmanager
+def get_read_connection():
+    """
+    Context manager for getting a read-only pooled connection.
+    A thread that already holds the writer keeps using it, so it sees its own
+    uncommitted changes.
+    """
+    writer = get_connection_pool()
+    pool = writer if writer.held_connection() is not None else get_read_pool()
+    with pool.get_connection() as conn:
+        yield conn
+
+
+def get_pool_stats() -> dict:
+    """Get counters for the global writer and reader pools and the statement cache"""
+    return {
+        'writer': get_connection_pool().get_stats(),
+        'reader': get_read_pool().get_stats(),
+        'statements': prepared_statements.get_stats()
+    }
 
 
 def with_retry(max_retries: int = MAX_RETRIES, delay: float = RETRY_DELAY):
@@ -318,34 +523,68 @@ def execute_with_timeout(cursor, query: str, params: tuple = None, timeout: int
 
 
 # Prepared statements cache
+_SQL_TOKENS = re.compile(r"('(?:[^']|'')*')|\s+")
+
+
+def canonicalize_sql(query: str) -> str:
+    """Collapse whitespace outside string literals so equivalent SQL shares one text"""
+    return _SQL_TOKENS.sub(lambda m: m.group(1) or ' ', query).strip()
+
+
 class PreparedStatementCache:
     """
-    Cache for prepared statements to improve performance.
-    Note: SQLite doesn't support true prepared statements,
-    but we can cache query templates.
+    LRU cache of canonical SQL text.
+    
+    sqlite3 keeps a per-connection cache of prepared statements keyed by the
+    SQL string, so executing the exact same text on a pooled connection skips
+    parsing and planning. This cache maps query text to one canonical, interned
+    string so dynamically built queries land on the same prepared statement,
+    and it tracks how often that happens.
     """
     
-    def __init__(self, max_size: int = 100):
-        self._cache = {}
+    def __init__(self, max_size: int = STATEMENT_CACHE_SIZE):
+        self._cache = OrderedDict()
         self._max_size = max_size
         self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
     
     def get(self, query: str) -> Optional[str]:
-        """Get a cached query template"""
+        """Get the canonical text for a cached query"""
+        with self._lock:
+            canonical = self._cache.get(query)
+            if canonical is None:
+                self._stats['misses'] += 1
+                return None
+            self._cache.move_to_end(query)
+            self._stats['hits'] += 1
+            return canonical
+    
+    def put(self, query: str) -> str:
+        """Cache a query and return its canonical text"""
+        canonical = sys.intern(canonicalize_sql(query))
         with self._lock:
-            entry = self._cache.get(query)
-            if entry:
-                return query
-            return None
+            self._cache[query] = canonical
+            self._cache.move_to_end(query)
+            while len(self._cache) > self._max_size:
+                # Evict the least recently used query
+                self._cache.popitem(last=False)
+                self._stats['evictions'] += 1
+        return canonical
     
-    def put(self, query: str):
-        """Cache a query template"""
+    def clear(self):
         with self._lock:
-            if len(self._cache) >= self._max_size:
-                # Remove oldest entry (simple FIFO)
-                oldest = next(iter(self._cache))
-                del self._cache[oldest]
-            self._cache[query] = True
+            self._cache.clear()
+            self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+    
+    def get_stats(self) -> dict:
+        """Return size and hit-rate statistics"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._cache)
+        stats['max_size'] = self._max_size
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
 
 
 # Global prepared statements cache
@@ -354,21 +593,17 @@ prepared_statements = PreparedStatementCache()
 
 def get_cached_query(query: str, params: dict = None) -> str:
     """
-    Get a cached query or prepare a new one.
-    This helps prevent SQL injection by using parameterized queries.
+    Get the canonical text for a query, caching it on first use.
+    Execute the returned string so the connection reuses its prepared statement.
     
     Args:
         query: SQL query template
         params: Dictionary of parameters
     
     Returns:
-        Processed query ready for execution
+        Canonical query ready for execution
     """
-    # Check cache first
     cached = prepared_statements.get(query)
-    if cached:
-        return query
-    
-    # Cache the query
-    prepared_statements.put(query)
-    return query
+    if cached is not None:
+        return cached
+    return prepared_statements.put(query)
@@ -1,19 +1,21 @@
 from flask import Blueprint, request, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-import razorpay
 from . import database
 from .extensions import limiter
 from .config import Config
 from .utils import success_response, error_response, validate_pagination, create_pagination_info
+from .razorpay_sdk import ClientRegistry
 
 orders_bp = Blueprint('orders', __name__, url_prefix='/v1')
 
-# Initialize Razorpay client
+# Razorpay clients are shared per worker, each keeping its HTTPS connections alive
+razorpay_clients = ClientRegistry(pool_size=Config.RAZORPAY_POOL_SIZE)
+
 def get_razorpay_client():
-    return razorpay.Client(auth=(
+    return razorpay_clients.get(
         current_app.config['RAZORPAY_KEY_ID'], 
         current_app.config['RAZORPAY_KEY_SECRET']
-    ))
+    )
 
 @orders_bp.route('/orders', methods=['GET'])
 @limiter.limit(Config.LIMIT_ORDERS_READ_ORDER)
@@ -72,46 +74,36 @@ def create_order():
         if not address:
             return error_response("Invalid shipping address", 400)
         
-        # Get cart items
-        cart_items = database.select_user_cart(user_id)
-        if not cart_items:
-            return error_response("Cart is empty", 400)
-        
-        # Calculate total amount
-        total_amount = 0
-        for item in cart_items:
-            total_amount += item['quantity'] * item['price']
+        # Stock is taken, order lines written and the cart emptied in one
+        # transaction; the payment order is created once the stock is held
+        try:
+            order = database.checkout_cart(user_id, delivery_address=str(shipping_address_id))
+        except database.CheckoutError as e:
+            return error_response(str(e), 409 if e.items else 400)
+        order_id = order['order_id']
         
         shipping_cost = current_app.config.get('SHIPPING_COST', 100)
-        final_amount = total_amount + shipping_cost
+        final_amount = order['total_amount'] + shipping_cost
         
-        # Create Razorpay order
+        # Create Razorpay order and record it; if either fails the stock and
+        # cart are given back
         client = get_razorpay_client()
-        receipt_id = f"order_{user_id}_{database.get_next_receipt_number()}"
-        
-        razorpay_order = client.order.create({
-            "amount": int(final_amount * 100),  # Amount in paise
-            "currency": current_app.config.get('CURRENCY', 'INR'),
-            "receipt": receipt_id
-        })
-        
-        # Create order in database
-        order_data = {
-            'user_id': user_id,
-            'razorpay_order_id': razorpay_order['id'],
-            'total_amount': final_amount,
-            'shipping_amount': shipping_cost,
-            'shipping_address_id': shipping_address_id,
-            'status': 'pending',
-            'payment_status': 'pending'
-        }
-        
-        order_id = database.create_order(order_data, cart_items)
-        if order_id < 0:
-            return error_response("Failed to create order", 500)
-        
-        # Clear cart after successful order creation
-        database.clear_user_cart(user_id)
+        razorpay_order = None
+        try:
+            razorpay_order = client.order.create({
+                "amount": int(final_amount * 100),  # Amount in paise
+                "currency": current_app.config.get('CURRENCY', 'INR'),
+                "receipt": order_id
+            })
+            database.record_payment(order_id, user_id, final_amount, payment_method,
+                                    transaction_id=razorpay_order['id'])
+        except Exception:
+            database.cancel_checkout(order_id)
+            if razorpay_order is not None:
+                # Left unpaid, it expires on Razorpay's side
+                current_app.logger.warning(
+                    f"Order {order_id} cancelled after Razorpay order {razorpay_order['id']} was created")
+            raise
         
         return success_response({
             'order_id': order_id,
@@ -1,9 +1,10 @@
-from flask import Blueprint, request, Config
+from flask import Blueprint, request, Config, Response
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from . import database
 from .extensions import limiter
 from .config import Config
-from .utils import success_response, error_response, validate_pagination, create_pagination_info
+from .utils import (success_response, error_response, validate_pagination, validate_cursor,
+                    create_pagination_info, create_cursor_pagination_info)
 
 products_bp = Blueprint('products', __name__, url_prefix='/v1')
 
@@ -21,6 +22,13 @@ def get_products():
         sort_by = request.args.get('sort_by', 'created_at')
         sort_order = request.args.get('sort_order', 'desc')
         
+        # ?cursor= switches to keyset pagination; a cursor is only valid for its own sort
+        sort = f"{sort_by}:{sort_order}"
+        try:
+            after = validate_cursor(sort)
+        except ValueError as e:
+            return error_response(str(e), 400)
+        
         filters = {
             'category_id': category_id,
             'market_id': market_id,
@@ -32,8 +40,11 @@ def get_products():
             'per_page': per_page
         }
         
-        products, total_count = database.get_products_with_filters(filters)
-        pagination = create_pagination_info(page, per_page, total_count)
+        products, total_count, next_key = database.get_products_with_filters(filters, after)
+        if after is None:
+            pagination = create_pagination_info(page, per_page, total_count)
+        else:
+            pagination = create_cursor_pagination_info(per_page, sort, next_key, total_count)
         
         return success_response(products, "Products retrieved successfully", pagination)
         
@@ -91,8 +102,16 @@ def search_products():
 @limiter.limit(Config.LIMIT_READ_PRODUCTS)
 def get_categories():
     try:
-        categories = database.get_all_categories()
-        return success_response(categories, "Categories retrieved successfully")
+        tree = database.get_category_tree()
+        
+        # The version hashes the tree, so a matching ETag means nothing changed
+        if request.if_none_match.contains(tree['version']):
+            response = Response(status=304)
+        else:
+            response = success_response(tree['categories'], "Categories retrieved successfully")
+        response.set_etag(tree['version'])
+        response.headers['Cache-Control'] = 'public, no-cache'
+        return response
         
     except Exception as e:
         return error_response(f"Failed to retrieve categories: {str(e)}", 500)
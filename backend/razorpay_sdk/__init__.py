@@ -1,30 +1,16 @@
-from .client import Client
-from .resources import Order
-from .resources import Payment
-from .resources import Refund
-from .resources import Invoice
-from .resources import PaymentLink
-from .resources import Customer
-from .resources import Card
-from .resources import Token
-from .resources import Transfer
-from .resources import VirtualAccount
-from .resources import Addon
-from .resources import Subscription
-from .resources import RegistrationLink
-from .resources import Plan
-from .resources import Settlement
-from .resources import Item
-from .resources import Qrcode
-from .resources import FundAccount
-from .utility import Utility
+from importlib import import_module
+
 from .constants import ERROR_CODE
 from .constants import HTTP_STATUS_CODE
-from .resources import Account
-from .resources import Stakeholder
-from .resources import Product
-from .resources import Iin
-from .resources import Webhook
+from .resources import __all__ as _RESOURCES
+
+# Everything else is imported on first access, so importing the package
+# costs next to nothing; the client and its HTTP stack load with Client
+_MODULES = dict({name: '.resources' for name in _RESOURCES},
+                AsyncClient='.async_client',
+                Client='.client',
+                ClientRegistry='.registry',
+                Utility='.utility')
 
 __all__ = [
         'Payment',
@@ -53,5 +39,17 @@ __all__ = [
         'Stakeholder',
         'Product',
         'Iin',
-        'Webhook'
+        'Webhook',
+        'ClientRegistry',
+        'AsyncClient'
 ]
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        return getattr(import_module(_MODULES[name], __name__), name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
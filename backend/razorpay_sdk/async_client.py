@@ -0,0 +1,60 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from .client import Client
+from .registry import pooled_session
+
+
+DEFAULT_CONCURRENCY = 10
+
+
+class AsyncClient(Client):
+    """
+    Razorpay client for asyncio code, mirroring Client: every resource
+    method returns an awaitable, as in
+
+        async with AsyncClient(auth=(key_id, key_secret)) as client:
+            payments = await asyncio.gather(
+                *(client.payment.fetch(payment_id) for payment_id in ids))
+
+    Requests run on a pooled keep-alive session in a private pool of
+    max_concurrency threads, so however many calls are awaited together
+    at most max_concurrency are in flight, sharing that many connections.
+    Errors raise the same BadRequestError, GatewayError and ServerError
+    as Client.
+    """
+
+    def __init__(self, session=None, auth=None,
+                 max_concurrency=DEFAULT_CONCURRENCY, **options):
+        """
+        Initialize an AsyncClient object with session, optional auth
+        handler, the number of requests allowed in flight, and options
+        """
+        super(AsyncClient, self).__init__(
+            session=session or pooled_session(max_concurrency), auth=auth, **options)
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                            thread_name_prefix='razorpay')
+
+    async def request(self, method, path, **options):
+        """
+        Dispatches a request to the Razorpay HTTP API once one of the
+        max_concurrency slots is free
+        """
+        loop = asyncio.get_running_loop()
+        send = partial(super(AsyncClient, self).request, method, path, **options)
+        return await loop.run_in_executor(self._executor, send)
+
+    async def close(self):
+        """
+        Waits for requests in flight, then closes the pooled session
+        """
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+        self.session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
@@ -1,35 +1,50 @@
 import os
 import json
 import requests
-import pkg_resources
 
-from pkg_resources import DistributionNotFound
-
-from types import ModuleType
+from functools import lru_cache
+from importlib import import_module
 
 from .constants import HTTP_STATUS_CODE, ERROR_CODE, URL
-
-from . import resources, utility
+from .resources import _MODULES as RESOURCE_MODULES
 
 from .errors import (BadRequestError, GatewayError,
                      ServerError)
 
 
+@lru_cache(maxsize=None)
+def package_version():
+    """
+    Returns the installed razorpay version, looked up once on first use
+    """
+    from importlib import metadata
+    try:
+        return metadata.version("razorpay")
+    except metadata.PackageNotFoundError:  # pragma: no cover
+        return ""
+
+
 def capitalize_camel_case(string):
     return "".join(map(str.capitalize, string.split('_')))
 
 
-# Create a dict of resource classes
-RESOURCE_CLASSES = {}
-for name, module in resources.__dict__.items():
-    if isinstance(module, ModuleType) and \
-            capitalize_camel_case(name) in module.__dict__:
-        RESOURCE_CLASSES[name] = module.__dict__[capitalize_camel_case(name)]
+# Resource and utility attributes of a Client; each is also the name of the
+# module defining its class (payment_link -> resources.payment_link.PaymentLink).
+# Resources are listed once, in the resources package.
+RESOURCE_NAMES = frozenset(RESOURCE_MODULES.values())
+
+UTILITY_NAMES = frozenset(['utility'])
+
 
-UTILITY_CLASSES = {}
-for name, module in utility.__dict__.items():
-    if isinstance(module, ModuleType) and name.capitalize() in module.__dict__:
-        UTILITY_CLASSES[name] = module.__dict__[name.capitalize()]
+def load_class(name):
+    """
+    Imports and returns the resource or utility class for an attribute name
+    """
+    if name in RESOURCE_NAMES:
+        module = import_module('.resources.' + name, __package__)
+        return getattr(module, capitalize_camel_case(name))
+    module = import_module('.utility.' + name, __package__)
+    return getattr(module, name.capitalize())
 
 
 class Client:
@@ -52,14 +67,22 @@ class Client:
         self.base_url = self._set_base_url(**options)
 
         self.app_details = []
+        self._user_agent = None
 
-        # intializes each resource
-        # injecting this client object into the constructor
-        for name, Klass in RESOURCE_CLASSES.items():
-            setattr(self, name, Klass(self))
+    def __getattr__(self, name):
+        """
+        Creates a resource or utility on first access, injecting this
+        client object into its constructor. It is cached on the instance,
+        so later lookups never get here; concurrent first accesses all
+        receive the instance that was stored first.
+        """
+        if name in RESOURCE_NAMES or name in UTILITY_NAMES:
+            return self.__dict__.setdefault(name, load_class(name)(self))
+        raise AttributeError("{!r} object has no attribute {!r}".format(
+            type(self).__name__, name))
 
-        for name, Klass in UTILITY_CLASSES.items():
-            setattr(self, name, Klass(self))
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | RESOURCE_NAMES | UTILITY_NAMES)
 
     def _set_base_url(self, **options):
         base_url = self.DEFAULTS['base_url']
@@ -71,8 +94,7 @@ class Client:
         return base_url
 
     def _update_user_agent_header(self, options):
-        user_agent = "{}{} {}".format('Razorpay-Python/', self._get_version(),
-                                      self._get_app_details_ua())
+        user_agent = self._get_user_agent()
 
         if 'headers' in options:
             options['headers']['User-Agent'] = user_agent
@@ -81,13 +103,18 @@ class Client:
 
         return options
 
+    def _get_user_agent(self):
+        """
+        Returns the User-Agent, built on first use and again only after
+        set_app_details changes it
+        """
+        if self._user_agent is None:
+            self._user_agent = "{}{} {}".format('Razorpay-Python/', self._get_version(),
+                                                self._get_app_details_ua())
+        return self._user_agent
+
     def _get_version(self):
-        version = ""
-        try: # nosemgrep : gitlab.bandit.B110
-            version = pkg_resources.require("razorpay")[0].version
-        except DistributionNotFound:  # pragma: no cover
-            pass
-        return version
+        return package_version()
 
     def _get_app_details_ua(self):
         app_details_ua = ""
@@ -105,6 +132,7 @@ class Client:
 
     def set_app_details(self, app_details):
         self.app_details.append(app_details)
+        self._user_agent = None
 
     def get_app_details(self):
         return self.app_details
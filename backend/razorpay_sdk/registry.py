@@ -0,0 +1,100 @@
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .client import Client
+
+
+DEFAULT_POOL_SIZE = 10
+
+
+def pooled_session(pool_size=DEFAULT_POOL_SIZE):
+    """
+    Returns a requests Session keeping up to pool_size keep-alive
+    connections per host, so calls after the first skip the TCP and
+    TLS handshakes
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def connection_stats(session):
+    """
+    Counts requests sent and connections opened by a session's pools;
+    every request beyond the connections opened reused one
+    """
+    sent = opened = 0
+    adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+    for adapter in adapters.values():
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                sent += pool.num_requests
+                opened += pool.num_connections
+    return {'requests': sent, 'connections': opened, 'reused': max(sent - opened, 0)}
+
+
+class ClientRegistry:
+    """
+    Thread-safe registry of Clients, one per set of credentials and
+    options, each on a pooled keep-alive session.
+
+    Clients are created on first use and shared after that. A forked
+    child starts with an empty registry, since pooled sockets must not
+    be shared between processes.
+    """
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE):
+        self.pool_size = pool_size
+        self._clients = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self.created = 0
+        self.lookups = 0
+
+    def get(self, key_id, key_secret, **options):
+        """
+        Returns the shared Client for these credentials and options
+        """
+        key = (key_id, key_secret, tuple(sorted(options.items())))
+        with self._lock:
+            if self._pid != os.getpid():
+                self._clients = {}
+                self._pid = os.getpid()
+            self.lookups += 1
+            client = self._clients.get(key)
+            if client is None:
+                client = Client(session=pooled_session(self.pool_size),
+                                auth=(key_id, key_secret), **options)
+                self._clients[key] = client
+                self.created += 1
+            return client
+
+    def stats(self):
+        """
+        Returns registry counters and connection reuse summed over all
+        clients; no credentials, not even key ids, are included
+        """
+        with self._lock:
+            clients = list(self._clients.values())
+            stats = {'clients': len(clients), 'created': self.created, 'lookups': self.lookups,
+                     'connections': {'requests': 0, 'connections': 0, 'reused': 0}}
+        for client in clients:
+            for name, value in connection_stats(client.session).items():
+                stats['connections'][name] += value
+        return stats
+
+    def close(self):
+        """
+        Closes every pooled session and forgets the clients
+        """
+        with self._lock:
+            clients, self._clients = self._clients, {}
+        for client in clients.values():
+            client.session.close()
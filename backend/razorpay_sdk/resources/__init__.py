@@ -1,49 +1,41 @@
-from .payment import Payment
-from .refund import Refund
-from .order import Order
-from .invoice import Invoice
-from .payment_link import PaymentLink
-from .customer import Customer
-from .card import Card
-from .token import Token
-from .transfer import Transfer
-from .virtual_account import VirtualAccount
-from .addon import Addon
-from .plan import Plan
-from .subscription import Subscription
-from .qrcode import Qrcode
-from .registration_link import RegistrationLink
-from .settlement import Settlement
-from .item import Item
-from .fund_account import FundAccount
-from .account import Account
-from .stakeholder import Stakeholder
-from .product import Product
-from .iin import Iin
-from .webhook import Webhook
+from importlib import import_module
 
-__all__ = [
-    'Payment',
-    'Refund',
-    'Order',
-    'Invoice',
-    'PaymentLink',
-    'Customer',
-    'Card',
-    'Token',
-    'Transfer',
-    'VirtualAccount',
-    'Addon',
-    'Plan',
-    'Subscription',
-    'RegistrationLink',
-    'Settlement',
-    'Item',
-    'QrCode',
-    'FundAccount',
-    'Account',
-    'Stakeholder',
-    'Product',
-    'Iin',
-    'Webhook'
-]
+# Resource class -> submodule defining it; submodules are imported on first
+# access, so importing the package does not load every resource
+_MODULES = {
+    'Payment': 'payment',
+    'Refund': 'refund',
+    'Order': 'order',
+    'Invoice': 'invoice',
+    'PaymentLink': 'payment_link',
+    'Customer': 'customer',
+    'Card': 'card',
+    'Token': 'token',
+    'Transfer': 'transfer',
+    'VirtualAccount': 'virtual_account',
+    'Addon': 'addon',
+    'Plan': 'plan',
+    'Subscription': 'subscription',
+    'RegistrationLink': 'registration_link',
+    'Settlement': 'settlement',
+    'Item': 'item',
+    'Qrcode': 'qrcode',
+    'FundAccount': 'fund_account',
+    'Account': 'account',
+    'Stakeholder': 'stakeholder',
+    'Product': 'product',
+    'Iin': 'iin',
+    'Webhook': 'webhook',
+}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        return getattr(import_module('.' + _MODULES[name], __name__), name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,3 +1,22 @@
+import asyncio
+import inspect
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+# Largest count the list APIs accept for one page
+MAX_PAGE_SIZE = 100
+
+
+def split_window(start, end, windows):
+    """
+    Splits the inclusive from/to range [start, end] into up to windows
+    non-overlapping inclusive ranges, newest first like the list APIs
+    """
+    step = max(-(-(end - start + 1) // windows), 1)
+    bounds = [(low, min(low + step - 1, end)) for low in range(start, end + 1, step)]
+    return bounds[::-1]
+
+
 class Resource(object):
 
     def __init__(self, client=None):
@@ -6,6 +25,93 @@ class Resource(object):
     def all(self, data, **kwargs):
         return self.get_url(self.base_url, data, **kwargs)
 
+    def iter_all(self, data={}, page_size=MAX_PAGE_SIZE, windows=1, **kwargs):
+        """
+        Yields every entity matching data, walking the list a page at a
+        time with count/skip while the next page is fetched in the
+        background, so at most two pages per window are held in memory
+
+        Args:
+            data : Filters for all(), such as 'from' and 'to' timestamps
+            page_size : Entities fetched per request, at most 100
+            windows : Splits the 'from'/'to' range into this many windows
+                      fetched in parallel; each window is yielded newest
+                      first, but pages of different windows interleave
+
+        Returns:
+            Generator of entity dicts; on an AsyncClient an async
+            generator, for use with async for
+        """
+        if type(self).all is Resource.all:
+            raise NotImplementedError(
+                "{} has no list endpoint to iterate".format(type(self).__name__))
+        return self._iter_pages(lambda page: self.all(page, **kwargs), data, page_size, windows)
+
+    def _iter_pages(self, list_page, data, page_size, windows):
+        """
+        Iterator behind iter_all; list_page(params) fetches one page, so
+        resources whose all() takes a parent id pass it through here
+        """
+        params = {key: value for key, value in data.items() if key not in ('count', 'skip')}
+        page_size = min(page_size, MAX_PAGE_SIZE)
+        ranges = [params]
+        if windows > 1:
+            if 'from' not in params or 'to' not in params:
+                raise ValueError("windows needs both 'from' and 'to' in data")
+            ranges = [dict(params, **{'from': low, 'to': high})
+                      for low, high in split_window(int(params['from']), int(params['to']), windows)]
+        if inspect.iscoroutinefunction(self.client.request):
+            return self._async_pages(list_page, ranges, page_size)
+        return self._pages(list_page, ranges, page_size)
+
+    def _pages(self, list_page, ranges, page_size):
+        def fetch_page(window, skip):
+            return list_page(dict(window, count=page_size, skip=skip))['items']
+
+        executor = ThreadPoolExecutor(max_workers=len(ranges))
+        pending = {}
+        try:
+            for window in ranges:
+                pending[executor.submit(fetch_page, window, 0)] = (window, 0)
+            while pending:
+                wait(pending, return_when=FIRST_COMPLETED)
+                # the longest waiting page that is ready, so windows take turns
+                done = next(future for future in pending if future.done())
+                window, skip = pending.pop(done)
+                items = done.result()
+                if len(items) == page_size:
+                    skip += len(items)
+                    pending[executor.submit(fetch_page, window, skip)] = (window, skip)
+                yield from items
+        finally:
+            # A consumer that stops early must not wait on prefetches it
+            # will never read; requests already sent finish on their own
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _async_pages(self, list_page, ranges, page_size):
+        async def fetch_page(window, skip):
+            return (await list_page(dict(window, count=page_size, skip=skip)))['items']
+
+        pending = {}
+        try:
+            for window in ranges:
+                pending[asyncio.ensure_future(fetch_page(window, 0))] = (window, 0)
+            while pending:
+                await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                done = next(task for task in pending if task.done())
+                window, skip = pending.pop(done)
+                items = done.result()
+                if len(items) == page_size:
+                    skip += len(items)
+                    pending[asyncio.ensure_future(fetch_page(window, skip))] = (window, skip)
+                for item in items:
+                    yield item
+        finally:
+            for task in pending:
+                task.cancel()
+
     def fetch(self, id, data, **kwargs):
         url = "{}/{}".format(self.base_url, id)
         return self.get_url(url, data, **kwargs)
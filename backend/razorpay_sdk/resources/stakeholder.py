@@ -1,4 +1,4 @@
-from .base import Resource
+from .base import Resource, MAX_PAGE_SIZE
 from ..constants.url import URL
 
 
@@ -33,6 +33,19 @@ class Stakeholder(Resource):
 
         return self.get_url(url, data, **kwargs)
 
+    def iter_all(self, account_id, data={}, page_size=MAX_PAGE_SIZE, windows=1, **kwargs):
+        """
+        Yields every stakeholder of given account Id, as Resource.iter_all does
+
+        Args:
+            account_id : Id for which stakeholders have to be fetched
+
+        Returns:
+            Generator of stakeholder dicts
+        """
+        return self._iter_pages(lambda page: self.all(account_id, page, **kwargs),
+                                data, page_size, windows)
+
     def all(self, account_id, data={}, **kwargs):
         """
         Fetch all stakeholder
@@ -1,4 +1,4 @@
-from .base import Resource
+from .base import Resource, MAX_PAGE_SIZE
 from ..constants.url import URL
 
 
@@ -32,6 +32,19 @@ class Token(Resource):
         url = "{}/{}/tokens/{}".format(self.base_url, customer_id, token_id)
         return self.get_url(url, data, **kwargs)
 
+    def iter_all(self, customer_id, data={}, page_size=MAX_PAGE_SIZE, windows=1, **kwargs):
+        """
+        Yields every token of given customer Id, as Resource.iter_all does
+
+        Args:
+            customer_id : Id for which tokens have to be fetched
+
+        Returns:
+            Generator of token dicts
+        """
+        return self._iter_pages(lambda page: self.all(customer_id, page, **kwargs),
+                                data, page_size, windows)
+
     def all(self, customer_id, data={}, **kwargs):
         """
         Get all tokens for given customer Id
@@ -0,0 +1,159 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from backend import analytics, database, db_utils
+from backend.cache import cache
+from backend.config import Config
+
+
+class TestDashboardStats(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        db_utils.reset_connection_pools()
+        cache.clear()
+        self.path_patch = mock.patch.object(
+            Config, 'DATABASE_PATH', os.path.join(self.tmp_dir, 'test.db'))
+        self.path_patch.start()
+        database.initialize_database()
+        with db_utils.get_pooled_connection() as conn:
+            conn.executemany("INSERT INTO User (AccountType, Email, Name, Password) VALUES (?, ?, ?, 'x')",
+                             [('customer', f'user{n}@example.com', f'User {n}') for n in range(4)])
+            # Order BS1 spans two stores; TotalAmount is the whole order on every line
+            conn.executemany("""
+                INSERT INTO orders (StoreId, ItemId, CustomerId, Quantity, Price, ItemName,
+                                    OrderId, OrderStatus, OrderDate, OrderTime, TotalAmount)
+                VALUES (?, 1, ?, ?, ?, 'Item', ?, ?, '2024-06-01', '10:00:00', ?)
+            """, [
+                (1, 1, 2, 100, 'BS1', 'confirmed', 500),
+                (2, 1, 1, 300, 'BS1', 'confirmed', 500),
+                (1, 2, 1, 50, 'BS2', 'delivered', 50),
+                (1, 3, 1, 70, 'BS3', 'cancelled', 70),
+            ])
+            conn.commit()
+        for item in range(3):
+            database.add_to_inventory(1, 'Vendor', item, 'Item', '', None, 1, 10, 100)
+            database.insert_into_table_Store(1 + item % 2, item, 5, 100, 'Item')
+
+    def tearDown(self):
+        cache.clear()
+        db_utils.reset_connection_pools()
+        self.path_patch.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_global_stats_count_each_table_once(self):
+        self.assertEqual(analytics.get_dashboard_stats(), {
+            'total_orders': 3,
+            'total_revenue': 550,
+            'unique_customers': 3,
+            'total_users': 4,
+            'total_stores': 2,
+        })
+
+    def test_vendor_stats_are_not_multiplied_by_inventory(self):
+        self.assertEqual(database.get_dashboard_stats(vendor_id=1), {
+            'total_orders': 3,
+            'total_revenue': 250,
+            'unique_customers': 3,
+            'total_products': 3,
+            'total_inventory': 30,
+        })
+        self.assertEqual(analytics.get_vendor_stats(2)['total_revenue'], 300)
+        self.assertEqual(analytics.get_vendor_stats(9)['total_orders'], 0)
+
+
+class TestSalesRollups(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        db_utils.reset_connection_pools()
+        cache.clear()
+        self.path_patch = mock.patch.object(
+            Config, 'DATABASE_PATH', os.path.join(self.tmp_dir, 'test.db'))
+        self.path_patch.start()
+        database.initialize_database()
+        # Store 1 sells clothing (2) and home goods (3); store 2 only home goods
+        database.insert_into_table_Store(1, 1, 50, 500, 'Banarasi Saree', CategoryId=2)
+        database.insert_into_table_Store(1, 2, 50, 100, 'Brass Diya', CategoryId=3)
+        database.insert_into_table_Store(2, 1, 50, 300, 'Copper Bottle', CategoryId=3)
+        self.add_lines([
+            # OrderId, day, time, customer, store, item, quantity, price, status
+            ('BS1', '2024-06-01', '10:05:00', 7, 1, 1, 2, 500, 'confirmed'),
+            ('BS1', '2024-06-01', '10:05:00', 7, 1, 2, 1, 100, 'confirmed'),
+            ('BS1', '2024-06-01', '10:05:00', 7, 2, 1, 1, 300, 'confirmed'),
+            ('BS2', '2024-06-01', '18:30:00', 8, 1, 2, 3, 100, 'delivered'),
+            ('BS3', '2024-06-02', '09:00:00', 7, 1, 2, 1, 100, 'pending'),
+            ('BS4', '2024-07-15', '09:45:00', 8, 2, 1, 1, 300, 'cancelled'),
+        ])
+
+    def tearDown(self):
+        cache.clear()
+        db_utils.reset_connection_pools()
+        self.path_patch.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def add_lines(self, lines):
+        with db_utils.get_pooled_connection() as conn:
+            conn.executemany("""
+                INSERT INTO orders (OrderId, OrderDate, OrderTime, CustomerId, StoreId, ItemId,
+                                    Quantity, Price, OrderStatus, ItemName)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'Item')
+            """, lines)
+            conn.commit()
+
+    def rollups(self):
+        with db_utils.get_pooled_connection() as conn:
+            return {table: [tuple(row) for row in conn.execute(f"SELECT * FROM {table} ORDER BY 1, 2")]
+                    for table in ('sales_daily', 'sales_daily_totals', 'sales_hourly', 'sales_daily_customers')}
+
+    def test_triggers_agree_with_a_backfill(self):
+        database.update_order_status('BS3', 'cancelled')
+        maintained = self.rollups()
+        database.rebuild_sales_rollups()
+        self.assertEqual(self.rollups(), maintained)
+        database.rebuild_sales_rollups(since='2024-06-02')
+        self.assertEqual(self.rollups(), maintained)
+
+    def test_daily_rows(self):
+        rollups = self.rollups()
+        self.assertEqual(rollups['sales_daily'][:3], [
+            # Day, StoreId, CategoryId, Orders, Units, Revenue, Customers
+            ('2024-06-01', 1, 2, 1, 2, 1000, 1),
+            ('2024-06-01', 1, 3, 1, 4, 400, 1),
+            ('2024-06-01', 2, 3, 1, 1, 300, 1),
+        ])
+        self.assertEqual(rollups['sales_daily_totals'], [
+            ('2024-06-01', 2, 7, 1700, 2),
+            ('2024-06-02', 1, 1, 100, 1),
+            ('2024-07-15', 1, 0, 0, 1),
+        ])
+        self.assertIn(('2024-06-01 18', 1, 1, 3, 300), rollups['sales_hourly'])
+
+    def test_status_change_moves_units_and_revenue(self):
+        database.update_order_status('BS2', 'refunded')
+        totals = self.rollups()['sales_daily_totals'][0]
+        self.assertEqual(totals, ('2024-06-01', 2, 4, 1400, 2))
+
+    def test_admin_analytics(self):
+        report = analytics.get_admin_analytics('month', '2024-06-01', '2024-07-31')
+        self.assertEqual([(b['period'], b['orders'], b['revenue']) for b in report['series']],
+                         [('2024-06', 3, 1800), ('2024-07', 1, 0)])
+        self.assertEqual(report['totals'], {'orders': 4, 'units': 8, 'revenue': 1800})
+        self.assertEqual(report['top_categories'][0]['name'], 'Clothing')
+        self.assertEqual(report['top_stores'][0], {'store_id': 1, 'orders': 3, 'units': 7, 'revenue': 1500})
+        days = analytics.get_admin_analytics('day', end_date='2024-06-02')
+        self.assertEqual(days['start_date'], '2024-05-04')
+        self.assertEqual([b['period'] for b in days['series']], ['2024-06-01', '2024-06-02'])
+        with self.assertRaises(ValueError):
+            analytics.get_admin_analytics('fortnight')
+
+    def test_vendor_analytics(self):
+        report = database.get_vendor_analytics(1, '2024-06-01', '2024-06-30')
+        self.assertEqual(report['store_id'], 1)
+        self.assertEqual([(d['day'], d['orders'], d['customers']) for d in report['series']],
+                         [('2024-06-01', 2, 2), ('2024-06-02', 1, 1)])
+        self.assertEqual([c['category_id'] for c in report['categories']], [2, 3])
+        self.assertEqual([(h['hour'], h['orders']) for h in report['hourly']], [(9, 1), (10, 1), (18, 1)])
@@ -0,0 +1,23 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestAppFactory(unittest.TestCase):
+
+    def test_importing_create_app_touches_no_files(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir, ignore_errors=True)
+        subprocess.run([sys.executable, '-c', 'from backend.base import create_app'],
+                       cwd=tmp_dir, env=dict(os.environ, PYTHONPATH=REPO_DIR),
+                       check=True, capture_output=True)
+        self.assertEqual(os.listdir(tmp_dir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
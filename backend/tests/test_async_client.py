@@ -0,0 +1,119 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from backend.razorpay_sdk import AsyncClient
+from backend.razorpay_sdk.errors import BadRequestError, GatewayError, ServerError
+from backend.razorpay_sdk.registry import connection_stats
+
+ERRORS = {
+    'pay_bad': (400, 'BAD_REQUEST_ERROR'),
+    'pay_gateway': (502, 'GATEWAY_ERROR'),
+    'pay_down': (500, 'SERVER_ERROR'),
+}
+
+
+class MockRazorpayHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.peak = max(server.peak, server.in_flight)
+        time.sleep(0.02)
+        with server.lock:
+            server.in_flight -= 1
+            server.agents.add(self.headers['User-Agent'])
+
+        url = urlparse(self.path)
+        entity_id = url.path.rsplit('/', 1)[-1]
+        status, code = ERRORS.get(entity_id, (200, None))
+        if url.query:
+            # 250 payments listed newest first
+            query = {key: int(values[0]) for key, values in parse_qs(url.query).items()}
+            numbers = range(249 - query['skip'], max(249 - query['skip'] - query['count'], -1), -1)
+            items = [{'id': 'pay_{}'.format(n), 'entity': 'payment'} for n in numbers]
+            payload = {'entity': 'collection', 'count': len(items), 'items': items}
+        elif code:
+            payload = {'error': {'code': code, 'description': 'failed ' + entity_id}}
+        else:
+            payload = {'id': entity_id, 'entity': self.path.split('/')[-2][:-1]}
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestAsyncClient(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), MockRazorpayHandler)
+        self.server.lock = threading.Lock()
+        self.server.in_flight = self.server.peak = 0
+        self.server.agents = set()
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        self.base_url = 'http://127.0.0.1:{}'.format(self.server.server_port)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    async def test_resources_mirror_the_sync_client(self):
+        async with AsyncClient(auth=('key_id', 'key_secret'), base_url=self.base_url) as client:
+            payment, refund, settlement = await asyncio.gather(
+                client.payment.fetch('pay_1'), client.refund.fetch('rfnd_1'),
+                client.settlement.fetch('setl_1'))
+
+        self.assertEqual(payment, {'id': 'pay_1', 'entity': 'payment'})
+        self.assertEqual(refund['entity'], 'refund')
+        self.assertEqual(settlement['entity'], 'settlement')
+        self.assertTrue(self.server.agents.pop().startswith('Razorpay-Python/'))
+
+    async def test_errors_map_like_the_sync_client(self):
+        async with AsyncClient(auth=('key_id', 'key_secret'), base_url=self.base_url) as client:
+            results = await asyncio.gather(
+                *(client.payment.fetch(payment_id) for payment_id in ERRORS),
+                return_exceptions=True)
+
+        self.assertEqual([type(error) for error in results],
+                         [BadRequestError, GatewayError, ServerError])
+        self.assertEqual(str(results[0]), 'failed pay_bad')
+
+    async def test_concurrency_is_bounded_and_connections_shared(self):
+        client = AsyncClient(auth=('key_id', 'key_secret'), base_url=self.base_url,
+                             max_concurrency=3)
+        payments = await asyncio.gather(
+            *(client.payment.fetch('pay_{}'.format(n)) for n in range(12)))
+        stats = connection_stats(client.session)
+        await client.close()
+
+        self.assertEqual([payment['id'] for payment in payments],
+                         ['pay_{}'.format(n) for n in range(12)])
+        self.assertEqual(self.server.peak, 3)
+        self.assertEqual(stats['requests'], 12)
+        self.assertLessEqual(stats['connections'], 3)
+
+    async def test_iter_all_is_an_async_generator(self):
+        async with AsyncClient(auth=('key_id', 'key_secret'), base_url=self.base_url) as client:
+            payments = [payment['id'] async for payment in client.payment.iter_all()]
+
+            partial = client.payment.iter_all(page_size=10)
+            first = await partial.__anext__()
+            await partial.aclose()
+
+        self.assertEqual(payments, ['pay_{}'.format(n) for n in range(249, -1, -1)])
+        self.assertEqual(first['id'], 'pay_249')
+
+
+if __name__ == '__main__':
+    unittest.main()
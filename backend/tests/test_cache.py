@@ -0,0 +1,369 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from backend import database, db_utils
+from backend.cache import InMemoryCache, cache, cached, get_cache_stats, make_cache_key, product_tag
+from backend.config import Config
+
+
+class TestBoundedCache(unittest.TestCase):
+
+    def test_least_recently_used_entry_evicted(self):
+        cache = InMemoryCache(max_entries=2, shards=1)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.get_stats()['evictions'], 1)
+
+    def test_size_bound_evicts_until_within_budget(self):
+        cache = InMemoryCache(max_bytes=2000, shards=1)
+        for i in range(10):
+            cache.set(f'key:{i}', 'x' * 500)
+        stats = cache.get_stats()
+        self.assertLessEqual(stats['bytes'], 2000)
+        self.assertLess(stats['entries'], 10)
+        self.assertEqual(cache.get('key:9'), 'x' * 500)
+
+    def test_cleanup_only_removes_expired_entries(self):
+        cache = InMemoryCache()
+        now = time.time()
+        with mock.patch('backend.cache.time.time', return_value=now):
+            cache.set('short', 1, ttl=10)
+            cache.set('long', 2, ttl=300)
+            cache.set('forever', 3, ttl=0)
+            cache.set('gone', 4, ttl=10)
+            cache.set('short', 5, ttl=300)  # replaced entry must survive its old expiry
+        with mock.patch('backend.cache.time.time', return_value=now + 60):
+            self.assertEqual(cache.cleanup_expired(), 1)
+            self.assertEqual(cache.get('short'), 5)
+            self.assertEqual(cache.get('long'), 2)
+            self.assertEqual(cache.get('forever'), 3)
+            self.assertIsNone(cache.get('gone'))
+
+    def test_size_bound_applies_to_decorated_results(self):
+        bounded = InMemoryCache(max_bytes=20000, shards=1)
+
+        @cached(ttl=60, key_prefix='test_size:')
+        def listing(page):
+            return [{'name': f'Item {n}', 'description': 'x' * 100} for n in range(20)]
+
+        with mock.patch('backend.cache.cache', bounded):
+            for page in range(10):
+                listing(page)
+        stats = bounded.get_stats()
+        self.assertGreater(stats['bytes'], 5000)
+        self.assertLessEqual(stats['bytes'], 20000)
+        self.assertLess(stats['entries'], 10)
+        self.assertGreater(stats['evictions'], 0)
+
+    def test_stats_reported_per_named_cache(self):
+        stats = get_cache_stats()
+        for name in ('cache', 'categories_cache', 'products_cache', 'user_cache'):
+            self.assertIn(name, stats)
+            self.assertIn('hits', stats[name])
+            self.assertIn('evictions', stats[name])
+
+
+class TestShardedCache(unittest.TestCase):
+
+    def test_concurrent_misses_share_one_computation(self):
+        cache = InMemoryCache()
+        calls = []
+        release = threading.Event()
+
+        def factory():
+            calls.append(1)
+            release.wait(5)
+            return 'value'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_set('hot', factory)))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        while cache.get_stats()['single_flight_waits'] < 7:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['value'] * 8)
+
+    def test_slow_factory_does_not_block_other_keys(self):
+        cache = InMemoryCache(shards=1)
+        cache.set('other', 1)
+        started = threading.Event()
+        release = threading.Event()
+
+        def factory():
+            started.set()
+            release.wait(5)
+            return 'slow'
+
+        thread = threading.Thread(target=cache.get_or_set, args=('slow', factory))
+        thread.start()
+        started.wait(5)
+        self.assertEqual(cache.get('other'), 1)
+        cache.set('another', 2)
+        release.set()
+        thread.join()
+        self.assertEqual(cache.get('slow'), 'slow')
+
+    def test_factory_error_reaches_waiters_and_is_not_cached(self):
+        cache = InMemoryCache()
+
+        def factory():
+            raise RuntimeError('boom')
+
+        with self.assertRaises(RuntimeError):
+            cache.get_or_set('key', factory)
+        self.assertEqual(cache.get_or_set('key', lambda: 'ok'), 'ok')
+
+
+class TestCachedDecorator(unittest.TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_none_results_not_cached_by_default(self):
+        calls = []
+
+        @cached(ttl=60, key_prefix='test_default:')
+        def lookup(product_id):
+            calls.append(product_id)
+            return None
+
+        lookup(1)
+        lookup(1)
+        self.assertEqual(calls, [1, 1])
+
+    def test_negative_results_cached_with_their_own_ttl(self):
+        calls = []
+
+        @cached(ttl=300, key_prefix='test_negative:', negative_ttl=5)
+        def lookup(product_id):
+            calls.append(product_id)
+            return None
+
+        now = time.time()
+        with mock.patch('backend.cache.time.time', return_value=now):
+            self.assertIsNone(lookup(1))
+            self.assertIsNone(lookup(1))
+        self.assertEqual(calls, [1])
+        with mock.patch('backend.cache.time.time', return_value=now + 10):
+            lookup(1)
+        self.assertEqual(calls, [1, 1])
+
+    def test_stale_value_served_while_refreshing(self):
+        version = [0]
+        refreshed = threading.Event()
+
+        @cached(ttl=10, key_prefix='test_swr:', stale_ttl=60)
+        def categories():
+            version[0] += 1
+            if version[0] > 1:
+                refreshed.set()
+            return version[0]
+
+        now = time.time()
+        with mock.patch('backend.cache.time.time', return_value=now):
+            self.assertEqual(categories(), 1)
+        with mock.patch('backend.cache.time.time', return_value=now + 20):
+            self.assertEqual(categories(), 1)
+            self.assertTrue(refreshed.wait(5))
+            for _ in range(100):
+                if categories() == 2:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(categories(), 2)
+
+    def test_invalidation_during_background_refresh_is_not_overwritten(self):
+        version = [0]
+        computing, release, stored = threading.Event(), threading.Event(), []
+        real_set = cache.set
+
+        @cached(ttl=10, key_prefix='test_swr_tags:', stale_ttl=60, tags=('store:1',))
+        def listing():
+            version[0] += 1
+            if version[0] == 2:
+                computing.set()
+                release.wait(5)
+            return version[0]
+
+        def recording_set(*args, **kwargs):
+            stored.append(real_set(*args, **kwargs))
+
+        now = time.time()
+        with mock.patch('backend.cache.time.time', return_value=now):
+            self.assertEqual(listing(), 1)
+        with mock.patch('backend.cache.time.time', return_value=now + 20), \
+                mock.patch.object(cache, 'set', side_effect=recording_set):
+            self.assertEqual(listing(), 1)
+            self.assertTrue(computing.wait(5))
+            # an update lands while the refresh still holds data read before it
+            cache.invalidate_tags('store:1')
+            release.set()
+            for _ in range(500):
+                if stored:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(stored, [False])
+            self.assertEqual(listing(), 3)
+
+    def test_early_expiry_refreshes_before_ttl(self):
+        calls = []
+
+        @cached(ttl=10, key_prefix='test_early:', early_expiry_beta=1.0)
+        def slow():
+            calls.append(1)
+            return 'value'
+
+        slow()
+        result = cache.get(slow.cache_key())
+        result.compute_time = 100.0  # an expensive computation close to expiry
+        with mock.patch('backend.cache.random.random', return_value=0.5):
+            slow()
+        self.assertEqual(len(calls), 2)
+
+
+class TestCacheKeys(unittest.TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_dict_arguments_ignore_insertion_order(self):
+        first = make_cache_key('products', [{'category': 3, 'sort': 'price'}])
+        second = make_cache_key('products', [{'sort': 'price', 'category': 3}])
+        self.assertEqual(first, second)
+
+    def test_argument_types_and_boundaries_do_not_collide(self):
+        keys = {
+            make_cache_key('f', (1,)),
+            make_cache_key('f', ('1',)),
+            make_cache_key('f', ('a:b',)),
+            make_cache_key('f', ('a', 'b')),
+            make_cache_key('product', (1,)),
+            make_cache_key('product', (12,)),
+        }
+        self.assertEqual(len(keys), 6)
+
+    def test_long_arguments_hashed_to_fixed_size(self):
+        short = make_cache_key('search', [{'q': 'lamp'}])
+        long = make_cache_key('search', [{'q': 'lamp', 'tags': list(range(500))}])
+        self.assertIn('lamp', short)
+        self.assertLess(len(long), 120)
+
+    def test_explicit_key_callable(self):
+        calls = []
+
+        @cached(ttl=60, key_prefix='test_key:', key=lambda user_id, request_id: user_id)
+        def profile(user_id, request_id):
+            calls.append(request_id)
+            return {'id': user_id}
+
+        profile(1, 'a')
+        profile(1, 'b')
+        self.assertEqual(calls, ['a'])
+        profile.invalidate(1, 'c')
+        profile(1, 'd')
+        self.assertEqual(calls, ['a', 'd'])
+
+    def test_version_bump_misses_old_entries(self):
+        calls = []
+
+        @cached(ttl=60, key_prefix='test_version:')
+        def categories():
+            calls.append(1)
+            return ['Textiles']
+
+        categories()
+        with mock.patch.object(Config, 'CACHE_KEY_VERSION', '2'):
+            categories()
+        self.assertEqual(len(calls), 2)
+
+class TestTagInvalidation(unittest.TestCase):
+
+    def test_tag_removes_only_tagged_entries(self):
+        cache = InMemoryCache()
+        cache.set('product:1', 'lamp', tags=['product:1'])
+        cache.set('product:12', 'saree', tags=['product:12'])
+        cache.set('listing:7', ['lamp'], tags=['store:7', 'product:1'])
+        self.assertEqual(cache.invalidate_tags('product:1'), 2)
+        self.assertIsNone(cache.get('product:1'))
+        self.assertIsNone(cache.get('listing:7'))
+        self.assertEqual(cache.get('product:12'), 'saree')
+        self.assertEqual(cache.get_stats()['invalidations'], 2)
+
+    def test_evicted_entries_leave_no_tag_references(self):
+        cache = InMemoryCache(max_entries=1, shards=1)
+        cache.set('a', 1, tags=['t'])
+        cache.set('b', 2)
+        self.assertEqual(cache.invalidate_tags('t'), 0)
+        self.assertEqual(cache.get('b'), 2)
+
+    def test_invalidation_during_computation_is_not_overwritten(self):
+        cache = InMemoryCache()
+
+        def factory():
+            cache.invalidate_tags('store:1')
+            return 'stale'
+
+        self.assertEqual(cache.get_or_set('listing', factory, tags=['store:1']), 'stale')
+        self.assertIsNone(cache.get('listing'))
+
+
+class TestVendorWritesInvalidateListings(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        db_utils.reset_connection_pools()
+        cache.clear()
+        self.path_patch = mock.patch.object(
+            Config, 'DATABASE_PATH', os.path.join(self.tmp_dir, 'test.db'))
+        self.path_patch.start()
+        database.create_categories_table()
+        database.create_store_table()
+        database.create_inventory_table()
+        database.insert_into_table_Store(1, 1, 5, 100, 'Brass Lamp', CategoryId=3)
+        database.insert_into_table_Store(2, 1, 5, 80, 'Brass Bell', CategoryId=3)
+
+    def tearDown(self):
+        cache.clear()
+        db_utils.reset_connection_pools()
+        self.path_patch.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_updateitem_refreshes_only_its_store(self):
+        self.assertEqual(database.select_store_items(1)[0]['ItemName'], 'Brass Lamp')
+        database.select_store_items(2)
+        self.assertTrue(database.updateitem(1, 1, 'Brass Diya', 5, 120))
+        self.assertEqual(database.select_store_items(1)[0]['ItemName'], 'Brass Diya')
+        self.assertIsNotNone(cache.get(database.select_store_items.cache_key(2)))
+
+    def test_product_tags_are_per_store(self):
+        cache.set('lamp', 'Brass Lamp', tags=[product_tag(1, 1)])
+        cache.set('bell', 'Brass Bell', tags=[product_tag(2, 1)])
+        self.assertTrue(database.updateitem(1, 1, 'Brass Diya', 5, 120))
+        self.assertIsNone(cache.get('lamp'))
+        self.assertEqual(cache.get('bell'), 'Brass Bell')
+
+    def test_delete_store_item_hides_item(self):
+        self.assertEqual(len(database.select_store_items(1, category_id=3)), 1)
+        self.assertTrue(database.delete_store_item(1, 1))
+        self.assertEqual(database.select_store_items(1, category_id=3), [])
+        self.assertFalse(database.delete_store_item(99, 1))
+
+    def test_inventory_quantity_update_refreshes_vendor_listing(self):
+        database.add_to_inventory(7, 'Vendor', 1, 'Brass Lamp', '', None, 1, 5, 100)
+        database.retrieve_data_from_inventory(7)
+        self.assertTrue(database.update_inventory_quantity(7, 1, 2))
+        self.assertIn('"Quantity": 2', database.retrieve_data_from_inventory(7))
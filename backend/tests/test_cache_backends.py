@@ -0,0 +1,241 @@
+import fnmatch
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from backend.cache import InMemoryCache
+from backend.cache_backends import CacheBackend, RedisCacheBackend, SQLiteCacheBackend
+
+try:
+    import fakeredis
+except ImportError:  # pragma: no cover
+    fakeredis = None
+
+
+class InProcessRedisServer:
+    """
+    The slice of a Redis server RedisCacheBackend uses: strings with expiry,
+    sets and pub/sub, shared by every InProcessRedis client created on it.
+    Stands in for fakeredis when it is not installed.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.strings = {}
+        self.sets = {}
+        self.subscribers = {}
+
+
+def _name(key):
+    return key.decode() if isinstance(key, bytes) else key
+
+
+class InProcessRedis:
+    """A client of an InProcessRedisServer; replies are bytes, as from redis-py"""
+
+    def __init__(self, server):
+        self.server = server
+
+    def get(self, key):
+        with self.server.lock:
+            data, expires_at = self.server.strings.get(_name(key), (None, None))
+            if expires_at is not None and expires_at <= time.time():
+                del self.server.strings[_name(key)]
+                return None
+            return data
+
+    def set(self, key, data, px=None):
+        with self.server.lock:
+            self.server.strings[_name(key)] = (data, time.time() + px / 1000 if px else None)
+        return True
+
+    def sadd(self, key, *members):
+        with self.server.lock:
+            members = {_name(member) for member in members}
+            added = members - self.server.sets.setdefault(_name(key), set())
+            self.server.sets[_name(key)] |= members
+            return len(added)
+
+    def smembers(self, key):
+        with self.server.lock:
+            return {member.encode() for member in self.server.sets.get(_name(key), ())}
+
+    def delete(self, *keys):
+        with self.server.lock:
+            return sum(self.server.strings.pop(_name(key), None) is not None or
+                       self.server.sets.pop(_name(key), None) is not None for key in keys)
+
+    def scan_iter(self, match='*'):
+        with self.server.lock:
+            names = list(self.server.strings) + list(self.server.sets)
+        return [name.encode() for name in names if fnmatch.fnmatchcase(name, match)]
+
+    def publish(self, channel, message):
+        message = message.encode() if isinstance(message, str) else message
+        with self.server.lock:
+            inboxes = list(self.server.subscribers.get(channel, ()))
+        for inbox in inboxes:
+            inbox.put({'type': 'message', 'channel': channel.encode(), 'data': message})
+        return len(inboxes)
+
+    def pipeline(self):
+        return InProcessPipeline(self)
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return InProcessPubSub(self.server)
+
+
+class InProcessPipeline:
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, command):
+        def queue_command(*args, **kwargs):
+            self.commands.append((getattr(self.client, command), args, kwargs))
+            return self
+        return queue_command
+
+    def execute(self):
+        commands, self.commands = self.commands, []
+        return [command(*args, **kwargs) for command, args, kwargs in commands]
+
+
+class InProcessPubSub:
+
+    def __init__(self, server):
+        self.server = server
+        self.inbox = queue.Queue()
+
+    def subscribe(self, channel):
+        with self.server.lock:
+            self.server.subscribers.setdefault(channel, []).append(self.inbox)
+
+    def get_message(self, timeout=0.0):
+        try:
+            return self.inbox.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class SharedBackendContract:
+    """Two caches with the same name stand in for two worker processes"""
+
+    def make_backend(self):
+        raise NotImplementedError
+
+    def deliver(self, backend):
+        """Process pending broadcasts for a worker"""
+
+    def setUp(self):
+        self.backend_a = self.make_backend()
+        self.backend_b = self.make_backend()
+        self.worker_a = InMemoryCache('products_cache', backend=self.backend_a)
+        self.worker_b = InMemoryCache('products_cache', backend=self.backend_b)
+
+    def test_entry_set_by_one_worker_is_a_hit_in_another(self):
+        self.worker_a.set('product:1', {'name': 'Brass Lamp'}, ttl=60, tags=['product:1'])
+        self.assertEqual(self.worker_b.get('product:1'), {'name': 'Brass Lamp'})
+        self.assertEqual(self.worker_b.get_or_set('product:1', lambda: 'recomputed'),
+                         {'name': 'Brass Lamp'})
+
+    def test_tag_invalidation_reaches_other_workers(self):
+        self.worker_a.set('listing:7', ['lamp'], ttl=60, tags=['store:7'])
+        self.assertEqual(self.worker_b.get('listing:7'), ['lamp'])
+        self.worker_a.invalidate_tags('store:7')
+        self.deliver(self.backend_b)
+        self.assertIsNone(self.worker_b._shard('listing:7').lookup('listing:7'))
+        self.assertIsNone(self.worker_b.get('listing:7'))
+
+    def test_delete_reaches_other_workers(self):
+        self.worker_a.set('user:1', 'Asha', ttl=60)
+        self.assertEqual(self.worker_b.get('user:1'), 'Asha')
+        self.worker_a.delete('user:1')
+        self.deliver(self.backend_b)
+        self.assertIsNone(self.worker_b.get('user:1'))
+
+    def test_clear_reaches_other_workers(self):
+        self.worker_a.set('product:1', 'lamp', ttl=60, tags=['store:7'])
+        self.assertEqual(self.worker_b.get('product:1'), 'lamp')
+        self.worker_a.clear()
+        self.deliver(self.backend_b)
+        self.assertIsNone(self.worker_b.get('product:1'))
+
+    def test_other_namespaces_are_untouched(self):
+        other = InMemoryCache('user_cache', backend=self.backend_b)
+        other.set('store:7', 'kept', ttl=60, tags=['store:7'])
+        self.worker_a.invalidate_tags('store:7')
+        self.deliver(self.backend_b)
+        self.assertEqual(other.get('store:7'), 'kept')
+
+
+class TestSQLiteCacheBackend(SharedBackendContract, unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'cache.db')
+        super().setUp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def make_backend(self):
+        # Events are delivered by explicit polls rather than the background thread
+        return SQLiteCacheBackend(self.path, poll_interval=3600)
+
+    def deliver(self, backend):
+        backend.poll()
+
+    def test_expired_entries_are_not_shared(self):
+        self.worker_a.set('short', 'value', ttl=60)
+        self.backend_a._connection().execute("UPDATE cache_entries SET ExpiresAt = 0")
+        self.assertIsNone(self.backend_b.get('products_cache', 'short'))
+        self.assertEqual(self.backend_a.cleanup_expired(), 1)
+
+
+class TestRedisCacheBackend(SharedBackendContract, unittest.TestCase):
+    """Against fakeredis when it is installed, otherwise the in-process stand-in"""
+
+    def setUp(self):
+        self.server = fakeredis.FakeServer() if fakeredis else InProcessRedisServer()
+        super().setUp()
+
+    def make_backend(self):
+        if fakeredis:
+            return RedisCacheBackend(client=fakeredis.FakeRedis(server=self.server))
+        return RedisCacheBackend(client=InProcessRedis(self.server))
+
+    def deliver(self, backend):
+        # The listener thread delivers asynchronously; wait for the broadcast
+        for _ in range(100):
+            if backend.stats['received']:
+                return
+            time.sleep(0.01)
+
+
+class FailingBackend(CacheBackend):
+
+    def _start_listener(self):
+        pass
+
+    def _fail(self, *args):
+        raise ConnectionError("backend down")
+
+    get = set = delete = invalidate_tags = clear = _fail
+
+
+class TestBackendFailure(unittest.TestCase):
+
+    def test_cache_keeps_working_locally(self):
+        backend = FailingBackend()
+        cache = InMemoryCache('products_cache', backend=backend)
+        cache.set('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get_or_set('b', lambda: 2), 2)
+        self.assertEqual(cache.invalidate_tags('x'), 0)
+        self.assertGreater(backend.stats['errors'], 0)
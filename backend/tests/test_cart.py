@@ -0,0 +1,174 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from flask_jwt_extended import create_access_token
+
+from backend import database, db_utils
+from backend.base import create_app
+from backend.cache import cache
+from backend.config import Config
+
+
+class CartTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        db_utils.reset_connection_pools()
+        cache.clear()
+        self.path_patch = mock.patch.object(
+            Config, 'DATABASE_PATH', os.path.join(self.tmp_dir, 'test.db'))
+        self.path_patch.start()
+        database.initialize_database()
+        with db_utils.get_pooled_connection() as conn:
+            conn.execute("INSERT INTO User (UserId, AccountType, Email, Name, Password) "
+                         "VALUES (1, 'customer', 'asha@example.com', 'Asha', 'x')")
+            conn.commit()
+        database.insert_into_table_Store(1, 1, 5, 1500, 'Banarasi Silk Saree')
+        database.insert_into_table_Store(1, 2, 2, 300, 'Brass Diya')
+
+    def tearDown(self):
+        cache.clear()
+        db_utils.reset_connection_pools()
+        self.path_patch.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def cart(self):
+        return {(item['StoreId'], item['ItemId']): item['Quantity'] for item in database.select_user_cart(1)}
+
+
+class TestCartUpserts(CartTestCase):
+
+    def test_upsert_adds_then_accumulates_within_stock(self):
+        first = database.upsert_cart_item(1, 1, 1, 2)
+        second = database.upsert_cart_item(1, 1, 1, 3)
+        self.assertEqual(first['cart_id'], second['cart_id'])
+        self.assertEqual(second['quantity'], 5)
+
+        with self.assertRaises(database.CartError) as raised:
+            database.upsert_cart_item(1, 1, 1, 1)
+        self.assertEqual((raised.exception.reason, raised.exception.available), ('insufficient_stock', 5))
+        self.assertEqual(self.cart(), {(1, 1): 5})
+
+    def test_replace_sets_quantity_and_unknown_items_are_refused(self):
+        database.upsert_cart_item(1, 1, 1, 4)
+        self.assertEqual(database.upsert_cart_item(1, 1, 1, 1, replace=True)['quantity'], 1)
+        with self.assertRaises(database.CartError) as raised:
+            database.upsert_cart_item(1, 1, 9, 1)
+        self.assertEqual(raised.exception.reason, 'not_found')
+
+    def test_set_and_remove_check_ownership_and_stock(self):
+        cart_id = database.upsert_cart_item(1, 1, 2, 1)['cart_id']
+        self.assertEqual(database.set_cart_item_quantity(1, cart_id, 2), 2)
+        with self.assertRaises(database.CartError) as raised:
+            database.set_cart_item_quantity(1, cart_id, 3)
+        self.assertEqual(raised.exception.reason, 'insufficient_stock')
+        with self.assertRaises(database.CartError) as raised:
+            database.set_cart_item_quantity(2, cart_id, 1)
+        self.assertEqual(raised.exception.reason, 'not_found')
+
+        self.assertFalse(database.remove_cart_item(2, cart_id))
+        self.assertTrue(database.remove_cart_item(1, cart_id))
+        self.assertEqual(self.cart(), {})
+
+
+class TestCartEndpoints(CartTestCase):
+
+    def setUp(self):
+        super().setUp()
+        with mock.patch.object(Config, 'UPLOAD_FOLDER', self.tmp_dir):
+            self.app = create_app()
+        self.app.config['TESTING'] = True
+        self.app.config['RATELIMIT_ENABLED'] = False
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            token = create_access_token(identity='1')
+        self.headers = {'Authorization': f'Bearer {token}'}
+
+    def test_add_reports_missing_products_and_short_stock(self):
+        response = self.client.post('/v1/cart/add', headers=self.headers,
+                                    json={'storeId': 1, 'productId': 2, 'quantity': 2})
+        self.assertEqual(response.get_json()['data']['quantity'], 2)
+        response = self.client.post('/v1/cart/add', headers=self.headers,
+                                    json={'storeId': 1, 'productId': 2, 'quantity': 1})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/v1/cart/add', headers=self.headers,
+                                    json={'storeId': 1, 'productId': 9})
+        self.assertEqual(response.status_code, 404)
+
+    def test_add_without_store_keeps_the_product_only_contract(self):
+        response = self.client.post('/v1/cart/add', headers=self.headers,
+                                    json={'productId': 1, 'quantity': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.cart(), {(1, 1): 2})
+
+        database.insert_into_table_Store(2, 1, 5, 1400, 'Banarasi Silk Saree')
+        response = self.client.post('/v1/cart/add', headers=self.headers, json={'productId': 1})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/v1/cart/add', headers=self.headers, json={'productId': 9})
+        self.assertEqual(response.status_code, 404)
+
+    def test_checked_out_lines_are_reported_as_such(self):
+        database.upsert_cart_item(1, 1, 2, 1)
+        database.add_order_id(1, 'order_1')
+        response = self.client.post('/v1/cart/add', headers=self.headers,
+                                    json={'storeId': 1, 'productId': 2})
+        self.assertEqual(response.status_code, 409)
+
+        response = self.client.post('/v1/cart/batch', headers=self.headers, json={'operations': [
+            {'storeId': 1, 'productId': 2, 'quantity': 1},
+        ]})
+        self.assertEqual(response.get_json()['data'][0]['status'], 'checked_out')
+
+    def test_cart_batch_applies_each_operation_and_reports_it(self):
+        database.upsert_cart_item(1, 1, 2, 1)
+        response = self.client.post('/v1/cart/batch', headers=self.headers, json={'operations': [
+            {'storeId': 1, 'productId': 1, 'quantity': 2},
+            {'storeId': 1, 'productId': 2, 'quantity': 2},
+            {'op': 'set', 'storeId': 1, 'productId': 1, 'quantity': 4},
+            {'op': 'remove', 'storeId': 1, 'productId': 2},
+            {'op': 'remove', 'storeId': 1, 'productId': 2},
+            {'storeId': 1, 'productId': 9},
+            {'op': 'add', 'storeId': 1, 'productId': 1, 'quantity': 0},
+        ]})
+        results = response.get_json()['data']
+        self.assertEqual([result['status'] for result in results],
+                         ['ok', 'insufficient_stock', 'ok', 'ok', 'not_found', 'not_found', 'invalid'])
+        self.assertEqual(results[1]['available'], 2)
+        self.assertEqual(results[2]['quantity'], 4)
+        self.assertEqual(self.cart(), {(1, 1): 4})
+
+        response = self.client.post('/v1/cart/batch', headers=self.headers, json={'operations': []})
+        self.assertEqual(response.status_code, 400)
+
+    def test_batch_accepts_numeric_string_ids(self):
+        response = self.client.post('/v1/cart/batch', headers=self.headers, json={'operations': [
+            {'storeId': '1', 'productId': '1', 'quantity': 2},
+            {'storeId': 1, 'productId': 'two', 'quantity': 1},
+            {'storeId': True, 'productId': 2, 'quantity': 1},
+            {'storeId': 1.5, 'productId': 2, 'quantity': 1},
+        ]})
+        results = response.get_json()['data']
+        self.assertEqual([result['status'] for result in results], ['ok', 'invalid', 'invalid', 'invalid'])
+        self.assertEqual((results[0]['store_id'], results[0]['item_id']), (1, 1))
+        self.assertEqual(self.cart(), {(1, 1): 2})
+
+    def test_wishlist_batch(self):
+        response = self.client.post('/v1/wishlist/batch', headers=self.headers, json={'operations': [
+            {'storeId': 1, 'productId': 1},
+            {'storeId': 1, 'productId': 1},
+            {'storeId': 1, 'productId': 2},
+            {'op': 'remove', 'storeId': 1, 'productId': 2},
+            {'storeId': 1, 'productId': 9},
+            {'op': 'set', 'storeId': 1, 'productId': 1},
+        ]})
+        self.assertEqual([result['status'] for result in response.get_json()['data']],
+                         ['ok', 'exists', 'ok', 'ok', 'not_found', 'invalid'])
+        self.assertEqual([(item['ItemId'], item['ItemName']) for item in database.get_user_wishlist(1)],
+                         [(1, 'Banarasi Silk Saree')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from backend import database, db_utils
+from backend.base import create_app
+from backend.cache import cache, categories_cache
+from backend.config import Config
+
+
+class TestCategoryTree(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        db_utils.reset_connection_pools()
+        cache.clear()
+        categories_cache.clear()
+        self.path_patch = mock.patch.object(
+            Config, 'DATABASE_PATH', os.path.join(self.tmp_dir, 'test.db'))
+        self.path_patch.start()
+        database.initialize_database()
+        # Category 2 is Clothing (कपड़े)
+        self.sarees = database.create_category('Sarees', 'Silk and cotton sarees', 2, 'साड़ियाँ')
+
+    def tearDown(self):
+        cache.clear()
+        categories_cache.clear()
+        db_utils.reset_connection_pools()
+        self.path_patch.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_tree_nests_children_with_hindi_names(self):
+        roots = database.get_category_tree()['categories']
+        self.assertEqual(len(roots), 10)
+        clothing = next(node for node in roots if node['category_id'] == 2)
+        self.assertEqual(clothing['name_hindi'], 'कपड़े')
+        self.assertEqual([(child['name'], child['name_hindi']) for child in clothing['children']],
+                         [('Sarees', 'साड़ियाँ')])
+        self.assertEqual(database.get_categories(parent_id=2), clothing['children'])
+        self.assertEqual(database.get_category_by_id(self.sarees)['parent_id'], 2)
+
+    def test_tree_is_cached_until_a_category_write(self):
+        tree = database.get_category_tree()
+        self.assertIs(database.get_category_tree(), tree)
+
+        self.assertTrue(database.update_category(2, 'Apparel', is_active=True))
+        renamed = database.get_category_tree()
+        self.assertNotEqual(renamed['version'], tree['version'])
+        self.assertEqual(renamed['nodes'][2]['name'], 'Apparel')
+        self.assertEqual(renamed['nodes'][2]['name_hindi'], 'कपड़े')
+
+        self.assertTrue(database.update_category(2, 'Apparel', is_active=False))
+        self.assertNotIn(self.sarees, database.get_category_tree()['nodes'])
+        self.assertIn(self.sarees, database.get_category_tree(include_inactive=True)['nodes'])
+        self.assertEqual(database.create_category('Sarees'), -1)
+
+    def test_endpoint_serves_etag_and_not_modified(self):
+        with mock.patch.object(Config, 'UPLOAD_FOLDER', self.tmp_dir):
+            app = create_app()
+        app.config['TESTING'] = True
+        app.config['RATELIMIT_ENABLED'] = False
+        client = app.test_client()
+
+        response = client.get('/v1/categories')
+        etag = response.headers['ETag']
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(etag.startswith('W/'))
+        self.assertEqual(len(response.get_json()['data']), 10)
+
+        response = client.get('/v1/categories', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+
+        database.create_category('Kurtas', parent_id=2, name_hindi='कुर्ते')
+        response = client.get('/v1/categories', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from flask_jwt_extended import create_access_token
+
+from backend import database, db_utils
+from backend.base import create_app
+from backend.cache import cache
+from backend.config import Config
+
+
+class CheckoutTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        db_utils.reset_connection_pools()
+        cache.clear()
+        self.path_patch = mock.patch.object(
+            Config, 'DATABASE_PATH', os.path.join(self.tmp_dir, 'test.db'))
+        self.path_patch.start()
+        database.initialize_database()
+        with db_utils.get_pooled_connection() as conn:
+            conn.executemany("INSERT INTO User (UserId, AccountType, Email, Name, Password) "
+                             "VALUES (?, 'customer', ?, 'Customer', 'x')",
+                             [(n, f'customer{n}@example.com') for n in range(1, 9)])
+            conn.commit()
+        database.insert_into_table_Store(1, 1, 5, 1500, 'Banarasi Silk Saree', CategoryId=2)
+        database.insert_into_table_Store(1, 2, 2, 300, 'Brass Diya', CategoryId=3)
+
+    def tearDown(self):
+        cache.clear()
+        db_utils.reset_connection_pools()
+        self.path_patch.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def stock(self, item_id):
+        with db_utils.get_read_connection() as conn:
+            return conn.execute("SELECT Quantity FROM Store WHERE StoreId = 1 AND ItemId = ?",
+                                (item_id,)).fetchone()[0]
+
+    def order_lines(self, order_id):
+        with db_utils.get_read_connection() as conn:
+            return conn.execute("SELECT * FROM orders WHERE OrderId = ? ORDER BY ItemId",
+                                (order_id,)).fetchall()
+
+
+class TestCheckout(CheckoutTestCase):
+
+    def test_checkout_takes_stock_writes_lines_and_empties_cart(self):
+        database.insert_into_table_cart(1, 1, 1, 2, 1500, 'Banarasi Silk Saree')
+        database.insert_into_table_cart(1, 2, 1, 1, 300, 'Brass Diya')
+        order = database.checkout_cart(1, delivery_address='Jaipur')
+
+        self.assertEqual(order['total_amount'], 3300)
+        lines = self.order_lines(order['order_id'])
+        self.assertEqual([line['Quantity'] for line in lines], [2, 1])
+        self.assertEqual({line['TotalAmount'] for line in lines}, {3300})
+        self.assertRegex(lines[0]['OrderTime'], r'^\d\d:\d\d:\d\d$')
+        self.assertEqual((self.stock(1), self.stock(2)), (3, 1))
+        self.assertEqual(database.select_user_cart(1), [])
+
+    def test_short_line_rolls_back_the_whole_checkout(self):
+        database.insert_into_table_cart(1, 1, 1, 1, 1500, 'Banarasi Silk Saree')
+        database.insert_into_table_cart(1, 2, 1, 3, 300, 'Brass Diya')
+        with self.assertRaises(database.CheckoutError) as raised:
+            database.checkout_cart(1)
+
+        self.assertEqual(raised.exception.items,
+                         [{'store_id': 1, 'item_id': 2, 'requested': 3, 'available': 2}])
+        self.assertEqual((self.stock(1), self.stock(2)), (5, 2))
+        self.assertEqual(len(database.select_user_cart(1)), 2)
+        with self.assertRaises(database.CheckoutError):
+            database.checkout_cart(2)
+
+    def test_concurrent_checkouts_never_oversell(self):
+        for customer in range(1, 9):
+            database.insert_into_table_cart(1, 2, customer, 1, 300, 'Brass Diya')
+        placed, refused = [], []
+
+        def checkout(customer):
+            try:
+                placed.append(database.checkout_cart(customer))
+            except database.CheckoutError:
+                refused.append(customer)
+
+        threads = [threading.Thread(target=checkout, args=(customer,)) for customer in range(1, 9)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual((len(placed), len(refused)), (2, 6))
+        self.assertEqual(self.stock(2), 0)
+
+    def test_cancel_checkout_returns_stock_and_cart(self):
+        database.insert_into_table_cart(1, 1, 1, 2, 1500, 'Banarasi Silk Saree')
+        order = database.checkout_cart(1)
+        self.assertTrue(database.cancel_checkout(order['order_id']))
+
+        self.assertEqual(self.stock(1), 5)
+        self.assertEqual({line['OrderStatus'] for line in self.order_lines(order['order_id'])}, {'cancelled'})
+        self.assertEqual([item['Quantity'] for item in database.select_user_cart(1)], [2])
+
+    def test_update_cart_moves_tagged_items(self):
+        database.insert_into_table_cart(1, 1, 1, 1, 1500, 'Banarasi Silk Saree')
+        database.add_order_id(1, 'BS1')
+        database.update_cart('BS1', 'confirmed', 'Jaipur')
+
+        self.assertEqual(len(self.order_lines('BS1')), 1)
+        self.assertEqual(self.stock(1), 4)
+        with db_utils.get_read_connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM cart").fetchone()[0], 0)
+
+
+class TestCreateOrderEndpoint(CheckoutTestCase):
+
+    def setUp(self):
+        super().setUp()
+        database.insert_into_table_cart(1, 1, 1, 2, 1500, 'Banarasi Silk Saree')
+        with mock.patch.object(Config, 'UPLOAD_FOLDER', self.tmp_dir):
+            self.app = create_app()
+        self.app.config['TESTING'] = True
+        self.app.config['RATELIMIT_ENABLED'] = False
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            self.headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+        self.razorpay = mock.Mock()
+        for target, value in (('backend.orders.get_razorpay_client', mock.Mock(return_value=self.razorpay)),
+                              ('backend.database.get_user_address', mock.Mock(return_value={'id': 1}))):
+            patch = mock.patch(target, value, create=True)
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def place_order(self):
+        return self.client.post('/v1/orders', json={'shipping_address_id': 1}, headers=self.headers)
+
+    def assert_checkout_undone(self):
+        self.assertEqual(self.stock(1), 5)
+        self.assertEqual([item['Quantity'] for item in database.select_user_cart(1)], [2])
+
+    def test_payment_order_recorded(self):
+        self.razorpay.order.create.return_value = {'id': 'order_1'}
+        response = self.place_order()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['data']['razorpay_order_id'], 'order_1')
+        with db_utils.get_read_connection() as conn:
+            self.assertEqual(conn.execute("SELECT TransactionId FROM payments").fetchall()[0][0], 'order_1')
+        self.assertEqual(self.stock(1), 3)
+
+    def test_razorpay_failure_gives_stock_and_cart_back(self):
+        self.razorpay.order.create.side_effect = RuntimeError('gateway timeout')
+        self.assertEqual(self.place_order().status_code, 500)
+        self.assert_checkout_undone()
+
+    def test_payment_record_failure_gives_stock_and_cart_back(self):
+        self.razorpay.order.create.return_value = {'id': 'order_1'}
+        with mock.patch.object(database, 'record_payment',
+                               side_effect=sqlite3.OperationalError('database is locked')), \
+                self.assertLogs(self.app.logger, 'WARNING') as logs:
+            self.assertEqual(self.place_order().status_code, 500)
+        self.assert_checkout_undone()
+        self.assertIn('order_1', logs.output[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
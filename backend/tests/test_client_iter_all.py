@@ -0,0 +1,116 @@
+import json
+import threading
+import time
+import unittest
+from urllib.parse import parse_qs, urlparse
+
+import responses
+
+from backend.razorpay_sdk import Client
+from backend.razorpay_sdk.errors import BadRequestError
+
+# 250 payments, one per second from 1700000000; the API lists newest first
+PAYMENTS = [{'id': 'pay_{}'.format(n), 'entity': 'payment', 'created_at': 1700000000 + n}
+            for n in range(250)]
+
+
+class TestClientIterAll(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client(auth=('key_id', 'key_secret'))
+        self.requested = []
+        self.lock = threading.Lock()
+        self.second_page = threading.Event()
+
+    def list_payments(self, request):
+        query = {key: int(values[0]) for key, values in parse_qs(urlparse(request.url).query).items()}
+        with self.lock:
+            self.requested.append(query)
+            if query['skip'] > 0:
+                self.second_page.set()
+        matching = [payment for payment in reversed(PAYMENTS)
+                    if query.get('from', 0) <= payment['created_at'] <= query.get('to', 2 ** 40)]
+        items = matching[query['skip']:query['skip'] + query['count']]
+        return 200, {}, json.dumps({'entity': 'collection', 'count': len(items), 'items': items})
+
+    def mock_payments(self):
+        responses.add_callback(responses.GET, 'https://api.razorpay.com/v1/payments',
+                               callback=self.list_payments)
+
+    @responses.activate
+    def test_walks_every_page_and_prefetches_the_next(self):
+        self.mock_payments()
+        payments = self.client.payment.iter_all({'count': 5}, page_size=500)
+
+        self.assertEqual(next(payments)['id'], 'pay_249')
+        # the second page is requested while the first is being consumed
+        self.assertTrue(self.second_page.wait(5))
+        rest = list(payments)
+
+        self.assertEqual([payment['id'] for payment in rest],
+                         ['pay_{}'.format(n) for n in range(248, -1, -1)])
+        self.assertEqual([(query['skip'], query['count']) for query in self.requested],
+                         [(0, 100), (100, 100), (200, 100)])
+
+    @responses.activate
+    def test_windows_split_the_range_without_overlap(self):
+        self.mock_payments()
+        window = {'from': 1700000010, 'to': 1700000209}
+        payments = list(self.client.payment.iter_all(window, page_size=30, windows=4))
+
+        self.assertEqual(sorted(payment['created_at'] for payment in payments),
+                         list(range(1700000010, 1700000210)))
+        newest_window = [payment['created_at'] for payment in payments
+                         if payment['created_at'] >= 1700000160]
+        self.assertEqual(newest_window, list(range(1700000209, 1700000159, -1)))
+        self.assertEqual(sorted({(query['from'], query['to']) for query in self.requested}),
+                         [(1700000010, 1700000059), (1700000060, 1700000109),
+                          (1700000110, 1700000159), (1700000160, 1700000209)])
+
+        with self.assertRaises(ValueError):
+            next(self.client.payment.iter_all({'from': 1700000010}, windows=2))
+
+    @responses.activate
+    def test_stopping_early_does_not_wait_for_the_prefetch(self):
+        prefetching, release = threading.Event(), threading.Event()
+        self.addCleanup(release.set)
+
+        def list_payments(request):
+            if 'skip=0' not in request.url:
+                prefetching.set()
+                release.wait(5)  # the prefetch of page two hangs
+            return self.list_payments(request)
+
+        responses.add_callback(responses.GET, 'https://api.razorpay.com/v1/payments',
+                               callback=list_payments)
+        payments = self.client.payment.iter_all()
+        self.assertEqual(next(payments)['id'], 'pay_249')
+        self.assertTrue(prefetching.wait(5))
+
+        started = time.perf_counter()
+        payments.close()
+        self.assertLess(time.perf_counter() - started, 1)
+
+    @responses.activate
+    def test_parent_scoped_lists_take_their_parent_id(self):
+        tokens = [{'id': 'token_{}'.format(n), 'entity': 'token'} for n in range(3)]
+        responses.add(responses.GET, 'https://api.razorpay.com/v1/customers/cust_1/tokens',
+                      json={'entity': 'collection', 'count': 3, 'items': tokens})
+        self.assertEqual(list(self.client.token.iter_all('cust_1')), tokens)
+        self.assertIn('count=100', responses.calls[0].request.url)
+
+    def test_resources_without_a_list_endpoint_refuse(self):
+        with self.assertRaises(NotImplementedError):
+            self.client.card.iter_all()
+
+    @responses.activate
+    def test_errors_surface_from_the_iterator(self):
+        responses.add(responses.GET, 'https://api.razorpay.com/v1/orders', status=400,
+                      json={'error': {'code': 'BAD_REQUEST_ERROR', 'description': 'bad filter'}})
+        orders = self.client.order.iter_all({'status': 'unknown'})
+        with self.assertRaises(BadRequestError):
+            next(orders)
+
+
+if __name__ == '__main__':
+    unittest.main()
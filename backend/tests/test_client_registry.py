@@ -0,0 +1,67 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from backend.razorpay_sdk import ClientRegistry
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = json.dumps({'id': self.path.rsplit('/', 1)[-1], 'entity': 'order'}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestClientRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        self.base_url = 'http://127.0.0.1:{}/v1'.format(self.server.server_port)
+        self.registry = ClientRegistry(pool_size=2)
+
+    def tearDown(self):
+        self.registry.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_clients_are_shared_per_credentials(self):
+        client = self.registry.get('key_id', 'key_secret')
+        self.assertIs(self.registry.get('key_id', 'key_secret'), client)
+        self.assertIsNot(self.registry.get('key_id', 'other_secret'), client)
+        self.assertEqual(self.registry.get('key_id', 'key_secret').auth, ('key_id', 'key_secret'))
+        self.assertEqual(self.registry.stats()['created'], 2)
+
+    def test_concurrent_lookups_create_one_client(self):
+        clients = []
+        threads = [threading.Thread(target=lambda: clients.append(self.registry.get('key_id', 'key_secret')))
+                   for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({id(client) for client in clients}), 1)
+        self.assertEqual(self.registry.stats()['lookups'], 16)
+
+    def test_requests_reuse_keep_alive_connections(self):
+        client = self.registry.get('key_id', 'key_secret', base_url=self.base_url)
+        for n in range(5):
+            self.assertEqual(client.order.fetch('order_{}'.format(n))['id'], 'order_{}'.format(n))
+
+        stats = self.registry.stats()
+        self.assertEqual(stats['connections'], {'requests': 5, 'connections': 1, 'reused': 4})
+        self.assertNotIn('key_secret', json.dumps(stats))
+        self.assertNotIn('key_id', json.dumps(stats))
+
+
+if __name__ == '__main__':
+    unittest.main()
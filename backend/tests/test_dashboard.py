@@ -0,0 +1,114 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from backend import database, db_utils
+from backend.cache import cache
+from backend.config import Config
+
+
+class TestAdminDashboard(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        db_utils.reset_connection_pools()
+        cache.clear()
+        self.path_patch = mock.patch.object(
+            Config, 'DATABASE_PATH', os.path.join(self.tmp_dir, 'test.db'))
+        self.path_patch.start()
+        database.initialize_database()
+        with db_utils.get_pooled_connection() as conn:
+            conn.executemany("INSERT INTO User (AccountType, Email, Name, Password, IsVerified) VALUES (?, ?, ?, 'x', ?)", [
+                ('customer', 'asha@example.com', 'Asha', 0),
+                ('vendor', 'ravi@example.com', 'Ravi', 0),
+                ('vendor', 'meera@example.com', 'Meera', 1),
+            ])
+            conn.commit()
+        database.insert_into_table_Store(1, 1, 10, 500, 'Banarasi Saree', CategoryId=2)
+        database.insert_into_table_Store(1, 2, 10, 100, 'Brass Diya', CategoryId=3)
+        self.add_order('BS1', [(1, 2), (2, 1)], 'confirmed')
+        self.add_order('BS2', [(2, 3)], 'delivered')
+
+    def tearDown(self):
+        cache.clear()
+        db_utils.reset_connection_pools()
+        self.path_patch.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def add_order(self, order_id, lines, status):
+        prices = {1: 500, 2: 100}
+        with db_utils.get_pooled_connection() as conn:
+            conn.executemany("""
+                INSERT INTO orders (StoreId, ItemId, CustomerId, Quantity, Price, ItemName,
+                                    OrderId, OrderStatus, OrderDate, OrderTime, TotalAmount)
+                VALUES (1, ?, 1, ?, ?, 'Item', ?, ?, date('now'), time('now'), 0)
+            """, [(item, quantity, prices[item], order_id, status) for item, quantity in lines])
+            conn.commit()
+
+    def counters(self):
+        with db_utils.get_pooled_connection() as conn:
+            return {row['Name']: row['Value'] for row in conn.execute("SELECT Name, Value FROM dashboard_counters")}
+
+    def test_counters_follow_writes(self):
+        self.assertEqual(self.counters(), {
+            'total_users': 3, 'total_vendors': 2, 'pending_vendor_approvals': 1, 'total_products': 2,
+            'total_orders': 2, 'active_orders': 1, 'total_revenue': 1400, 'unique_customers': 1,
+            'total_stores': 1,
+        })
+        database.update_order_status('BS1', 'cancelled')
+        database.delete_store_item(2, 1)
+        database.insert_into_table_Store(2, 1, 5, 300, 'Pashmina Shawl')
+        database.insert_into_table_Store(3, 1, 5, 300, 'Jute Bag')
+        with db_utils.get_pooled_connection() as conn:
+            conn.execute("UPDATE User SET IsVerified = 1 WHERE Email = 'ravi@example.com'")
+            conn.execute("DELETE FROM orders WHERE OrderId = 'BS2'")
+            conn.execute("DELETE FROM Store WHERE StoreId IN (1, 3) AND ItemId = 1")
+            conn.commit()
+        self.assertEqual(self.counters(), {
+            'total_users': 3, 'total_vendors': 2, 'pending_vendor_approvals': 0, 'total_products': 1,
+            'total_orders': 1, 'active_orders': 0, 'total_revenue': 0, 'unique_customers': 1,
+            'total_stores': 2,
+        })
+
+    def test_counters_match_a_recount(self):
+        database.update_order_status('BS2', 'refunded')
+        self.add_order('BS3', [(1, 1)], 'pending')
+        with db_utils.get_pooled_connection() as conn:
+            conn.execute("UPDATE Store SET StoreId = 4 WHERE ItemId = 2")
+            conn.commit()
+        maintained = self.counters()
+        self.assertEqual(maintained['total_stores'], 2)
+        database.rebuild_dashboard_counters()
+        self.assertEqual(self.counters(), maintained)
+
+    def test_snapshot_sections_and_age(self):
+        stats = database.get_admin_dashboard_stats()
+        self.assertEqual(stats['total_orders'], 2)
+        self.assertEqual([c['name'] for c in stats['top_categories']], ['Clothing', 'Home & Kitchen'])
+        self.assertEqual(stats['top_categories'][0]['revenue'], 1000)
+        self.assertEqual([o['order_id'] for o in stats['recent_orders']], ['BS2', 'BS1'])
+        self.assertEqual(stats['monthly_revenue'][-1]['revenue'], 1400)
+        self.assertLess(stats['snapshot_age_seconds'], 5)
+
+    def test_stale_snapshot_is_served_then_refreshed(self):
+        database.get_admin_dashboard_stats()
+        self.add_order('BS3', [(1, 1)], 'pending')
+        with mock.patch.object(Config, 'DASHBOARD_SNAPSHOT_MAX_AGE', 3600):
+            stats = database.get_admin_dashboard_stats()
+        # Counters are live, the aggregates wait for the next refresh
+        self.assertEqual(stats['total_orders'], 3)
+        self.assertEqual(len(stats['recent_orders']), 2)
+
+        with db_utils.get_pooled_connection() as conn:
+            conn.execute("UPDATE dashboard_snapshot SET RefreshedAt = RefreshedAt - 120")
+            conn.commit()
+        stats = database.get_admin_dashboard_stats()
+        self.assertGreaterEqual(stats['snapshot_age_seconds'], 120)
+        for _ in range(100):
+            if len(database.get_admin_dashboard_stats()['recent_orders']) == 3:
+                break
+            time.sleep(0.02)
+        self.assertEqual(len(database.get_admin_dashboard_stats()['recent_orders']), 3)
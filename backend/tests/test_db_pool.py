@@ -0,0 +1,166 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from backend import database, db_utils
+from backend.config import Config
+from backend.db_utils import ConnectionPool
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, 'test.db')
+        self.pool = ConnectionPool(self.db_path, max_connections=2)
+
+    def tearDown(self):
+        self.pool.close_all()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_connection_reused_between_checkouts(self):
+        with self.pool.get_connection() as first:
+            pass
+        with self.pool.get_connection() as second:
+            pass
+        self.assertIs(first, second)
+        stats = self.pool.get_stats()
+        self.assertEqual(stats['checkouts'], 2)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['idle'], 1)
+        self.assertEqual(stats['in_use'], 0)
+
+    def test_nested_checkout_reuses_thread_connection(self):
+        with self.pool.get_connection() as outer:
+            with self.pool.get_connection() as inner:
+                self.assertIs(outer, inner)
+        stats = self.pool.get_stats()
+        self.assertEqual(stats['checkouts'], 1)
+        self.assertEqual(stats['reentrant'], 1)
+
+    def test_open_transaction_rolled_back_on_release(self):
+        with self.pool.get_connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.commit()
+            conn.execute("INSERT INTO t VALUES (1)")
+        with self.pool.get_connection() as conn:
+            self.assertFalse(conn.in_transaction)
+            count = conn.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+        self.assertEqual(count, 0)
+
+    def test_connection_shared_across_threads(self):
+        with self.pool.get_connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.commit()
+        errors = []
+
+        def worker():
+            try:
+                with self.pool.get_connection() as conn:
+                    conn.execute("INSERT INTO t VALUES (1)")
+                    conn.commit()
+            except Exception as e:  # pragma: no cover
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(self.pool.get_stats()['misses'], 2)
+
+
+class TestDatabaseHelpersUsePool(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        db_utils.reset_connection_pools()
+        self.path_patch = mock.patch.object(
+            Config, 'DATABASE_PATH', os.path.join(self.tmp_dir, 'test.db'))
+        self.path_patch.start()
+
+    def tearDown(self):
+        db_utils.reset_connection_pools()
+        self.path_patch.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_helpers_borrow_pooled_connections(self):
+        database.create_user_table()
+        database.create_invitationcodes_table()
+        database.insert_default_invitation_codes()
+        self.assertEqual(database.check_invitation_code('1111'), 1)
+        self.assertEqual(database.check_email('nobody@example.com'), -1)
+        stats = database.get_pool_stats()
+        self.assertEqual(stats['writer']['created'], 1)
+        self.assertEqual(stats['writer']['checkouts'], 3)
+        self.assertEqual(stats['reader']['created'], 1)
+        self.assertEqual(stats['reader']['checkouts'], 2)
+
+    def test_reader_connections_are_read_only(self):
+        database.create_user_table()
+        with db_utils.get_read_connection() as conn:
+            with self.assertRaises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM User")
+
+    def test_reads_inside_writer_see_uncommitted_rows(self):
+        database.create_invitationcodes_table()
+        with db_utils.get_pooled_connection() as conn:
+            conn.execute("INSERT INTO InvitationCodes (StoreId, InvitationCode) VALUES (42, 'abcd')")
+            self.assertEqual(database.check_invitation_code('abcd'), 42)
+            conn.rollback()
+        self.assertEqual(database.check_invitation_code('abcd'), -1)
+
+
+class TestConnectionLifecycle(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, 'test.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_setup_profile_applied_once_per_connection(self):
+        opened = []
+        pool = ConnectionPool(self.db_path, pragmas={'busy_timeout': 1234},
+                              on_connect=[opened.append])
+        for _ in range(3):
+            with pool.get_connection() as conn:
+                busy_timeout = conn.execute("PRAGMA busy_timeout").fetchone()[0]
+                journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        pool.close_all()
+        self.assertEqual(busy_timeout, 1234)
+        self.assertEqual(journal_mode, 'wal')
+        self.assertEqual(len(opened), 1)
+        stats = pool.get_stats()
+        self.assertEqual(stats['created'], 1)
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['probes'], 0)
+        self.assertEqual(stats['closed'], 1)
+
+    def test_liveness_probe_after_idle_interval(self):
+        pool = ConnectionPool(self.db_path, idle_check_interval=0)
+        with pool.get_connection():
+            pass
+        with pool.get_connection():
+            pass
+        pool.close_all()
+        self.assertEqual(pool.get_stats()['probes'], 1)
+
+    def test_liveness_probe_after_error(self):
+        pool = ConnectionPool(self.db_path)
+        with self.assertRaises(Exception):
+            with pool.get_connection() as conn:
+                conn.execute("SELECT * FROM missing_table")
+        with pool.get_connection():
+            pass
+        pool.close_all()
+        stats = pool.get_stats()
+        self.assertEqual(stats['probes'], 1)
+        self.assertEqual(stats['created'], 1)
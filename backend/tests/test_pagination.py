@@ -0,0 +1,188 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from flask import Flask
+
+from backend import database, db_utils
+from backend.base import create_app
+from backend.cache import cache
+from backend.config import Config
+from backend.utils import decode_cursor, encode_cursor, validate_cursor
+
+
+class TestCursorEncoding(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+
+    def test_round_trip(self):
+        token = encode_cursor('price:asc', (120.5, 3, 'BS1'))
+        self.assertNotIn('=', token)
+        self.assertEqual(decode_cursor(token, 'price:asc'), (120.5, 3, 'BS1'))
+
+    def test_rejects_tampered_or_foreign_cursors(self):
+        token = encode_cursor('price:asc', (120.5, 3, 7))
+        for bad in ('not-a-cursor', token[:-3], encode_cursor('price:asc', ())):
+            with self.assertRaises(ValueError):
+                decode_cursor(bad, 'price:asc')
+        with self.assertRaises(ValueError):
+            decode_cursor(token, 'price:desc')
+
+    def test_cursor_parameter_selects_the_mode(self):
+        with self.app.test_request_context('/?page=2'):
+            self.assertIsNone(validate_cursor('created_at:desc'))
+        with self.app.test_request_context('/?cursor='):
+            self.assertEqual(validate_cursor('created_at:desc'), ())
+
+
+class DatabaseTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        db_utils.reset_connection_pools()
+        cache.clear()
+        self.path_patch = mock.patch.object(
+            Config, 'DATABASE_PATH', os.path.join(self.tmp_dir, 'test.db'))
+        self.path_patch.start()
+        database.initialize_database()
+
+    def tearDown(self):
+        cache.clear()
+        db_utils.reset_connection_pools()
+        self.path_patch.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def walk(self, fetch, per_page):
+        """Every page of a cursor listing, following next_key to the end"""
+        pages, after = [], ()
+        while True:
+            rows, total_count, after = fetch(per_page, after)
+            pages.append(rows)
+            if after is None:
+                return pages, total_count
+
+
+class TestKeysetPagination(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for n in range(23):
+            # Repeated prices make the (StoreId, ItemId) tie-breaker matter
+            database.insert_into_table_Store(n % 3 + 1, n, 5, 100 + n % 4, f'Item {n}', CategoryId=n % 2 + 1)
+        with db_utils.get_pooled_connection() as conn:
+            conn.executemany("""
+                INSERT INTO orders (StoreId, ItemId, CustomerId, Quantity, Price, ItemName,
+                                    OrderId, OrderStatus, OrderDate, OrderTime, TotalAmount)
+                VALUES (1, ?, 1, 1, 100, 'Item', ?, ?, '2024-06-01', ?, 200)
+            """, [(line, f'BS{n}', 'shipped' if n % 2 else 'pending', f'10:00:{n // 2:02d}')
+                  for n in range(9) for line in range(2)])
+            conn.commit()
+            # Inserted directly: hashing passwords through add_customer_details is slow
+            conn.executemany("INSERT INTO User (AccountType, Email, Name, Password) VALUES (?, ?, ?, 'x')",
+                             [('vendor' if n % 3 == 0 else 'customer', f'user{n}@example.com', f'User {n}')
+                              for n in range(11)])
+            conn.commit()
+
+    def test_cursor_pages_match_offset_pages(self):
+        filters = {'sort_by': 'price', 'sort_order': 'asc', 'category_id': 1}
+        pages, total_count = self.walk(
+            lambda per_page, after: database.get_products_with_filters(dict(filters, per_page=per_page), after), 5)
+        self.assertEqual(total_count, 12)
+        self.assertEqual([len(page) for page in pages], [5, 5, 2])
+        offset_pages = [database.get_products_with_filters(dict(filters, page=n, per_page=5))[0]
+                        for n in (1, 2, 3)]
+        self.assertEqual(pages, offset_pages)
+        prices = [product['price'] for page in pages for product in page]
+        self.assertEqual(prices, sorted(prices))
+
+    def test_last_full_page_has_no_next(self):
+        pages, _ = self.walk(
+            lambda per_page, after: database.get_products_with_filters({'per_page': per_page}, after), 23)
+        self.assertEqual([len(page) for page in pages], [23])
+
+    def test_admin_orders_are_grouped_newest_first(self):
+        pages, total_count = self.walk(
+            lambda per_page, after: database.get_all_orders_admin(1, per_page, after=after), 4)
+        orders = [order['order_id'] for page in pages for order in page]
+        self.assertEqual(orders, ['BS8', 'BS7', 'BS6', 'BS5', 'BS4', 'BS3', 'BS2', 'BS1', 'BS0'])
+        self.assertEqual(total_count, 9)
+        self.assertEqual(pages[0][0]['item_count'], 2)
+        shipped, _ = self.walk(
+            lambda per_page, after: database.get_all_orders_admin(1, per_page, 'shipped', after=after), 2)
+        self.assertEqual([o['order_id'] for page in shipped for o in page], ['BS7', 'BS5', 'BS3', 'BS1'])
+
+    def test_admin_users_filtered(self):
+        pages, total_count = self.walk(
+            lambda per_page, after: database.get_all_users(1, per_page, role='vendor', after=after), 2)
+        self.assertEqual([u['name'] for page in pages for u in page], ['User 9', 'User 6', 'User 3', 'User 0'])
+        self.assertEqual(total_count, 4)
+        self.assertNotIn('password', pages[0][0])
+
+    def test_cursor_total_is_cached(self):
+        list_users = lambda after: database.get_all_users(1, 5, after=after)
+        self.assertEqual(list_users(())[1], 11)
+        with db_utils.get_pooled_connection() as conn:
+            conn.execute("INSERT INTO User (AccountType, Email, Name, Password) VALUES ('customer', 'late@example.com', 'Late', 'x')")
+            conn.commit()
+        self.assertEqual(list_users(())[1], 11)
+        self.assertEqual(list_users(None)[1], 12)
+
+    def test_rows_without_a_sort_key_are_reached(self):
+        with db_utils.get_pooled_connection() as conn:
+            conn.execute("UPDATE Store SET DateAdded = NULL WHERE ItemId % 4 = 0")
+            conn.commit()
+        for sort_order in ('desc', 'asc'):
+            filters = {'sort_by': 'created_at', 'sort_order': sort_order}
+            pages, _ = self.walk(
+                lambda per_page, after: database.get_products_with_filters(dict(filters, per_page=per_page), after), 4)
+            offset_pages = [database.get_products_with_filters(dict(filters, page=n, per_page=4))[0]
+                            for n in range(1, 7)]
+            self.assertEqual(pages, offset_pages)
+            self.assertEqual(len({product['id'] for page in pages for product in page}), 23)
+
+    def test_malformed_key_is_rejected(self):
+        with self.assertRaises(ValueError):
+            database.get_all_orders_admin(1, 5, after=('2024-06-01',))
+        with self.assertRaises(ValueError):
+            database.get_all_users(1, 5, after=([1],))
+        with self.assertRaises(ValueError):
+            database.get_all_users(1, 5, after=(None,))
+
+
+class TestProductsEndpoint(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for n in range(5):
+            database.insert_into_table_Store(1, n, 5, 100 * (n + 1), f'Item {n}')
+        with mock.patch.object(Config, 'UPLOAD_FOLDER', self.tmp_dir):
+            self.app = create_app()
+        self.app.config['TESTING'] = True
+        self.app.config['RATELIMIT_ENABLED'] = False
+        self.client = self.app.test_client()
+
+    def test_cursor_mode(self):
+        response = self.client.get('/v1/products?cursor=&per_page=2&sort_by=price&sort_order=desc')
+        body = response.get_json()
+        self.assertEqual([p['price'] for p in body['data']], [500, 400])
+        self.assertTrue(body['pagination']['has_next'])
+        self.assertEqual(body['pagination']['total_items'], 5)
+
+        cursor = body['pagination']['next_cursor']
+        body = self.client.get(f'/v1/products?cursor={cursor}&per_page=2&sort_by=price&sort_order=desc').get_json()
+        self.assertEqual([p['price'] for p in body['data']], [300, 200])
+
+        response = self.client.get(f'/v1/products?cursor={cursor}&per_page=2&sort_by=price&sort_order=asc')
+        self.assertEqual(response.status_code, 400)
+        cursor = encode_cursor('price:desc', ([300], 1, 2))
+        response = self.client.get(f'/v1/products?cursor={cursor}&per_page=2&sort_by=price&sort_order=desc')
+        self.assertEqual(response.status_code, 400)
+
+    def test_page_mode_is_unchanged(self):
+        body = self.client.get('/v1/products?page=3&per_page=2').get_json()
+        self.assertEqual(len(body['data']), 1)
+        self.assertEqual(body['pagination']['total_pages'], 3)
+        self.assertFalse(body['pagination']['has_next'])
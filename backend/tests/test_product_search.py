@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from backend import database, db_utils
+from backend.cache import cache
+from backend.config import Config
+
+
+class TestProductSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        db_utils.reset_connection_pools()
+        cache.clear()
+        self.path_patch = mock.patch.object(
+            Config, 'DATABASE_PATH', os.path.join(self.tmp_dir, 'test.db'))
+        self.path_patch.start()
+        database.initialize_database()
+        # Category 2 is Clothing (कपड़े), 3 is Home & Kitchen
+        database.insert_into_table_Store(1, 1, 5, 1500, 'Banarasi Silk Saree', CategoryId=2,
+                                         Description='Handwoven silk saree from Varanasi with zari border')
+        database.insert_into_table_Store(1, 2, 5, 300, 'Brass Diya', CategoryId=3,
+                                         Description='Traditional lamp for Diwali, pairs well with a silk runner')
+        database.add_to_inventory(7, 'Jaipur Prints', 3, 'Cotton Kurta', 'Block printed kurta',
+                                  None, 2, 4, 800, 2)
+
+    def tearDown(self):
+        cache.clear()
+        db_utils.reset_connection_pools()
+        self.path_patch.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def search(self, query, **filters):
+        products, total = database.search_products(dict(filters, query=query))
+        return [p['name'] for p in products], total
+
+    def test_name_matches_rank_above_description_matches(self):
+        names, total = self.search('silk')
+        self.assertEqual(names, ['Banarasi Silk Saree', 'Brass Diya'])
+        self.assertEqual(total, 2)
+
+    def test_prefix_and_typo_tolerant_matching(self):
+        self.assertEqual(self.search('kur')[0], ['Cotton Kurta'])
+        self.assertEqual(self.search('banarsi')[0], ['Banarasi Silk Saree'])
+        self.assertEqual(self.search('xyzzy'), ([], 0))
+
+    def test_hindi_category_names_are_searchable(self):
+        names, total = self.search('कपड़े')
+        self.assertEqual(sorted(names), ['Banarasi Silk Saree', 'Cotton Kurta'])
+
+    def test_results_carry_snippet_and_live_stock(self):
+        products, _ = database.search_products({'query': 'diwali'})
+        self.assertIn('<mark>Diwali</mark>', products[0]['snippet'])
+        self.assertEqual(products[0]['stock_quantity'], 5)
+        self.assertEqual(products[0]['category_name_hindi'], 'घर और रसोई')
+
+    def test_highlights_escape_vendor_html(self):
+        database.insert_into_table_Store(1, 3, 5, 450, 'Brass <script>alert(1)</script> Lamp', CategoryId=3,
+                                         Description='<b>Brass</b> lamp & stand')
+        products, _ = database.search_products({'query': 'lamp stand'})
+        self.assertEqual(products[0]['name_highlighted'],
+                         'Brass &lt;script&gt;alert(1)&lt;/script&gt; <mark>Lamp</mark>')
+        self.assertEqual(products[0]['snippet'], '&lt;b&gt;Brass&lt;/b&gt; <mark>lamp</mark> &amp; <mark>stand</mark>')
+        self.assertEqual(products[0]['name'], 'Brass <script>alert(1)</script> Lamp')
+
+    def test_filters(self):
+        self.assertEqual(self.search('silk', max_price=1000)[0], ['Brass Diya'])
+        self.assertEqual(self.search('silk', category_id=2)[0], ['Banarasi Silk Saree'])
+        self.assertEqual(self.search('kurta', store_id=1)[0], [])
+        self.assertEqual(self.search('kurta', market_id=2)[0], ['Cotton Kurta'])
+
+    def test_triggers_keep_index_in_sync(self):
+        database.updateitem(2, 1, 'Brass Akhand Diya', 5, 300, 'Temple lamp')
+        self.assertEqual(self.search('akhand')[0], ['Brass Akhand Diya'])
+        self.assertEqual(self.search('diwali')[0], [])
+        database.delete_store_item(1, 1)
+        self.assertEqual(self.search('saree')[0], [])
+        with db_utils.get_pooled_connection() as conn:
+            conn.execute("UPDATE Categories SET CategoryNameHindi = 'परिधान' WHERE CategoryId = 2")
+            conn.commit()
+        self.assertEqual(self.search('परिधान')[0], ['Cotton Kurta'])
+
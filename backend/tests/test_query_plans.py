@@ -0,0 +1,147 @@
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from backend import database, db_utils
+from backend.cache import cache
+from backend.config import Config
+
+# Tables that stay small enough for a full scan to be harmless; 'hit' is the
+# single page of ranked search results that search_products joins back to stock
+SMALL_TABLES = {'Categories', 'InvitationCodes', 'dashboard_counters', 'hit'}
+# Pre-aggregated rollups, read whole only by the background dashboard snapshot refresh
+ROLLUP_TABLES = {'sales_daily'}
+
+
+class TestHotQueriesUseIndexes(unittest.TestCase):
+    """Every statement issued by the database helpers is searched, never scanned"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, 'test.db')
+        db_utils.reset_connection_pools()
+        cache.clear()
+        self.path_patch = mock.patch.object(Config, 'DATABASE_PATH', self.db_path)
+        self.path_patch.start()
+        self.statements = []
+        for pool in (db_utils.get_connection_pool(), db_utils.get_read_pool()):
+            pool.add_connect_hook(lambda conn: conn.set_trace_callback(self.statements.append))
+
+    def tearDown(self):
+        cache.clear()
+        db_utils.reset_connection_pools()
+        self.path_patch.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def exercise_helpers(self):
+        database.initialize_database()
+        user_id = database.add_customer_details('asha@example.com', 'Asha', 'secret', 'customer')
+        database.check_email('asha@example.com')
+        database.check_password(user_id, 'secret')
+        database.get_user_details(user_id)
+        database.update_user_profile(user_id, Name='Asha K')
+        database.update_last_login(user_id)
+        database.check_invitation_code('1111')
+        database.get_email(user_id)
+
+        database.insert_into_table_Store(1, 1, 10, 100, 'Brass Lamp', CategoryId=1)
+        database.select_store_items(1)
+        database.select_store_items(1, category_id=1, search_term='brass')
+        for sort_by in ('created_at', 'price', 'name'):
+            database.get_products_with_filters({'sort_by': sort_by}, after=('a', 1, 1))
+        for sort_order in ('desc', 'asc'):
+            database.get_products_with_filters({'sort_order': sort_order}, after=(None, 1, 1))
+        database.updateitem(1, 1, 'Brass Diya', 10, 120)
+
+        database.insert_into_table_cart(1, 1, user_id, 1, 100, 'Brass Lamp')
+        database.insert_into_table_cart(1, 1, user_id, 1, 100, 'Brass Lamp')
+        database.select_user_cart(user_id)
+        cart_id = database.upsert_cart_item(user_id, 1, 1, 1)['cart_id']
+        database.upsert_cart_item(user_id, None, 1, 1)
+        database.apply_cart_batch(user_id, [{'op': 'set', 'store_id': 1, 'item_id': 1, 'quantity': 1},
+                                            {'op': 'remove', 'store_id': 1, 'item_id': 2, 'quantity': 1}])
+        database.set_cart_item_quantity(user_id, cart_id, 2)
+        database.change_quantity_cart(user_id, 1, 1, 3)
+        database.change_quantity_cart(user_id, 1, 2, 0)
+        database.add_order_id(user_id, 'BS1')
+        database.update_cart('BS0', 'confirmed', 'Jaipur')
+        database.remove_cart_item(user_id, cart_id)
+        database.clear_user_cart(user_id)
+
+        database.get_user_orders(user_id)
+        database.get_user_orders(user_id, status='confirmed')
+        database.update_order_status('BS1', 'shipped', tracking_number='TRK1')
+        database.retrieve_orders_by_vendor(1)
+        database.retrieve_orders_by_vendor(1, status='shipped')
+        database.get_order_summary('BS1')
+        database.get_dashboard_stats(vendor_id=1)
+        database.get_dashboard_stats()
+        database.refresh_dashboard_snapshot()
+        database.get_admin_dashboard_stats()
+        database.get_all_orders_admin(1, 20, after=('2024-06-01', '10:00:00', 'BS1'))
+        database.get_all_users(1, 20, after=(user_id,))
+        database.get_admin_analytics('week', '2024-01-01', '2024-06-30')
+        database.get_vendor_analytics(user_id, '2024-01-01', '2024-06-30')
+
+        database.add_to_inventory(1, 'Vendor', 1, 'Brass Lamp', '', None, 1, 10, 100, 1)
+        database.retrieve_data_from_inventory(1)
+        database.retrieve_data_from_inventory(1, category_id=1, low_stock_only=True)
+        database.update_inventory_quantity(1, 1, 5)
+
+        payment_id = database.record_payment('BS1', user_id, 100, 'upi')
+        database.update_payment_status(payment_id, 'completed', transaction_id='TX1')
+
+        database.add_review(1, 1, user_id, 5, 'Lovely', order_id='BS1')
+        database.get_product_reviews(1, 1)
+        database.get_categories()
+        database.get_categories(parent_id=1, include_inactive=True)
+
+        database.add_to_wishlist(user_id, 1, 1, 'Brass Lamp', 100)
+        database.get_user_wishlist(user_id)
+        database.apply_wishlist_batch(user_id, [{'op': 'add', 'store_id': 1, 'item_id': 2, 'quantity': 1},
+                                                {'op': 'remove', 'store_id': 1, 'item_id': 2, 'quantity': 1}])
+        database.search_products({'query': 'brass', 'category_id': 1})
+        database.search_products({'query': 'bras'})
+        database.remove_from_wishlist(user_id, 1, 1)
+        database.delete_store_item(1, 1)
+
+    def test_no_statement_scans_a_large_table(self):
+        self.exercise_helpers()
+        queries = {
+            statement for statement in self.statements
+            if re.match(r'\s*(SELECT|UPDATE|DELETE|WITH)\b', statement, re.I)
+            and 'sqlite_master' not in statement
+            # FTS5 reads its own shadow tables through the same connection
+            and "'main'." not in statement
+            # Listing totals are whole-table counts by nature; cursor pages cache them
+            and not statement.startswith('SELECT COUNT(*) FROM (')
+        }
+        self.assertGreater(len(queries), 30)
+
+        scans = []
+        conn = sqlite3.connect(self.db_path)
+        try:
+            for query in sorted(queries):
+                plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}")]
+                # An unfiltered walk of an index in ORDER BY order stops after LIMIT rows
+                bounded_walk = (re.search(r'\bLIMIT\b', query) and not re.search(r'\bWHERE\b', query)
+                                and not any('TEMP B-TREE' in detail for detail in plan))
+                for detail in plan:
+                    match = re.match(r'SCAN (\w+)', detail)
+                    # FTS5 reports every lookup, MATCH included, as a virtual table scan
+                    if 'VIRTUAL TABLE' in detail:
+                        continue
+                    # Batches look up their keys from a VALUES list
+                    if 'CONSTANT ROW' in detail:
+                        continue
+                    if bounded_walk and 'USING' in detail and 'INDEX' in detail:
+                        continue
+                    if match and match.group(1) not in SMALL_TABLES | ROLLUP_TABLES and match.group(1) != 'CONSTANT':
+                        scans.append(f"{detail}\n    in: {' '.join(query.split())}")
+        finally:
+            conn.close()
+        self.assertEqual(scans, [], "\n".join(scans))
@@ -1,12 +1,22 @@
 import time
 import unittest
 import os
+import shutil
+import tempfile
+from unittest import mock
+from backend import db_utils
 from backend.base import create_app
 from backend.config import Config
 
 class TestRateLimitConfiguration(unittest.TestCase):
     def setUp(self):
-        self.app = create_app()
+        self.tmp_dir = tempfile.mkdtemp()
+        db_utils.reset_connection_pools()
+        self.path_patch = mock.patch.object(
+            Config, 'DATABASE_PATH', os.path.join(self.tmp_dir, 'test.db'))
+        self.path_patch.start()
+        with mock.patch.object(Config, 'UPLOAD_FOLDER', self.tmp_dir):
+            self.app = create_app()
         self.app.config['TESTING'] = True
         self.app.config['RATELIMIT_ENABLED'] = True
         self.client = self.app.test_client()
@@ -14,7 +24,9 @@ class TestRateLimitConfiguration(unittest.TestCase):
         limiter._storage.reset()
 
     def tearDown(self):
-        pass
+        db_utils.reset_connection_pools()
+        self.path_patch.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
     def test_auth_login_limit(self):
         response=self.client.post('/v1/auth/login')
         limit=int(response.headers.get('X-RateLimit-Limit'))
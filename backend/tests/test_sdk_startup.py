@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+from backend.razorpay_sdk import Client, client as client_module
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def imported_after(code):
+    """Modules loaded by a fresh interpreter after running code"""
+    result = subprocess.run(
+        [sys.executable, '-c', code + '; import sys; print(" ".join(sys.modules))'],
+        env=dict(os.environ, PYTHONPATH=BACKEND_DIR), check=True, capture_output=True, text=True)
+    return set(result.stdout.split())
+
+
+class TestSdkStartup(unittest.TestCase):
+
+    def test_user_agent_is_built_once_until_app_details_change(self):
+        client = Client(auth=('key_id', 'key_secret'))
+        with mock.patch.object(client_module, 'package_version', return_value='9.9.9') as version:
+            first = client._update_user_agent_header({})['headers']['User-Agent']
+            client._update_user_agent_header({'headers': {}})
+            self.assertEqual(version.call_count, 1)
+            self.assertTrue(first.startswith('Razorpay-Python/9.9.9'))
+
+            client.set_app_details({'title': 'Bharatshaala', 'version': '2.1'})
+            agent = client._update_user_agent_header({})['headers']['User-Agent']
+            self.assertEqual(agent, 'Razorpay-Python/9.9.9 Bharatshaala/2.1 ')
+
+    def test_import_does_not_load_pkg_resources(self):
+        self.assertNotIn('pkg_resources', imported_after('import razorpay_sdk'))
+
+    def test_import_and_construction_load_no_resources(self):
+        modules = imported_after('import razorpay_sdk')
+        self.assertNotIn('requests', modules)
+        self.assertNotIn('razorpay_sdk.client', modules)
+
+        modules = imported_after("from razorpay_sdk import Client; Client(auth=('key_id', 'key_secret'))")
+        self.assertFalse([name for name in modules if name.startswith('razorpay_sdk.resources.')])
+
+        modules = imported_after("from razorpay_sdk import Client; Client(auth=('key_id', 'key_secret')).order")
+        self.assertIn('razorpay_sdk.resources.order', modules)
+        self.assertNotIn('razorpay_sdk.resources.payment', modules)
+
+    def test_resources_are_created_once_on_first_access(self):
+        client = Client(auth=('key_id', 'key_secret'))
+        self.assertNotIn('order', vars(client))
+        order = client.order
+        self.assertIs(client.order, order)
+        self.assertIs(order.client, client)
+        self.assertIn('payment', dir(client))
+        with self.assertRaises(AttributeError):
+            client.no_such_resource
+
+    def test_every_exported_resource_is_a_client_attribute(self):
+        from backend.razorpay_sdk import resources
+        client = Client(auth=('key_id', 'key_secret'))
+        for class_name, module_name in resources._MODULES.items():
+            self.assertIsInstance(getattr(client, module_name), getattr(resources, class_name))
+
+    def test_star_import_exports_every_resource(self):
+        modules = imported_after('from razorpay_sdk import *; Qrcode, Utility, ClientRegistry')
+        self.assertIn('razorpay_sdk.resources.qrcode', modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from backend import database, db_utils
+from backend.cache import cache
+from backend.config import Config
+from backend.db_utils import PreparedStatementCache, canonicalize_sql
+
+
+class TestPreparedStatementCache(unittest.TestCase):
+
+    def test_canonical_text_keeps_string_literals(self):
+        query = """
+            SELECT GROUP_CONCAT(ItemName, '  ,  ')
+            FROM   orders
+            WHERE  OrderId = ?
+        """
+        self.assertEqual(
+            canonicalize_sql(query),
+            "SELECT GROUP_CONCAT(ItemName, '  ,  ') FROM orders WHERE OrderId = ?")
+
+    def test_equivalent_queries_share_one_text(self):
+        statements = PreparedStatementCache()
+        first = statements.put("SELECT  *\n FROM Store")
+        second = statements.put("SELECT * FROM Store")
+        self.assertIs(first, second)
+
+    def test_least_recently_used_query_is_evicted(self):
+        statements = PreparedStatementCache(max_size=2)
+        statements.put("SELECT 1")
+        statements.put("SELECT 2")
+        statements.get("SELECT 1")
+        statements.put("SELECT 3")
+        self.assertIsNotNone(statements.get("SELECT 1"))
+        self.assertIsNone(statements.get("SELECT 2"))
+        stats = statements.get_stats()
+        self.assertEqual(stats['evictions'], 1)
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['size'], 2)
+
+
+class TestCanonicalCatalogQueries(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        db_utils.reset_connection_pools()
+        cache.clear()
+        self.path_patch = mock.patch.object(
+            Config, 'DATABASE_PATH', os.path.join(self.tmp_dir, 'test.db'))
+        self.path_patch.start()
+        database.create_store_table()
+        database.insert_into_table_Store(1, 1, 5, 100, 'Brass Lamp', CategoryId=3, Description='Diya')
+        database.insert_into_table_Store(1, 2, 5, 250, 'Silk Saree', CategoryId=2, Description='Banarasi')
+        database.insert_into_table_Store(2, 1, 5, 80, 'Brass Bell', CategoryId=3)
+
+    def tearDown(self):
+        db_utils.reset_connection_pools()
+        self.path_patch.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_optional_filters_use_one_statement(self):
+        db_utils.prepared_statements.clear()
+        self.assertEqual(len(database.select_store_items(1)), 2)
+        self.assertEqual(len(database.select_store_items(1, category_id=3)), 1)
+        self.assertEqual(len(database.select_store_items(1, search_term='banarasi')), 1)
+        self.assertEqual(len(database.select_store_items(1, 2, 'brass')), 0)
+        stats = db_utils.prepared_statements.get_stats()
+        self.assertEqual(stats['size'], 1)
+        self.assertEqual(stats['hits'], 3)
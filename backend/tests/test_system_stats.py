@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from flask_jwt_extended import create_access_token
+
+from backend import database, db_utils
+from backend.base import create_app
+from backend.cache import cache
+from backend.config import Config
+
+
+class TestSystemStats(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        db_utils.reset_connection_pools()
+        cache.clear()
+        self.path_patch = mock.patch.object(
+            Config, 'DATABASE_PATH', os.path.join(self.tmp_dir, 'test.db'))
+        self.path_patch.start()
+        database.initialize_database()
+        with db_utils.get_pooled_connection() as conn:
+            conn.executemany("INSERT INTO User (UserId, AccountType, Email, Name, Password) VALUES (?, ?, ?, ?, 'x')",
+                             [(1, 'admin', 'meera@example.com', 'Meera'),
+                              (2, 'customer', 'asha@example.com', 'Asha')])
+            conn.commit()
+        with mock.patch.object(Config, 'UPLOAD_FOLDER', self.tmp_dir):
+            self.app = create_app()
+        self.app.config['TESTING'] = True
+        self.app.config['RATELIMIT_ENABLED'] = False
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        cache.clear()
+        db_utils.reset_connection_pools()
+        self.path_patch.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def headers(self, user_id):
+        with self.app.app_context():
+            token = create_access_token(identity=str(user_id))
+        return {'Authorization': f'Bearer {token}'}
+
+    def test_health_reveals_nothing_operational(self):
+        response = self.client.get('/v1/health')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['data'], {'status': 'healthy'})
+
+    def test_stats_are_admin_only(self):
+        self.assertEqual(self.client.get('/v1/admin/system/stats').status_code, 401)
+        self.assertEqual(self.client.get('/v1/admin/system/stats', headers=self.headers(2)).status_code, 403)
+
+        response = self.client.get('/v1/admin/system/stats', headers=self.headers(1))
+        self.assertEqual(response.status_code, 200)
+        stats = response.get_json()['data']
+        self.assertEqual(set(stats), {'db_pool', 'cache', 'razorpay'})
+        self.assertNotIn(Config.RAZORPAY_KEY_ID, response.get_data(as_text=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,6 +5,9 @@ import os
 import uuid
 from werkzeug.utils import secure_filename
 from PIL import Image
+import base64
+import binascii
+import json
 
 def success_response(data=None, message="Success", pagination=None):
     """Standard success response format"""
@@ -85,11 +88,43 @@ def validate_pagination():
     
     if page < 1:
         page = 1
+    if per_page < 1:
+        per_page = current_app.config['DEFAULT_PAGE_SIZE']
     if per_page > current_app.config['MAX_PAGE_SIZE']:
         per_page = current_app.config['MAX_PAGE_SIZE']
     
     return page, per_page
 
+def validate_cursor(sort):
+    """
+    Get the keyset cursor for a listing ordered by sort.
+    
+    Returns None when no cursor parameter is given (page number pagination),
+    () for an empty cursor (first page) and otherwise the decoded key.
+    Raises ValueError for a malformed cursor or one issued for another sort.
+    """
+    if 'cursor' not in request.args:
+        return None
+    token = request.args['cursor']
+    return decode_cursor(token, sort) if token else ()
+
+def encode_cursor(sort, key):
+    """Opaque cursor holding the sort key of the last row served"""
+    payload = json.dumps({"sort": sort, "key": list(key)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(token, sort):
+    """Sort key from a cursor made by encode_cursor for the same sort"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        key = payload["key"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+    if payload.get("sort") != sort or not isinstance(key, list) or not key \
+            or not all(value is None or isinstance(value, (str, int, float)) for value in key):
+        raise ValueError("Invalid cursor")
+    return tuple(key)
+
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and \
@@ -129,4 +164,14 @@ def create_pagination_info(page, per_page, total_items):
         "total_pages": total_pages,
         "has_next": page < total_pages,
         "has_prev": page > 1
-    }
\ No newline at end of file
+    }
+
+def create_cursor_pagination_info(per_page, sort, next_key, total_items):
+    """Create pagination information for a keyset (cursor) page"""
+    return {
+        "per_page": per_page,
+        "next_cursor": encode_cursor(sort, next_key) if next_key else None,
+        "has_next": next_key is not None,
+        "total_items": total_items,
+        "total_items_is_estimate": True
+    }
@@ -0,0 +1,9 @@
+"""
+WSGI entry point.
+
+Usage:
+    gunicorn "backend.wsgi:app"
+"""
+from .base import create_app
+
+app = create_app()